@@ -0,0 +1,217 @@
+"""Almacén columnar mapeado en memoria, compartido por todos los workers.
+
+La instantánea base (ver ingesta.py) se construye una sola vez y se escribe en
+COLUMN_STORE_DIR/<versión>/: el dataset ya puntuado (con Health_Risk y
+Health_Risk_Label) y las celdas del cubo de agregados como un .npy por columna
+(los códigos en las categóricas), los bitsets del índice de filtros en un solo
+.npy, y un manifest.json con dtypes, categorías, orden de los bitsets,
+histogramas y co-momentos para las correlaciones (correlacion.py).
+
+Cada worker abre los .npy con np.load(mmap_mode='r') y arma los DataFrames con
+vistas de solo lectura sobre esos archivos, sin copiar: el sistema operativo
+guarda una sola copia de las páginas en su caché y todos los procesos la
+comparten. Como el cubo, los histogramas y los co-momentos también vienen del
+almacén, un worker no crea ningún arreglo temporal del tamaño del dataset al
+arrancar (esos temporales quedaban retenidos en el heap de cada proceso).
+
+Un candado de archivo (el mismo de almacen_modelos.py) asegura que, si varios
+workers arrancan a la vez sin almacén, solo uno lo escribe.
+
+Ejecutar `python almacen_columnar.py [filas]` reporta RSS, PSS y memoria
+privada por worker para 1, 4 y 16 workers, con y sin el almacén.
+"""
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from almacen_modelos import _locked
+from datos import DATA_PATH, SCHEMA_VERSION, add_health_risk, load_dataset, scored_version
+from correlacion import GroupedCoMoments
+from cubo import AggregateCube
+from indices import BitmapIndex
+from resumen import RunningHistogram
+
+COLUMN_STORE_DIR = os.environ.get("COLUMN_STORE_DIR", "artifacts/columns")
+# Se incrementa si cambia el formato del almacén
+STORE_FORMAT = 2
+
+
+def store_path(path=DATA_PATH, store_dir=None):
+    # scored_version incluye las reglas: el almacén guarda Health_Risk ya calculado
+    key = f"{os.path.splitext(os.path.basename(path))[0]}-{scored_version(path)}-s{SCHEMA_VERSION}-f{STORE_FORMAT}"
+    return os.path.join(store_dir or COLUMN_STORE_DIR, key)
+
+
+def _write_frame(df, directory):
+    """Un .npy por columna (códigos en las categóricas); devuelve la descripción para el manifest."""
+    os.makedirs(directory)
+    columns = []
+    for position, column in enumerate(df.columns):
+        values = df[column]
+        entry = {'name': column, 'file': f"c{position}.npy"}
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            entry.update(categories=values.cat.categories.tolist(), ordered=bool(values.cat.ordered))
+            data = values.cat.codes.to_numpy()
+        else:
+            data = values.to_numpy()
+        np.save(os.path.join(directory, entry['file']), data)
+        columns.append(entry)
+    return columns
+
+
+def _open_frame(directory, columns):
+    """DataFrame de vistas de solo lectura sobre los .npy de `directory`."""
+    series = []
+    for entry in columns:
+        data = np.load(os.path.join(directory, entry['file']), mmap_mode='r')
+        if 'categories' in entry:
+            dtype = pd.CategoricalDtype(entry['categories'], ordered=entry['ordered'])
+            data = pd.Categorical.from_codes(data, dtype=dtype, validate=False)
+        # copy=False + concat: una columna por bloque, sin consolidar (consolidar copiaría)
+        series.append(pd.Series(data, name=entry['name'], copy=False))
+    return pd.concat(series, axis=1)
+
+
+def write_store(df, index, cube, histograms, correlations, target):
+    """Escribe el dataset, los bitsets, las celdas del cubo, los histogramas y los co-momentos en `target` (atómico)."""
+    tmp_dir = f"{target}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    bitmaps = [(column, value) for column, by_value in index.bitmaps.items() for value in by_value]
+    np.save(os.path.join(tmp_dir, "bitmaps.npy"), np.stack([index.bitmaps[c][v] for c, v in bitmaps]))
+
+    manifest = {
+        'n_rows': len(df),
+        'columns': _write_frame(df, os.path.join(tmp_dir, "data")),
+        'bitmaps': [[column, str(value)] for column, value in bitmaps],
+        'cube': {
+            'dimensions': cube.dimensions,
+            'measures': cube.measures,
+            'columns': _write_frame(cube.cells, os.path.join(tmp_dir, "cube")),
+        },
+        'histograms': {
+            column: {'edges': hist.edges.tolist(), 'counts': hist.counts.tolist()}
+            for column, hist in histograms.items()
+        },
+        'correlations': correlations.to_dict(),
+    }
+    with open(os.path.join(tmp_dir, "manifest.json"), "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh)
+    os.replace(tmp_dir, target)
+
+
+def open_store(target):
+    """(DataFrame, BitmapIndex, AggregateCube, histogramas, GroupedCoMoments) mapeados desde el almacén."""
+    with open(os.path.join(target, "manifest.json"), encoding="utf-8") as fh:
+        manifest = json.load(fh)
+
+    df = _open_frame(os.path.join(target, "data"), manifest['columns'])
+
+    words = np.load(os.path.join(target, "bitmaps.npy"), mmap_mode='r')
+    bitmaps = {}
+    for row, (column, value) in enumerate(manifest['bitmaps']):
+        bitmaps.setdefault(column, {})[value] = words[row]
+    index = BitmapIndex.from_bitmaps(manifest['n_rows'], bitmaps)
+
+    cube_info = manifest['cube']
+    cells = _open_frame(os.path.join(target, "cube"), cube_info['columns'])
+    cube = AggregateCube(cells, cube_info['dimensions'], cube_info['measures'])
+
+    histograms = {
+        column: RunningHistogram(np.asarray(hist['edges']), np.asarray(hist['counts'], dtype=np.int64))
+        for column, hist in manifest['histograms'].items()
+    }
+    return df, index, cube, histograms, GroupedCoMoments.from_dict(manifest['correlations'])
+
+
+def load_base(path=DATA_PATH, histogram_columns=(), store_dir=None):
+    """Partes de la instantánea base desde el almacén, creándolo una sola vez si falta.
+
+    Devuelve (DataFrame puntuado, BitmapIndex, AggregateCube, {columna: RunningHistogram},
+    GroupedCoMoments).
+    """
+    target = store_path(path, store_dir)
+    if not os.path.exists(target):
+        store_dir = store_dir or COLUMN_STORE_DIR
+        with _locked(os.path.basename(target), store_dir):
+            if not os.path.exists(target):
+                df = add_health_risk(load_dataset(path))
+                histograms = {column: RunningHistogram.from_values(df[column]) for column in histogram_columns}
+                write_store(df, BitmapIndex(df), AggregateCube.from_frame(df), histograms,
+                            GroupedCoMoments.from_frame(df), target)
+
+    df, index, cube, histograms, correlations = open_store(target)
+    for column in histogram_columns:
+        if column not in histograms:  # almacén escrito con otra lista de columnas
+            histograms[column] = RunningHistogram.from_values(df[column])
+    return df, index, cube, histograms, correlations
+
+
+def _memory():
+    """(RSS, PSS, privada) del proceso actual en MB, leídas de /proc/self/smaps_rollup."""
+    fields = {}
+    with open("/proc/self/smaps_rollup") as fh:
+        for line in fh:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                fields[parts[0].rstrip(':')] = int(parts[1]) / 1024
+    return fields['Rss'], fields['Pss'], fields['Private_Clean'] + fields['Private_Dirty']
+
+
+def _worker(path, use_store, ready, release, results):
+    import ingesta
+
+    if use_store:
+        ingesta.initialize(path)
+    else:
+        # Carga anterior a este módulo: cada worker lee, puntúa, indexa y agrega por su cuenta
+        df = add_health_risk(load_dataset(path))
+        ingesta._snapshot = ingesta.DataSnapshot.from_frame(df, scored_version(path))
+    ready.wait()  # todos los workers cargados antes de medir (PSS reparte lo compartido)
+    results.put(_memory())
+    release.wait()
+
+
+if __name__ == "__main__":
+    import multiprocessing as mp
+    import sys
+    import tempfile
+
+    from datos import _scaled_csv
+
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+    workdir = tempfile.mkdtemp()
+    # Los workers (procesos nuevos, como los de gunicorn) leen estas rutas al importar
+    os.environ["DATA_CACHE_DIR"] = os.path.join(workdir, "cache")
+    os.environ["COLUMN_STORE_DIR"] = os.path.join(workdir, "columns")
+    os.environ["INGEST_DIR"] = os.path.join(workdir, "incoming")
+    csv_path = _scaled_csv(DATA_PATH, n_rows, workdir)
+    load_dataset(csv_path, cache_dir=os.environ["DATA_CACHE_DIR"])
+    from ingesta import HISTOGRAM_COLUMNS
+
+    load_base(csv_path, HISTOGRAM_COLUMNS, os.environ["COLUMN_STORE_DIR"])
+
+    print(f"{n_rows:,} filas — MB por worker (promedio)")
+    print(f"{'':>16} {'workers':>7} {'RSS':>8} {'PSS':>8} {'privada':>8}")
+    context = mp.get_context("spawn")
+    for use_store in (False, True):
+        for n_workers in (1, 4, 16):
+            ready, release = context.Barrier(n_workers + 1), context.Barrier(n_workers + 1)
+            results = context.Queue()
+            workers = [context.Process(target=_worker, args=(csv_path, use_store, ready, release, results))
+                       for _ in range(n_workers)]
+            for worker in workers:
+                worker.start()
+            ready.wait()
+            measures = np.array([results.get() for _ in workers])
+            release.wait()
+            for worker in workers:
+                worker.join()
+            rss, pss, private = measures.mean(axis=0)
+            label = "almacén mmap" if use_store else "carga propia"
+            print(f"{label:>16} {n_workers:>7} {rss:8.1f} {pss:8.1f} {private:8.1f}")
+    shutil.rmtree(workdir, ignore_errors=True)
@@ -0,0 +1,106 @@
+"""Almacén versionado de artefactos de modelos.
+
+Cada artefacto se guarda en un archivo joblib sin compresión cuyo nombre es un
+hash de (datos, características, hiperparámetros, versión de scikit-learn). Así
+un modelo se entrena una sola vez y todos los workers de gunicorn lo cargan con
+los arreglos de NumPy mapeados en memoria (mmap_mode='r').
+
+Un candado de archivo (fcntl) garantiza que, si varios workers arrancan a la
+vez sin artefacto, solo uno entrena y los demás esperan y cargan el resultado.
+"""
+import fcntl
+import hashlib
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+
+import pandas as pd
+
+MODEL_STORE_DIR = os.environ.get("MODEL_STORE_DIR", "artifacts/models")
+# Se incrementa si cambia el contenido de los artefactos
+FORMAT_VERSION = 1
+
+
+def dataset_hash(df):
+    """Hash estable del contenido de un DataFrame (valores e índice)."""
+    digest = hashlib.sha256()
+    digest.update(",".join(map(str, df.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def artifact_key(data_hash, features, params):
+    """Clave del artefacto a partir del hash de datos, la lista de características y los hiperparámetros."""
+    import sklearn
+
+    payload = json.dumps(
+        {
+            "data": data_hash,
+            "features": list(features),
+            "params": params,
+            "sklearn": sklearn.__version__,
+            "format": FORMAT_VERSION,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:24]
+
+
+def artifact_path(key, store_dir=None):
+    return os.path.join(store_dir or MODEL_STORE_DIR, f"{key}.joblib")
+
+
+@contextmanager
+def _locked(key, store_dir):
+    os.makedirs(store_dir, exist_ok=True)
+    with open(os.path.join(store_dir, f"{key}.lock"), "w") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def save_artifact(key, artifact, store_dir=None):
+    """Escribe el artefacto de forma atómica (archivo temporal + os.replace)."""
+    store_dir = store_dir or MODEL_STORE_DIR
+    os.makedirs(store_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=store_dir, suffix=".tmp")
+    os.close(fd)
+    import joblib
+
+    try:
+        # Sin compresión: es requisito para poder mapear los arreglos en memoria
+        joblib.dump(artifact, tmp_path, compress=0)
+        os.replace(tmp_path, artifact_path(key, store_dir))
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_artifact(key, store_dir=None):
+    """Carga el artefacto con mmap; devuelve None si no existe."""
+    path = artifact_path(key, store_dir)
+    if not os.path.exists(path):
+        return None
+    import joblib
+
+    return joblib.load(path, mmap_mode="r")
+
+
+def get_or_create(key, build, store_dir=None):
+    """Devuelve el artefacto `key`; si no existe lo construye con build() una sola vez entre procesos."""
+    store_dir = store_dir or MODEL_STORE_DIR
+    artifact = load_artifact(key, store_dir)
+    if artifact is not None:
+        return artifact
+
+    with _locked(key, store_dir):
+        # Otro proceso pudo haberlo creado mientras esperábamos el candado
+        artifact = load_artifact(key, store_dir)
+        if artifact is None:
+            save_artifact(key, build(), store_dir)
+            artifact = load_artifact(key, store_dir)
+    return artifact
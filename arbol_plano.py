@@ -0,0 +1,112 @@
+"""Evaluador de Random Forest sobre arreglos planos de NumPy.
+
+Los nodos de todos los árboles del bosque se concatenan en cinco arreglos
+(característica, umbral, hijo izquierdo, hijo derecho, probabilidad de la hoja)
+y un lote se evalúa descendiendo todos los árboles a la vez: en cada paso se
+avanza un nivel para todas las combinaciones (fila, árbol) con operaciones
+vectorizadas. El preprocesamiento (StandardScaler + OneHotEncoder) también se
+aplica con arreglos, sin pasar por ColumnTransformer ni Pipeline.
+
+Los resultados coinciden con Pipeline.predict_proba (misma comparación en
+float32 contra umbrales float64 que usa scikit-learn).
+"""
+import numpy as np
+import pandas as pd
+
+
+class FlatPreprocessor:
+    """Copia en arreglos de un ColumnTransformer ('num': StandardScaler, 'cat': OneHotEncoder)."""
+
+    def __init__(self, column_transformer, numerical_features, categorical_features):
+        scaler = column_transformer.named_transformers_['num']
+        encoder = column_transformer.named_transformers_['cat']
+        self.numerical_features = list(numerical_features)
+        self.categorical_features = list(categorical_features)
+        self.mean = np.asarray(scaler.mean_, dtype=np.float64)
+        self.scale = np.asarray(scaler.scale_, dtype=np.float64)
+        self.categories = [pd.Index(categories) for categories in encoder.categories_]
+        self.offsets = np.cumsum([len(self.numerical_features)] + [len(c) for c in self.categories])
+        self.n_features = int(self.offsets[-1])
+
+    def transform(self, records):
+        """Matriz densa float32 equivalente a column_transformer.transform(records)."""
+        n_rows = len(records)
+        X = np.zeros((n_rows, self.n_features), dtype=np.float32)
+        numeric = records[self.numerical_features].to_numpy()
+        if numeric.dtype.kind != 'f':
+            numeric = numeric.astype(np.float64)
+        # Mismo redondeo que StandardScaler: media y escala en el dtype de entrada
+        numeric = (numeric - self.mean.astype(numeric.dtype)) / self.scale.astype(numeric.dtype)
+        X[:, :len(self.numerical_features)] = numeric
+
+        rows = np.arange(n_rows)
+        for column, categories, offset in zip(self.categorical_features, self.categories, self.offsets):
+            codes = categories.get_indexer(records[column].astype(object))
+            known = codes >= 0  # handle_unknown='ignore': categorías nuevas quedan en cero
+            X[rows[known], offset + codes[known]] = 1.0
+        return X
+
+
+class FlatForest:
+    """Nodos de todos los árboles concatenados en arreglos planos."""
+
+    def __init__(self, forest):
+        features, thresholds, lefts, rights, leaf_proba, roots = [], [], [], [], [], []
+        offset = 0
+        for estimator in forest.estimators_:
+            tree = estimator.tree_
+            is_leaf = tree.children_left == -1
+            roots.append(offset)
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(tree.threshold)
+            # Las hojas apuntan a sí mismas: el descenso se detiene solo
+            own = np.arange(tree.node_count) + offset
+            lefts.append(np.where(is_leaf, own, tree.children_left + offset))
+            rights.append(np.where(is_leaf, own, tree.children_right + offset))
+            value = tree.value[:, 0, :]
+            leaf_proba.append(value[:, 1] / value.sum(axis=1))
+            offset += tree.node_count
+
+        self.feature = np.concatenate(features).astype(np.intp)
+        self.threshold = np.concatenate(thresholds)
+        self.left = np.concatenate(lefts).astype(np.intp)
+        self.right = np.concatenate(rights).astype(np.intp)
+        self.leaf_proba = np.concatenate(leaf_proba)
+        self.roots = np.asarray(roots, dtype=np.intp)
+        self.max_depth = max(estimator.tree_.max_depth for estimator in forest.estimators_)
+
+    def predict_proba(self, X):
+        """Probabilidad de la clase 1 para cada fila de X (matriz ya preprocesada)."""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        n_rows, n_features = X.shape
+        flat_X = X.ravel()
+        # Un elemento por combinación (fila, árbol); solo se avanzan las que no llegaron a una hoja
+        node = np.tile(self.roots, n_rows)
+        row_offset = np.repeat(np.arange(n_rows, dtype=np.intp) * n_features, len(self.roots))
+        active = np.arange(len(node))
+        for _ in range(self.max_depth):
+            current = node[active]
+            go_left = flat_X[row_offset[active] + self.feature[current]] <= self.threshold[current]
+            following = np.where(go_left, self.left[current], self.right[current])
+            node[active] = following
+            active = active[following != current]
+            if not len(active):
+                break
+        return self.leaf_proba[node].reshape(n_rows, -1).mean(axis=1)
+
+
+class FlatModel:
+    """Preprocesamiento + bosque planos construidos a partir de un artefacto de modelo.py."""
+
+    def __init__(self, artifact):
+        pipeline = artifact['pipeline']
+        self.features = list(artifact['numerical_features']) + list(artifact['categorical_features'])
+        self.preprocessor = FlatPreprocessor(
+            pipeline.named_steps['preprocessor'],
+            artifact['numerical_features'],
+            artifact['categorical_features'],
+        )
+        self.forest = FlatForest(pipeline.named_steps['classifier'])
+
+    def predict_proba(self, records):
+        return self.forest.predict_proba(self.preprocessor.transform(records))
@@ -0,0 +1,256 @@
+"""Caché de resultados compartida entre los workers de gunicorn.
+
+Los resultados de callbacks y constructores de figuras se guardan en un archivo
+SQLite (modo WAL) que todos los procesos abren: lo que un worker ya construyó
+lo reutilizan los demás. No hace falta ningún servicio externo.
+
+La clave de cada entrada combina la función, sus argumentos, la versión de los
+datos (cualquier argumento con atributo `version`, como una DataSnapshot, entra
+en la clave por su versión) y la versión del código (CODE_VERSION): el archivo
+sobrevive a los reinicios y un despliegue nuevo no debe servir figuras armadas
+por el código anterior. Las entradas vencen a los CACHE_TTL_SECONDS y,
+cuando el total supera CACHE_MAX_BYTES, se descartan las usadas hace más tiempo
+(LRU). Los contadores de aciertos, fallos, vencimientos y desalojos, globales y
+por función, se consultan en GET /api/cache-stats.
+"""
+import functools
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+from metricas import record_cache
+
+CACHE_PATH = os.environ.get("SHARED_CACHE_PATH", "artifacts/cache/callbacks.sqlite")
+CACHE_MAX_BYTES = int(float(os.environ.get("SHARED_CACHE_MAX_MB", "256")) * 1024 * 1024)
+CACHE_TTL_SECONDS = float(os.environ.get("SHARED_CACHE_TTL_SECONDS", "3600"))
+
+COUNTERS = ('hits', 'misses', 'expirations', 'evictions')
+# Se incrementa si cambia el formato de los valores guardados
+CACHE_FORMAT = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    namespace TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access);
+CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+"""
+
+
+class SharedCache:
+    """Diccionario persistente con TTL y desalojo LRU por tamaño, seguro entre procesos."""
+
+    def __init__(self, path=CACHE_PATH, max_bytes=CACHE_MAX_BYTES, ttl=CACHE_TTL_SECONDS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with self._connection() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connection(self):
+        # sqlite3 no comparte conexiones entre hilos: una por hilo (y por proceso)
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def _bump(self, conn, counter, namespace, amount=1):
+        conn.executemany(
+            "INSERT INTO counters (name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+            [(counter, amount), (f"{counter}:{namespace}", amount)],
+        )
+
+    def get(self, key, namespace=''):
+        """(True, valor) si la clave está vigente; (False, None) si no."""
+        conn = self._connection()
+        now = time.time()
+        row = conn.execute("SELECT value, expires FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is not None and row[1] < now:
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._bump(conn, 'expirations', namespace)
+            row = None
+        if row is None:
+            self._bump(conn, 'misses', namespace)
+            record_cache(False)
+            return False, None
+        conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (now, key))
+        self._bump(conn, 'hits', namespace)
+        record_cache(True)
+        return True, pickle.loads(row[0])
+
+    def set(self, key, value, namespace='', ttl=None):
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(payload) > self.max_bytes:
+            return
+        now = time.time()
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, namespace, value, size, expires, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, namespace, payload, len(payload), now + (self.ttl if ttl is None else ttl), now),
+            )
+            self._evict(conn, now)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _evict(self, conn, now):
+        """Borra las entradas vencidas y, si aún se excede max_bytes, las menos usadas recientemente."""
+        for namespace, count in conn.execute(
+                "SELECT namespace, COUNT(*) FROM entries WHERE expires < ? GROUP BY namespace", (now,)).fetchall():
+            self._bump(conn, 'expirations', namespace, count)
+        conn.execute("DELETE FROM entries WHERE expires < ?", (now,))
+
+        excess = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0] - self.max_bytes
+        if excess <= 0:
+            return
+        victims = []
+        for key, namespace, size in conn.execute("SELECT key, namespace, size FROM entries ORDER BY last_access"):
+            victims.append((key, namespace))
+            excess -= size
+            if excess <= 0:
+                break
+        conn.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key, _ in victims])
+        for _, namespace in victims:
+            self._bump(conn, 'evictions', namespace)
+
+    def clear(self):
+        self._connection().execute("DELETE FROM entries")
+
+    def stats(self):
+        """Contadores globales y por función, más el número y tamaño de las entradas."""
+        conn = self._connection()
+        counters = dict(conn.execute("SELECT name, value FROM counters").fetchall())
+        entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        functions = {}
+        for name, value in counters.items():
+            if ':' in name:
+                counter, namespace = name.split(':', 1)
+                functions.setdefault(namespace, dict.fromkeys(COUNTERS, 0))[counter] = value
+        for namespace, n, bytes_ in conn.execute("SELECT namespace, COUNT(*), SUM(size) FROM entries GROUP BY namespace"):
+            functions.setdefault(namespace, dict.fromkeys(COUNTERS, 0)).update(entries=n, bytes=bytes_)
+        lookups = counters.get('hits', 0) + counters.get('misses', 0)
+        return {
+            **{counter: counters.get(counter, 0) for counter in COUNTERS},
+            'hit_rate': round(counters.get('hits', 0) / lookups, 4) if lookups else None,
+            'entries': entries,
+            'bytes': size,
+            'max_bytes': self.max_bytes,
+            'ttl_seconds': self.ttl,
+            'functions': functions,
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SharedCache()
+        return _cache
+
+
+def plain_figures(value):
+    """Reemplaza las go.Figure (sueltas o dentro de componentes Dash) por su dict equivalente.
+
+    Deserializar una Figure vuelve a validar todas sus propiedades (decenas o cientos
+    de ms por pestaña); un dict se deserializa en lo que tarda leer los bytes.
+    """
+    from dash.development.base_component import Component
+    from plotly.basedatatypes import BaseFigure
+
+    if isinstance(value, BaseFigure):
+        return value.to_plotly_json()
+    if isinstance(value, Component):
+        for name in value._prop_names:
+            prop = getattr(value, name, None)
+            if isinstance(prop, (BaseFigure, Component, list, tuple)):
+                setattr(value, name, plain_figures(prop))
+        return value
+    if isinstance(value, (list, tuple)):
+        return type(value)(plain_figures(item) for item in value)
+    return value
+
+
+def _source_hash(root=None):
+    """Hash del código de la aplicación (los .py de su directorio y de pages/)."""
+    root = root or os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256()
+    for directory in (root, os.path.join(root, "pages")):
+        if not os.path.isdir(directory):
+            continue
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(".py"):
+                with open(os.path.join(directory, name), "rb") as fh:
+                    digest.update(name.encode() + b"\0" + fh.read())
+    return digest.hexdigest()[:16]
+
+
+# Versión del código desplegado: APP_VERSION (p. ej. el commit) o, si no se define, un hash de las fuentes
+CODE_VERSION = os.environ.get("APP_VERSION") or _source_hash()
+
+
+def _key_part(value):
+    # Las instantáneas (y cualquier objeto versionado) entran en la clave por su versión
+    version = getattr(value, 'version', None)
+    if isinstance(version, str):
+        return ('version', version)
+    return value
+
+
+def cache_key(namespace, args, kwargs, version=None):
+    parts = (CACHE_FORMAT, CODE_VERSION, namespace, version, tuple(_key_part(a) for a in args),
+             tuple(sorted((k, _key_part(v)) for k, v in kwargs.items())))
+    return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+
+def shared_cache(ttl=None, version=None):
+    """Decorador: cachea el resultado en la caché compartida.
+
+    `version` es una función sin argumentos que devuelve la versión de los datos,
+    para funciones que no reciben la instantánea como argumento.
+    """
+    def decorator(func):
+        namespace = f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache = get_cache()
+            key = cache_key(namespace, args, kwargs, version() if version else None)
+            found, value = cache.get(key, namespace)
+            if found:
+                return value
+            value = plain_figures(func(*args, **kwargs))
+            cache.set(key, value, namespace, ttl)
+            return value
+
+        return wrapper
+    return decorator
+
+
+def register_routes(server):
+    from flask import jsonify
+
+    @server.route("/api/cache-stats")
+    def api_cache_stats():
+        return jsonify(get_cache().stats())
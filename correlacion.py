@@ -0,0 +1,215 @@
+"""Matrices de correlación de Pearson a partir de acumuladores de co-momentos en línea.
+
+Un CoMoments guarda, para las columnas numéricas de CORRELATION_COLUMNS, la
+cantidad de filas, el vector de medias y la matriz de co-momentos centrados
+(sum((x - media_x) * (y - media_y))). Dos acumuladores se combinan con la
+fórmula de Chan et al. sin volver a ver las filas, y la correlación sale de la
+matriz de co-momentos en O(columnas²), sin importar cuántas filas se
+acumularon. A diferencia de guardar sumas y sumas de productos, los co-momentos
+centrados no pierden precisión cuando la media es grande frente a la varianza.
+
+GroupedCoMoments guarda un acumulador para todas las filas y uno por cada valor
+de las dimensiones de CORRELATION_GROUPS (País y Nivel de Estrés). Vive en la
+instantánea de ingesta.py junto al cubo y los histogramas: cada lote nuevo se
+resume por separado y se combina con el acumulado, y el resultado de la base se
+guarda en el almacén columnar (almacen_columnar.py). También sirve para
+combinar resultados parciales de trozos de datos o de otros procesos.
+
+Las filas con algún valor faltante en CORRELATION_COLUMNS no se acumulan.
+
+Ejecutar `python correlacion.py [filas del lote]` compara el acumulado por
+lotes (y en procesos separados) con np.corrcoef sobre todas las filas, y mide el
+costo de pedir la matriz para distintos tamaños de datos y el de agregar un lote.
+"""
+from functools import reduce
+
+import numpy as np
+
+CORRELATION_COLUMNS = ['Age', 'Coffee_Intake', 'Caffeine_mg', 'Sleep_Hours', 'BMI', 'Heart_Rate',
+                       'Physical_Activity_Hours']
+CORRELATION_GROUPS = ['Country', 'Stress_Level']
+
+
+class CoMoments:
+    """Cantidad de filas, medias y matriz de co-momentos centrados de un conjunto de columnas."""
+
+    def __init__(self, n, mean, comoment):
+        self.n = n
+        self.mean = mean
+        self.comoment = comoment
+
+    @classmethod
+    def empty(cls, k):
+        return cls(0, np.zeros(k), np.zeros((k, k)))
+
+    @classmethod
+    def from_values(cls, values):
+        """Acumulador de una matriz (filas x columnas); dos pasadas sobre el trozo: media y luego co-momentos."""
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return cls.empty(values.shape[1])
+        mean = values.mean(axis=0)
+        centered = values - mean
+        return cls(len(values), mean, centered.T @ centered)
+
+    def merge(self, other):
+        """Acumulador de la unión de ambos conjuntos de filas (Chan et al.); ninguno se modifica."""
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            return other
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        mean = self.mean + delta * (other.n / n)
+        comoment = self.comoment + other.comoment + np.outer(delta, delta) * (self.n * other.n / n)
+        return CoMoments(n, mean, comoment)
+
+    def covariance(self):
+        return self.comoment / (self.n - 1) if self.n > 1 else np.full_like(self.comoment, np.nan)
+
+    def correlation(self):
+        """Matriz de correlación de Pearson (NaN en las columnas sin variación)."""
+        std = np.sqrt(np.diag(self.comoment))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            correlation = self.comoment / np.outer(std, std)
+        return np.clip(correlation, -1, 1)
+
+    def to_dict(self):
+        return {'n': self.n, 'mean': self.mean.tolist(), 'comoment': self.comoment.tolist()}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['n'], np.asarray(data['mean']), np.asarray(data['comoment']))
+
+
+class GroupedCoMoments:
+    """Co-momentos de todas las filas y de cada valor de las dimensiones de agrupación."""
+
+    def __init__(self, total, groups, columns=CORRELATION_COLUMNS):
+        self.total = total
+        self.groups = groups
+        self.columns = list(columns)
+
+    @classmethod
+    def from_frame(cls, df, columns=CORRELATION_COLUMNS, dimensions=CORRELATION_GROUPS):
+        columns = [c for c in columns if c in df.columns]
+        values = df[columns].to_numpy(dtype=np.float64)
+        complete = ~np.isnan(values).any(axis=1)
+        values = values[complete]
+
+        groups = {}
+        for dimension in dimensions:
+            if dimension not in df.columns:
+                continue
+            labels = df[dimension].to_numpy()[complete]
+            groups[dimension] = {}
+            for value, rows in _group_rows(labels).items():
+                groups[dimension][value] = CoMoments.from_values(values[rows])
+        return cls(CoMoments.from_values(values), groups, columns)
+
+    def merge(self, other):
+        """Combina este acumulado con el de otras filas (un lote nuevo, otro trozo u otro proceso)."""
+        groups = {}
+        for dimension in self.groups.keys() | other.groups.keys():
+            mine, theirs = self.groups.get(dimension, {}), other.groups.get(dimension, {})
+            groups[dimension] = {
+                value: (mine[value].merge(theirs[value]) if value in mine and value in theirs
+                        else mine.get(value) or theirs[value])
+                for value in mine.keys() | theirs.keys()
+            }
+        return GroupedCoMoments(self.total.merge(other.total), groups, self.columns)
+
+    def updated(self, df):
+        """Nuevo acumulado con las filas de `df` agregadas (el actual no se modifica)."""
+        return self.merge(GroupedCoMoments.from_frame(df, self.columns, list(self.groups)))
+
+    def get(self, dimension=None, value=None):
+        """Acumulador de todas las filas (sin dimensión) o de un valor de una dimensión."""
+        if dimension is None:
+            return self.total
+        return self.groups[dimension][value]
+
+    def correlation(self, dimension=None, value=None):
+        return self.get(dimension, value).correlation()
+
+    def values(self, dimension):
+        return sorted(self.groups.get(dimension, {}))
+
+    def to_dict(self):
+        return {
+            'columns': self.columns,
+            'total': self.total.to_dict(),
+            'groups': {dimension: {str(value): moments.to_dict() for value, moments in by_value.items()}
+                       for dimension, by_value in self.groups.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        groups = {dimension: {value: CoMoments.from_dict(moments) for value, moments in by_value.items()}
+                  for dimension, by_value in data['groups'].items()}
+        return cls(CoMoments.from_dict(data['total']), groups, data['columns'])
+
+
+def _group_rows(labels):
+    """{valor: posiciones} sin los valores faltantes."""
+    import pandas as pd
+
+    codes, uniques = pd.factorize(labels)
+    order = np.argsort(codes, kind='stable')
+    bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+    return {str(value): order[bounds[i]:bounds[i + 1]] for i, value in enumerate(uniques)}
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+    from concurrent.futures import ProcessPoolExecutor
+
+    from datos import DATA_PATH, add_health_risk, load_dataset
+
+    data = add_health_risk(load_dataset(DATA_PATH))
+    n_chunks = 20
+
+    # Acumulado por trozos (como la ingesta por lotes) y en procesos separados, contra una sola pasada
+    chunks = np.array_split(np.arange(len(data)), n_chunks)
+    streamed = reduce(GroupedCoMoments.merge, (GroupedCoMoments.from_frame(data.iloc[rows]) for rows in chunks))
+    with ProcessPoolExecutor(2) as pool:
+        parallel = reduce(GroupedCoMoments.merge,
+                          pool.map(GroupedCoMoments.from_frame, (data.iloc[rows] for rows in chunks)))
+    reference = np.corrcoef(data[CORRELATION_COLUMNS].to_numpy(dtype=np.float64), rowvar=False)
+    print(f"Diferencia máxima con np.corrcoef: {n_chunks} lotes {np.abs(streamed.correlation() - reference).max():.2e}, "
+          f"procesos {np.abs(parallel.correlation() - reference).max():.2e}")
+    for dimension in CORRELATION_GROUPS:
+        worst = max(
+            np.abs(streamed.correlation(dimension, value) - np.corrcoef(
+                data.loc[data[dimension].astype(str) == value, CORRELATION_COLUMNS].to_numpy(dtype=np.float64),
+                rowvar=False)).max()
+            for value in streamed.values(dimension)
+        )
+        print(f"  por {dimension} ({len(streamed.values(dimension))} grupos): {worst:.2e}")
+
+    # Estabilidad: media grande frente a la varianza (sumas de cuadrados vs. co-momentos centrados)
+    shifted = data[CORRELATION_COLUMNS].to_numpy(dtype=np.float64) + 1e9
+    naive_n = len(shifted)
+    sums, products = shifted.sum(axis=0), shifted.T @ shifted
+    naive_cov = (products - np.outer(sums, sums) / naive_n) / (naive_n - 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        naive = naive_cov / np.sqrt(np.outer(np.diag(naive_cov), np.diag(naive_cov)))
+    stable = reduce(CoMoments.merge, (CoMoments.from_values(shifted[rows]) for rows in chunks)).correlation()
+    print(f"Con un desplazamiento de 1e9: sumas de productos {np.nanmax(np.abs(naive - reference)):.2e}, "
+          f"co-momentos {np.abs(stable - reference).max():.2e}")
+
+    # Costo de pedir la matriz: no depende de la cantidad de filas acumuladas
+    for factor in (1, 10, 100):
+        accumulated = reduce(GroupedCoMoments.merge, [streamed] * factor)
+        start = time.perf_counter()
+        repeats = 1000
+        for _ in range(repeats):
+            accumulated.correlation('Country', 'Brazil')
+        print(f"{accumulated.total.n:>9,} filas: correlación en {(time.perf_counter() - start) / repeats * 1e6:.1f} µs")
+
+    start = time.perf_counter()
+    batch = data.iloc[:int(sys.argv[1]) if len(sys.argv) > 1 else 500]
+    updated = streamed.updated(batch)
+    print(f"Lote de {len(batch)} filas agregado en {(time.perf_counter() - start) * 1000:.2f} ms "
+          f"(total {updated.total.n:,} filas)")
@@ -0,0 +1,81 @@
+"""Cubo de agregados precalculados sobre las dimensiones categóricas.
+
+Se construye una sola vez (un groupby sobre todas las dimensiones) y guarda,
+para cada combinación observada de País, Género, Ocupación, Nivel de Estrés y
+Calidad del Sueño, la cantidad de filas y la suma y suma de cuadrados de cada
+medida numérica. Cualquier media, varianza o conteo agrupado y filtrado se
+responde agregando las celdas del cubo (a lo sumo unos miles de filas) en lugar
+de recorrer el dataset.
+"""
+import numpy as np
+import pandas as pd
+
+CUBE_DIMENSIONS = ['Country', 'Gender', 'Occupation', 'Stress_Level', 'Sleep_Quality']
+CUBE_MEASURES = [
+    'Age', 'Coffee_Intake', 'Caffeine_mg', 'Sleep_Hours', 'BMI',
+    'Heart_Rate', 'Physical_Activity_Hours', 'Health_Risk',
+]
+
+
+class AggregateCube:
+    """Conteos, sumas y sumas de cuadrados por combinación de dimensiones."""
+
+    def __init__(self, cells, dimensions=CUBE_DIMENSIONS, measures=CUBE_MEASURES):
+        self.cells = cells
+        self.dimensions = list(dimensions)
+        self.measures = list(measures)
+
+    @classmethod
+    def from_frame(cls, df, dimensions=CUBE_DIMENSIONS, measures=CUBE_MEASURES):
+        measures = [m for m in measures if m in df.columns]
+        values = df[measures].astype(np.float64)
+        squares = values.pow(2).add_suffix('__sumsq')
+        frame = pd.concat([df[dimensions], values.add_suffix('__sum'), squares], axis=1)
+        frame['count'] = 1
+
+        cells = frame.groupby(dimensions, observed=True, sort=False).sum().reset_index()
+        return cls(cells, dimensions, measures)
+
+    def merge(self, other):
+        """Cubo que combina este y otro (p. ej. el de un lote nuevo de filas)."""
+        cells = pd.concat([self.cells, other.cells], ignore_index=True)
+        cells = cells.groupby(self.dimensions, observed=True, sort=False).sum().reset_index()
+        return AggregateCube(cells, self.dimensions, self.measures)
+
+    def _filtered_cells(self, filters):
+        cells = self.cells
+        for column, values in (filters or {}).items():
+            if values:
+                cells = cells[cells[column].isin(values)]
+        return cells
+
+    def rollup(self, by, filters=None, measures=None):
+        """Conteo, media y varianza (muestral) de las medidas agrupadas por `by`.
+
+        Devuelve un DataFrame con columnas count, <medida>_mean y <medida>_var.
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        measures = measures or self.measures
+        columns = ['count'] + [f'{m}__sum' for m in measures] + [f'{m}__sumsq' for m in measures]
+
+        cells = self._filtered_cells(filters)
+        if by:
+            totals = cells.groupby(by, observed=True)[columns].sum()
+        else:
+            totals = cells[columns].sum().to_frame().T
+
+        result = pd.DataFrame({'count': totals['count'].astype(np.int64)}, index=totals.index)
+        n = totals['count']
+        for m in measures:
+            mean = totals[f'{m}__sum'] / n
+            variance = (totals[f'{m}__sumsq'] - n * mean ** 2) / (n - 1)
+            result[f'{m}_mean'] = mean
+            # Errores de redondeo pueden dar varianzas mínimamente negativas
+            result[f'{m}_var'] = variance.clip(lower=0).where(n > 1)
+        return result
+
+    def mean(self, measure, by, filters=None):
+        return self.rollup(by, filters, [measure])[f'{measure}_mean']
+
+    def count(self, by=(), filters=None):
+        return self.rollup(by, filters, [])['count']
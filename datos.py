@@ -0,0 +1,228 @@
+"""Carga tipada del dataset de café y salud con caché columnar (Arrow).
+
+El CSV se lee con un esquema explícito: categóricas para las columnas de texto,
+enteros compactos (int8/int16) para indicadores y float32 para las medidas. En
+la primera lectura se escribe un archivo Arrow IPC sin compresión; las cargas
+siguientes lo abren con memory-map en lugar de volver a parsear el CSV.
+
+Si pyarrow no está instalado se usa solo el CSV (mismo esquema, sin caché).
+
+Ejecutar `python datos.py [filas ...]` imprime el reporte de memoria por
+columna y compara el tiempo de carga CSV vs caché para cada tamaño.
+"""
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+DATA_PATH = "data/synthetic_coffee_health_10000.csv"
+CACHE_DIR = os.environ.get("DATA_CACHE_DIR", "artifacts/data")
+# Se incrementa si cambia SCHEMA, para invalidar las cachés existentes
+SCHEMA_VERSION = 1
+
+STRESS_ORDER = ['Low', 'Medium', 'High']
+SLEEP_QUALITY_ORDER = ['Poor', 'Fair', 'Good', 'Excellent']
+HEALTH_ISSUES_ORDER = ['Mild', 'Moderate', 'Severe']
+HEALTH_RISK_LABELS = ['Low Risk', 'High Risk']
+
+SCHEMA = {
+    'ID': 'int32',
+    'Age': 'int8',
+    'Gender': 'category',
+    'Country': 'category',
+    'Coffee_Intake': 'float32',
+    'Caffeine_mg': 'float32',
+    'Sleep_Hours': 'float32',
+    'Sleep_Quality': pd.CategoricalDtype(SLEEP_QUALITY_ORDER, ordered=True),
+    'BMI': 'float32',
+    'Heart_Rate': 'int16',
+    'Stress_Level': pd.CategoricalDtype(STRESS_ORDER, ordered=True),
+    'Physical_Activity_Hours': 'float32',
+    # "None" se lee como faltante (comportamiento por defecto de pandas)
+    'Health_Issues': pd.CategoricalDtype(HEALTH_ISSUES_ORDER, ordered=True),
+    'Occupation': 'category',
+    'Smoking': 'int8',
+    'Alcohol_Consumption': 'int8',
+}
+
+
+def data_version(path=DATA_PATH):
+    """Versión barata de un archivo de datos: ruta, tamaño, mtime y versión del esquema."""
+    stat = os.stat(path)
+    signature = f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}:{SCHEMA_VERSION}"
+    return hashlib.sha256(signature.encode()).hexdigest()[:16]
+
+
+def scored_version(path=DATA_PATH):
+    """Versión del dataset puntuado: la del archivo más la de las reglas de Health_Risk (puntuacion.py)."""
+    from puntuacion import rules_version
+
+    signature = f"{data_version(path)}:{rules_version()}"
+    return hashlib.sha256(signature.encode()).hexdigest()[:16]
+
+
+def cache_path(path=DATA_PATH, cache_dir=None):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(cache_dir or CACHE_DIR, f"{stem}-{data_version(path)}.arrow")
+
+
+def read_csv(path=DATA_PATH):
+    """Lee el CSV aplicando SCHEMA."""
+    return pd.read_csv(path, dtype=SCHEMA)
+
+
+def _write_cache(df, target):
+    import pyarrow as pa
+
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    tmp_path = f"{target}.{os.getpid()}.tmp"
+    with pa.OSFile(tmp_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp_path, target)
+
+
+def _read_cache(target):
+    import pyarrow as pa
+
+    # split_blocks evita consolidar columnas: las numéricas sin nulos quedan como
+    # vistas sobre el archivo mapeado en memoria.
+    table = pa.ipc.open_file(pa.memory_map(target, "r")).read_all()
+    return table.to_pandas(split_blocks=True)
+
+
+def load_dataset(path=DATA_PATH, use_cache=True, cache_dir=None):
+    """Carga el dataset tipado, usando (y creando si hace falta) la caché Arrow."""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        use_cache = False
+
+    if not use_cache:
+        return read_csv(path)
+
+    target = cache_path(path, cache_dir)
+    if not os.path.exists(target):
+        _write_cache(read_csv(path), target)
+    return _read_cache(target)
+
+
+def check_integer_values(values, dtype, column):
+    """ValueError si algún valor presente de `values` no es entero o no cabe en `dtype`.
+
+    astype('int8'/'int16') trunca las fracciones y da la vuelta a los valores
+    fuera de rango sin avisar (Age=300 quedaría como 44).
+    """
+    numbers = pd.to_numeric(values, errors='raise').to_numpy(dtype=np.float64)
+    numbers = numbers[~np.isnan(numbers)]
+    if not np.isfinite(numbers).all() or (numbers != np.round(numbers)).any():
+        raise ValueError(f"Valores no enteros en {column}")
+    limits = np.iinfo(dtype)
+    outside = numbers[(numbers < limits.min) | (numbers > limits.max)]
+    if len(outside):
+        raise ValueError(f"Valores fuera de rango en {column} ({limits.min} a {limits.max}): "
+                         f"{sorted({int(value) for value in outside})[:5]}")
+
+
+def coerce_batch(batch, reference, imputer=None):
+    """Aplica a un lote nuevo los dtypes de `reference` (el dataset ya cargado).
+
+    Las categóricas no ordenadas admiten valores nuevos (se agregan a las
+    categorías); en las ordenadas (Stress_Level, Sleep_Quality, Health_Issues)
+    un valor desconocido es un error, igual que un valor no entero o fuera de
+    rango en una columna entera.
+
+    Con `imputer` (imputacion.NeighborImputer ya ajustado) los faltantes se
+    completan antes de convertir a enteros; sin él, o si quedan faltantes en una
+    columna entera, es un error.
+    """
+    missing = [column for column in SCHEMA if column not in batch.columns]
+    if missing:
+        raise ValueError(f"Faltan columnas en el lote: {missing}")
+
+    columns = {}
+    for column in SCHEMA:
+        dtype = reference[column].dtype
+        values = batch[column]
+        if isinstance(dtype, pd.CategoricalDtype):
+            present = pd.Index(values.dropna().unique())
+            unknown = present.difference(dtype.categories)
+            if len(unknown) and dtype.ordered:
+                raise ValueError(f"Valores no válidos en {column}: {list(unknown)}")
+            if len(unknown):
+                dtype = pd.CategoricalDtype(dtype.categories.append(unknown), ordered=False)
+        elif pd.api.types.is_integer_dtype(dtype):
+            check_integer_values(values, dtype, column)
+            if values.isna().any():
+                # Se convierte a entero después de imputar
+                dtype = np.float64
+        columns[column] = values.astype(dtype)
+    frame = pd.DataFrame(columns, index=batch.index)
+
+    if imputer is not None:
+        frame = imputer.transform(frame)
+    for column in SCHEMA:
+        dtype = reference[column].dtype
+        if pd.api.types.is_integer_dtype(dtype) and frame[column].dtype != dtype:
+            if frame[column].isna().any():
+                raise ValueError(f"Valores faltantes en {column}")
+            frame[column] = frame[column].round().astype(dtype)
+    return frame
+
+
+def add_health_risk(df):
+    """Agrega Health_Risk y Health_Risk_Label en el mismo DataFrame (sin copiarlo)."""
+    from puntuacion import score_health_risk
+
+    df['Health_Risk'] = score_health_risk(df)
+    df['Health_Risk_Label'] = pd.Categorical.from_codes(df['Health_Risk'].to_numpy(), HEALTH_RISK_LABELS)
+    return df
+
+
+def memory_report(df):
+    """Bytes por columna (incluyendo el contenido de objetos) y dtype."""
+    usage = df.memory_usage(index=False, deep=True)
+    report = pd.DataFrame({'dtype': df.dtypes.astype(str), 'bytes': usage})
+    report.loc['TOTAL'] = ['', usage.sum()]
+    return report
+
+
+def _scaled_csv(source, n_rows, directory):
+    data = pd.read_csv(source)
+    reps = -(-n_rows // len(data))
+    data = pd.concat([data] * reps, ignore_index=True).iloc[:n_rows]
+    data['ID'] = np.arange(1, n_rows + 1)
+    target = os.path.join(directory, f"coffee_{n_rows}.csv")
+    data.to_csv(target, index=False)
+    return target
+
+
+if __name__ == "__main__":
+    import sys
+    import tempfile
+    import time
+
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 10_000_000]
+
+    untyped = pd.read_csv(DATA_PATH)
+    typed = read_csv(DATA_PATH)
+    report = memory_report(typed)
+    report['bytes_untyped'] = memory_report(untyped)['bytes']
+    print(report.to_string(), "\n")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for n_rows in sizes:
+            csv_path = _scaled_csv(DATA_PATH, n_rows, workdir)
+
+            start = time.perf_counter()
+            read_csv(csv_path)
+            csv_s = time.perf_counter() - start
+
+            load_dataset(csv_path, cache_dir=workdir)  # escribe la caché
+            start = time.perf_counter()
+            load_dataset(csv_path, cache_dir=workdir)
+            cache_s = time.perf_counter() - start
+
+            print(f"{n_rows:>10,} filas  CSV {csv_s:.3f}s  caché Arrow {cache_s:.3f}s")
+            os.remove(csv_path)
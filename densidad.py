@@ -0,0 +1,117 @@
+"""Agregación de densidad en el servidor para los diagramas de dispersión.
+
+En lugar de enviar cada punto al navegador, los puntos del rango visible se
+agrupan en una grilla 2D con NumPy y se dibujan como heatmap. Cuando el usuario
+hace zoom, el callback de `relayoutData` vuelve a agrupar solo el rango visible
+con la misma cantidad de celdas, es decir, con más detalle. Si en el rango hay
+pocos puntos se muestran los puntos originales.
+
+El tamaño del payload depende de DENSITY_BINS (y de DENSITY_MAX_POINTS), no de
+la cantidad de filas.
+"""
+import numpy as np
+import plotly.graph_objects as go
+
+# Celdas por eje de la grilla de densidad
+DENSITY_BINS = 60
+# Con esta cantidad de puntos visibles o menos se dibujan los puntos originales
+DENSITY_MAX_POINTS = 3000
+
+
+def ranges_from_relayout(relayout_data):
+    """Extrae (x_range, y_range) de relayoutData; None en un eje si está en autorange.
+
+    Devuelve None si el evento no cambia los ejes (p. ej. un hover o un resize).
+    """
+    if not relayout_data:
+        return None
+
+    ranges = {}
+    for axis in ('xaxis', 'yaxis'):
+        if f'{axis}.range[0]' in relayout_data:
+            ranges[axis] = (relayout_data[f'{axis}.range[0]'], relayout_data[f'{axis}.range[1]'])
+        elif f'{axis}.range' in relayout_data:
+            ranges[axis] = tuple(relayout_data[f'{axis}.range'])
+        elif relayout_data.get(f'{axis}.autorange'):
+            ranges[axis] = None
+
+    if not ranges:
+        return None
+    return ranges.get('xaxis'), ranges.get('yaxis')
+
+
+def visible_mask(x, y, x_range=None, y_range=None):
+    mask = np.isfinite(x) & np.isfinite(y)
+    if x_range is not None:
+        mask &= (x >= x_range[0]) & (x <= x_range[1])
+    if y_range is not None:
+        mask &= (y >= y_range[0]) & (y <= y_range[1])
+    return mask
+
+
+def bin_2d(x, y, x_range=None, y_range=None, bins=DENSITY_BINS):
+    """Cuenta los puntos del rango visible en una grilla bins x bins.
+
+    Devuelve (counts[bins_x, bins_y], x_edges, y_edges).
+    """
+    if x_range is None:
+        x_range = (float(np.nanmin(x)), float(np.nanmax(x)))
+    if y_range is None:
+        y_range = (float(np.nanmin(y)), float(np.nanmax(y)))
+    mask = visible_mask(x, y, x_range, y_range)
+    return np.histogram2d(x[mask], y[mask], bins=bins, range=[x_range, y_range])
+
+
+def _trendline(x, y):
+    """Recta de mínimos cuadrados (equivalente a trendline='ols' de Plotly Express)."""
+    if len(x) < 2 or np.ptp(x) == 0:
+        return None
+    slope, intercept = np.polyfit(x, y, 1)
+    x_line = np.array([x.min(), x.max()])
+    return go.Scatter(
+        x=x_line, y=slope * x_line + intercept, mode='lines',
+        name=f'OLS: y = {slope:.3f}x + {intercept:.3f}',
+        line={'color': '#e45756', 'width': 2}, hoverinfo='name',
+    )
+
+
+def density_figure(df, x, y, title, labels, x_range=None, y_range=None, bins=DENSITY_BINS):
+    """Dispersión de x vs y: heatmap de densidad o puntos originales según cuántos sean visibles."""
+    x_values = df[x].to_numpy(dtype=np.float64)
+    y_values = df[y].to_numpy(dtype=np.float64)
+    mask = visible_mask(x_values, y_values, x_range, y_range)
+    x_visible, y_visible = x_values[mask], y_values[mask]
+
+    traces = []
+    if len(x_visible) <= DENSITY_MAX_POINTS:
+        traces.append(go.Scattergl(
+            x=x_visible, y=y_visible, mode='markers', name='Registros',
+            marker={'opacity': 0.5, 'color': '#4c78a8'},
+        ))
+    elif len(x_visible):
+        counts, x_edges, y_edges = bin_2d(x_visible, y_visible, x_range, y_range, bins)
+        # Las celdas vacías quedan transparentes
+        z = np.where(counts.T > 0, counts.T, np.nan)
+        traces.append(go.Heatmap(
+            x=(x_edges[:-1] + x_edges[1:]) / 2, y=(y_edges[:-1] + y_edges[1:]) / 2,
+            z=z, colorscale='Blues', colorbar={'title': 'Registros'},
+            hovertemplate=f"{labels.get(x, x)}: %{{x:.2f}}<br>{labels.get(y, y)}: %{{y:.2f}}<br>Registros: %{{z}}<extra></extra>",
+        ))
+
+    trend = _trendline(x_visible, y_visible)
+    if trend is not None:
+        traces.append(trend)
+
+    fig = go.Figure(traces)
+    fig.update_layout(
+        title=title,
+        xaxis_title=labels.get(x, x), yaxis_title=labels.get(y, y),
+        # Conserva el zoom del usuario cuando el callback reemplaza la figura
+        uirevision=f'{x}-{y}',
+        legend={'orientation': 'h', 'y': -0.2},
+    )
+    if x_range is not None:
+        fig.update_xaxes(range=list(x_range))
+    if y_range is not None:
+        fig.update_yaxes(range=list(y_range))
+    return fig
@@ -0,0 +1,252 @@
+"""Entrenamiento rápido: crecimiento incremental del bosque y búsqueda por halving sucesivo.
+
+Crecimiento con warm_start: en lugar de fijar n_estimators, el Random Forest
+agrega GROWTH_STEP árboles por ronda (reutilizando los ya ajustados) y se
+detiene cuando el accuracy out-of-bag deja de mejorar más de OOB_TOLERANCE
+durante OOB_PATIENCE rondas seguidas (o al llegar a GROWTH_MAX_TREES). Así el
+número de árboles sale de los datos y no de un valor fijo.
+
+Búsqueda por halving sucesivo: los candidatos de SEARCH_SPACE se evalúan
+primero sobre una fracción de las filas de entrenamiento; en cada ronda sigue
+solo el mejor 1/ETA (por accuracy OOB) con ETA veces más filas, hasta usar el
+conjunto completo. Las evaluaciones corren en un pool de procesos con
+TRAINING_CORES procesos de un hilo cada uno, para no quitarle todos los núcleos
+a los workers web. El preprocesamiento se ajusta una sola vez y la matriz ya
+transformada se envía a cada proceso al iniciarlo.
+
+El Pipeline ganador (preprocesador + bosque de la última ronda) se evalúa en el
+conjunto de prueba de modelo.py y se guarda en el almacén de artefactos junto
+con el reporte de tiempo contra accuracy de cada evaluación. modelo.py lo usa
+en lugar del modelo fijo cuando existe.
+
+Ejecutar `python entrenamiento.py [csv] [--cores N]` corre la búsqueda, guarda
+el ganador e imprime el reporte comparado con el modelo fijo de 100 árboles.
+"""
+import math
+import os
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+import almacen_modelos
+from modelo import MODEL_PARAMS, build_pipeline, evaluate_model, model_key, split_train_test
+
+# Núcleos para la búsqueda: por defecto CORE_BUDGET (la mitad; el resto queda para los workers web).
+# En un proceso del pool de trabajos.py, CORE_BUDGET ya es la parte de ese proceso
+CORE_BUDGET = int(os.environ.get("CORE_BUDGET", max(1, (os.cpu_count() or 1) // 2)))
+TRAINING_CORES = int(os.environ.get("TRAINING_CORES", CORE_BUDGET))
+# Con MODEL_SEARCH=1 la app corre la búsqueda si no hay modelo ganador guardado
+MODEL_SEARCH = os.environ.get("MODEL_SEARCH", "0") == "1"
+
+GROWTH_STEP = 25
+GROWTH_MAX_TREES = 400
+OOB_TOLERANCE = 0.001
+OOB_PATIENCE = 2
+
+SEARCH_SPACE = {
+    'max_depth': [None, 12, 24],
+    'min_samples_leaf': [1, 2, 5],
+    'max_features': ['sqrt', 0.3, 0.6],
+}
+ETA = 3
+# Filas mínimas de la primera ronda
+MIN_SEARCH_ROWS = 500
+SEARCH_SEED = 42
+
+
+def grow_forest(X, y, params, step=GROWTH_STEP, max_trees=GROWTH_MAX_TREES,
+                tolerance=OOB_TOLERANCE, patience=OOB_PATIENCE):
+    """Random Forest ajustado agregando `step` árboles por ronda hasta la meseta del OOB.
+
+    Devuelve (bosque, curva) con la curva como lista de (árboles, accuracy OOB, segundos).
+    """
+    from sklearn.ensemble import RandomForestClassifier
+
+    forest = RandomForestClassifier(**params, n_estimators=step, warm_start=True, oob_score=True)
+    best, stale, curve = -np.inf, 0, []
+    start = time.perf_counter()
+    with warnings.catch_warnings():
+        # Con pocos árboles algunas filas aún no tienen predicción OOB
+        warnings.simplefilter("ignore", UserWarning)
+        while True:
+            forest.fit(X, y)
+            score = float(forest.oob_score_)
+            curve.append((forest.n_estimators, score, time.perf_counter() - start))
+            if score > best + tolerance:
+                best, stale = score, 0
+            else:
+                stale += 1
+            if stale >= patience or forest.n_estimators + step > max_trees:
+                break
+            forest.n_estimators += step
+    forest.warm_start = False
+    return forest, curve
+
+
+def candidates(space=SEARCH_SPACE):
+    from sklearn.model_selection import ParameterGrid
+
+    return list(ParameterGrid(space))
+
+
+# Matriz de entrenamiento de cada proceso del pool (se envía una vez, al iniciarlo)
+_shared = {}
+
+
+def _init_worker(X, y):
+    _shared['X'], _shared['y'] = X, y
+
+
+def _evaluate_candidate(params, rows, keep_model):
+    """Crece un bosque con `params` sobre las filas `rows` de la matriz compartida."""
+    start = time.perf_counter()
+    forest, curve = grow_forest(_shared['X'][rows], _shared['y'][rows],
+                                {**params, 'random_state': SEARCH_SEED, 'n_jobs': 1})
+    result = {
+        'params': params,
+        'rows': len(rows),
+        'trees': forest.n_estimators,
+        'oob_accuracy': curve[-1][1],
+        'seconds': time.perf_counter() - start,
+        'curve': curve,
+    }
+    return result, (forest if keep_model else None)
+
+
+def successive_halving(X, y, space=SEARCH_SPACE, eta=ETA, cores=TRAINING_CORES, min_rows=MIN_SEARCH_ROWS):
+    """Búsqueda por halving sucesivo sobre la matriz ya preprocesada.
+
+    Devuelve (bosque ganador ajustado con todas las filas, resultado ganador, reporte).
+    """
+    remaining = candidates(space)
+    # Rondas hasta quedar con un solo candidato (27 candidatos y ETA=3: 27 → 9 → 3)
+    n_rounds = 1
+    while eta ** n_rounds < len(remaining):
+        n_rounds += 1
+    # Subconjuntos anidados: cada ronda usa las primeras filas de la misma permutación
+    order = np.random.default_rng(SEARCH_SEED).permutation(len(y))
+
+    pool = None
+    if cores > 1:
+        import multiprocessing as mp
+        from concurrent.futures import ProcessPoolExecutor
+
+        # spawn: el proceso que busca puede ser un worker web con hilos
+        pool = ProcessPoolExecutor(cores, mp_context=mp.get_context("spawn"),
+                                   initializer=_init_worker, initargs=(X, y))
+    else:
+        _init_worker(X, y)
+
+    report = []
+    try:
+        for round_number in range(n_rounds):
+            last = round_number == n_rounds - 1
+            n_rows = len(y) if last else max(min_rows, len(y) // eta ** (n_rounds - 1 - round_number))
+            rows = np.sort(order[:min(n_rows, len(y))])
+            tasks = [(params, rows, last) for params in remaining]
+            if pool is None:
+                outcomes = [_evaluate_candidate(*task) for task in tasks]
+            else:
+                outcomes = list(pool.map(_evaluate_candidate, *zip(*tasks)))
+
+            outcomes.sort(key=lambda outcome: outcome[0]['oob_accuracy'], reverse=True)
+            for result, _ in outcomes:
+                report.append({**result, 'round': round_number})
+            remaining = [result['params'] for result, _ in outcomes[:max(1, math.ceil(len(outcomes) / eta))]]
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        _shared.clear()
+
+    best_result, best_forest = outcomes[0]
+    return best_forest, best_result, report
+
+
+def _transformed(preprocessor, X):
+    matrix = preprocessor.transform(X)
+    if hasattr(matrix, 'toarray'):
+        matrix = matrix.toarray()
+    return np.ascontiguousarray(matrix, dtype=np.float32)
+
+
+def search_and_train(df, cores=TRAINING_CORES):
+    """Artefacto del Pipeline ganador de la búsqueda, con su reporte en artifact['search']."""
+    from sklearn.pipeline import Pipeline
+
+    start = time.perf_counter()
+    X_train, X_test, y_train, y_test, numerical_features, categorical_features = split_train_test(df)
+    preprocessor = build_pipeline(numerical_features, categorical_features).named_steps['preprocessor']
+    preprocessor.fit(X_train)
+
+    forest, best, report = successive_halving(_transformed(preprocessor, X_train), y_train.to_numpy(), cores=cores)
+    # Para predecir en la app se usan todos los núcleos, como el modelo fijo
+    forest.n_jobs = MODEL_PARAMS['n_jobs']
+    model = Pipeline(steps=[('preprocessor', preprocessor), ('classifier', forest)])
+
+    artifact = evaluate_model(model, X_test, y_test, numerical_features, categorical_features)
+    artifact['search'] = {
+        'best_params': best['params'],
+        'trees': best['trees'],
+        'growth_curve': best['curve'],
+        'report': [{key: value for key, value in entry.items() if key != 'curve'} for entry in report],
+        'cores': cores,
+        'seconds': time.perf_counter() - start,
+    }
+    return artifact
+
+
+def search_key(df):
+    """Clave del artefacto ganador: datos, características y configuración de la búsqueda."""
+    return model_key(df, {
+        'search': SEARCH_SPACE, 'eta': ETA, 'min_rows': MIN_SEARCH_ROWS, 'seed': SEARCH_SEED,
+        'growth': [GROWTH_STEP, GROWTH_MAX_TREES, OOB_TOLERANCE, OOB_PATIENCE],
+    })
+
+
+def load_best(df):
+    """Artefacto ganador guardado (o buscado ahora si MODEL_SEARCH=1); None si no hay."""
+    key = search_key(df)
+    if MODEL_SEARCH:
+        artifact = almacen_modelos.get_or_create(key, lambda: search_and_train(df))
+    else:
+        artifact = almacen_modelos.load_artifact(key)
+    return None if artifact is None else {**artifact, 'version': key}
+
+
+def report_frame(artifact):
+    """Reporte de la búsqueda como DataFrame: una fila por evaluación (ronda, filas, árboles, accuracy, segundos)."""
+    report = pd.DataFrame(artifact['search']['report'])
+    params = pd.DataFrame(list(report.pop('params')))
+    return pd.concat([report, params], axis=1)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from datos import DATA_PATH, add_health_risk, load_dataset
+    from modelo import train_model
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("csv", nargs="?", default=DATA_PATH)
+    parser.add_argument("--cores", type=int, default=TRAINING_CORES)
+    args = parser.parse_args()
+
+    data = add_health_risk(load_dataset(args.csv))
+
+    start = time.perf_counter()
+    fixed = train_model(data)
+    fixed_seconds = time.perf_counter() - start
+
+    artifact = search_and_train(data, args.cores)
+    almacen_modelos.save_artifact(search_key(data), artifact)
+    search = artifact['search']
+
+    with pd.option_context('display.width', 140, 'display.max_columns', 20):
+        print(report_frame(artifact).round(4).to_string(index=False))
+    print(f"\nGanador: {search['best_params']} con {search['trees']} árboles (meseta OOB)")
+    print(f"{'':<28} {'segundos':>9} {'accuracy':>9} {'f1':>7}")
+    print(f"{'Modelo fijo (100 árboles)':<28} {fixed_seconds:9.2f} {fixed['metrics']['accuracy']:9.4f} {fixed['metrics']['f1']:7.4f}")
+    print(f"{'Búsqueda + ganador':<28} {search['seconds']:9.2f} {artifact['metrics']['accuracy']:9.4f} {artifact['metrics']['f1']:7.4f}")
+    print(f"({args.cores} núcleo(s); guardado en {almacen_modelos.artifact_path(search_key(data))})")
@@ -0,0 +1,338 @@
+"""Pruebas de hipótesis por lotes, con intervalos bootstrap, tamaños de efecto y corrección por comparaciones múltiples.
+
+Se prueban todos los pares relevantes del dataset:
+
+- cada variable numérica de NUMERIC_COLUMNS contra Health_Risk (bajo vs. alto):
+  si ambos grupos pasan Shapiro-Wilk (sobre hasta SHAPIRO_ROWS filas) se usa la
+  t de Welch y la d de Cohen; si no, Mann-Whitney U y la correlación
+  rango-biserial (equivale al delta de Cliff),
+- cada par de variables categóricas de CATEGORICAL_COLUMNS: chi-cuadrado de
+  independencia y la V de Cramér con corrección de sesgo (Health_Issues vacío
+  cuenta como 'None').
+
+Los intervalos de confianza del tamaño de efecto (y de la diferencia de medias
+en las numéricas) son bootstrap de percentiles, corregidos por el sesgo que
+estima el propio bootstrap, con BOOTSTRAP_RESAMPLES remuestreos. Cada bloque
+de BOOTSTRAP_CHUNK remuestreos se sortea de una sola vez como conteos
+multinomiales (por valor distinto en las numéricas, por celda de la tabla de
+contingencia en las categóricas) y se evalúa con operaciones matriciales de
+NumPy; los bloques se reparten en STATS_JOBS procesos con joblib. La semilla
+de cada bloque sale de (BOOTSTRAP_SEED, par, bloque): el resultado no depende
+de la cantidad de procesos.
+
+Los p-valores se corrigen sobre la familia completa de pruebas con Holm (error
+por familia) y Benjamini-Hochberg (tasa de falsos descubrimientos). La tabla
+se guarda en el almacén de artefactos con una clave derivada de la versión de
+los datos.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+import almacen_modelos
+from entrenamiento import TRAINING_CORES
+
+TARGET = 'Health_Risk'
+NUMERIC_COLUMNS = ['Age', 'Coffee_Intake', 'Caffeine_mg', 'Sleep_Hours', 'BMI', 'Heart_Rate',
+                   'Physical_Activity_Hours']
+CATEGORICAL_COLUMNS = ['Gender', 'Country', 'Occupation', 'Sleep_Quality', 'Stress_Level', 'Health_Issues',
+                       'Smoking', 'Alcohol_Consumption', TARGET]
+# Valor de las columnas categóricas vacías (Health_Issues sin problemas de salud)
+MISSING_CATEGORY = 'None'
+
+BOOTSTRAP_RESAMPLES = int(os.environ.get("BOOTSTRAP_RESAMPLES", "2000"))
+BOOTSTRAP_CHUNK = 250
+BOOTSTRAP_SEED = 42
+STATS_JOBS = int(os.environ.get("STATS_JOBS", TRAINING_CORES))
+CONFIDENCE = 0.95
+ALPHA = 0.05
+SHAPIRO_ROWS = 5000
+
+EFFECT_NAMES = {
+    'welch': "d de Cohen",
+    'mannwhitney': "Rango-biserial",
+    'chi2': "V de Cramér",
+}
+TEST_NAMES = {
+    'welch': "t de Welch",
+    'mannwhitney': "Mann-Whitney U",
+    'chi2': "Chi-cuadrado",
+}
+
+
+# --- Estadísticos vectorizados sobre conteos: cada fila es un remuestreo ---
+
+def cohens_d(grid, low, high):
+    """d de Cohen (alto - bajo) a partir de conteos por valor de `grid`, con la desviación estándar combinada."""
+    def moments(counts):
+        n = counts.sum(axis=-1)
+        mean = counts @ grid / n
+        return n, mean, (counts @ grid ** 2 - n * mean ** 2) / (n - 1)
+
+    n_low, mean_low, var_low = moments(low)
+    n_high, mean_high, var_high = moments(high)
+    pooled = ((n_low - 1) * var_low + (n_high - 1) * var_high) / (n_low + n_high - 2)
+    return (mean_high - mean_low) / np.sqrt(pooled)
+
+
+def mean_difference(grid, low, high):
+    return high @ grid / high.sum(axis=-1) - low @ grid / low.sum(axis=-1)
+
+
+def rank_biserial(low, high):
+    """Correlación rango-biserial a partir de conteos por valor ordenado: positiva si el grupo alto tiende a valores mayores.
+
+    U del grupo alto = sum(conteo alto(v) * (bajos menores que v + bajos iguales a v / 2)),
+    que es lo mismo que la suma de rangos promedio de Mann-Whitney.
+    """
+    below = np.cumsum(low, axis=-1) - low
+    u_high = (high * (below + low / 2)).sum(axis=-1)
+    return 2 * u_high / (low.sum(axis=-1) * high.sum(axis=-1)) - 1
+
+
+def cramers_v(table):
+    """V de Cramér con corrección de sesgo (Bergsma, 2013) de tablas de contingencia (..., filas, columnas).
+
+    Sin la corrección, la V de tablas grandes (Country) crece al remuestrear y el
+    intervalo bootstrap puede quedar por encima del valor observado.
+    """
+    table = np.asarray(table, dtype=float)
+    rows, columns = table.shape[-2:]
+    n = table.sum(axis=(-2, -1))
+    expected = table.sum(axis=-1, keepdims=True) * table.sum(axis=-2, keepdims=True) / n[..., None, None]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        chi2 = np.where(expected > 0, (table - expected) ** 2 / expected, 0).sum(axis=(-2, -1))
+    phi2 = np.maximum(0, chi2 / n - (rows - 1) * (columns - 1) / (n - 1))
+    rows_corrected = rows - (rows - 1) ** 2 / (n - 1)
+    columns_corrected = columns - (columns - 1) ** 2 / (n - 1)
+    return np.sqrt(phi2 / np.minimum(rows_corrected - 1, columns_corrected - 1))
+
+
+# --- Bloques bootstrap (se ejecutan en los procesos de joblib) ---
+# Remuestrear n filas con reemplazo equivale a sortear sus conteos por valor
+# (o por celda) con una multinomial: cada bloque es una sola llamada a
+# multinomial y unas pocas operaciones matriciales.
+
+def _bootstrap_numeric(grid, low, high, test, pair, chunk, resamples):
+    """(diferencias de medias, tamaños de efecto) de `resamples` remuestreos estratificados por grupo."""
+    rng = np.random.default_rng([BOOTSTRAP_SEED, pair, chunk])
+    low = rng.multinomial(low.sum(), low / low.sum(), size=resamples)
+    high = rng.multinomial(high.sum(), high / high.sum(), size=resamples)
+    effect = cohens_d(grid, low, high) if test == 'welch' else rank_biserial(low, high)
+    return mean_difference(grid, low, high), effect
+
+
+def _bootstrap_categorical(table, pair, chunk, resamples):
+    """V de Cramér de `resamples` remuestreos de filas de la tabla de contingencia."""
+    rng = np.random.default_rng([BOOTSTRAP_SEED, pair, chunk])
+    n = table.sum()
+    resampled = rng.multinomial(n, table.ravel() / n, size=resamples)
+    return cramers_v(resampled.reshape(resamples, *table.shape))
+
+
+def bootstrap_interval(replicates, observed, confidence=CONFIDENCE):
+    """Intervalo bootstrap de percentiles desplazado por el sesgo estimado (media de los remuestreos - observado).
+
+    Sin sesgo coincide con el intervalo de percentiles. La V de Cramér de tablas
+    grandes (Country) crece al remuestrear aun con la corrección de Bergsma; sin
+    el desplazamiento el intervalo puede quedar entero por encima del valor
+    observado.
+    """
+    replicates = np.asarray(replicates)
+    bias = replicates.mean() - observed
+    tail = (1 - confidence) / 2
+    low, high = np.quantile(replicates, [tail, 1 - tail]) - bias
+    return float(low), float(high)
+
+
+def _chunks(resamples, size=BOOTSTRAP_CHUNK):
+    return [min(size, resamples - start) for start in range(0, resamples, size)]
+
+
+# --- Correcciones por comparaciones múltiples ---
+
+def holm(p_values):
+    """p-valores ajustados por Holm-Bonferroni (controla el error por familia)."""
+    p_values = np.asarray(p_values, dtype=float)
+    order = np.argsort(p_values)
+    m = len(p_values)
+    adjusted = np.maximum.accumulate((m - np.arange(m)) * p_values[order])
+    result = np.empty(m)
+    result[order] = np.minimum(adjusted, 1)
+    return result
+
+
+def benjamini_hochberg(p_values):
+    """q-valores de Benjamini-Hochberg (controla la tasa de falsos descubrimientos)."""
+    p_values = np.asarray(p_values, dtype=float)
+    order = np.argsort(p_values)
+    m = len(p_values)
+    adjusted = np.minimum.accumulate((m / np.arange(m, 0, -1) * p_values[order][::-1]))[::-1]
+    result = np.empty(m)
+    result[order] = np.minimum(adjusted, 1)
+    return result
+
+
+# --- Pruebas ---
+
+def _is_normal(values, rng):
+    from scipy.stats import shapiro
+
+    if len(values) > SHAPIRO_ROWS:
+        values = rng.choice(values, SHAPIRO_ROWS, replace=False)
+    return shapiro(values).pvalue >= ALPHA
+
+
+def _numeric_test(df, column, rng):
+    """Prueba, estadístico, p-valor, valores distintos y conteos por grupo de `column` contra TARGET."""
+    from scipy.stats import mannwhitneyu, ttest_ind
+
+    values = df[column].to_numpy(dtype=float)
+    risk = df[TARGET].to_numpy()
+    valid = ~np.isnan(values)
+    low, high = values[valid & (risk == 0)], values[valid & (risk == 1)]
+    if _is_normal(low, rng) and _is_normal(high, rng):
+        test, result = 'welch', ttest_ind(high, low, equal_var=False)
+    else:
+        test, result = 'mannwhitney', mannwhitneyu(high, low, alternative='two-sided')
+
+    grid, codes = np.unique(values[valid], return_inverse=True)
+    groups = risk[valid] == 1
+    counts_low = np.bincount(codes[~groups], minlength=len(grid))
+    counts_high = np.bincount(codes[groups], minlength=len(grid))
+    return test, result.statistic, result.pvalue, grid, counts_low, counts_high
+
+
+def _codes(series):
+    """Códigos enteros 0..k-1 de una columna categórica (o entera); los vacíos cuentan como MISSING_CATEGORY."""
+    values = series.astype(object).where(series.notna(), MISSING_CATEGORY)
+    codes, levels = pd.factorize(values, sort=True)
+    return codes.astype(np.int64), len(levels)
+
+
+def contingency_table(codes_a, levels_a, codes_b, levels_b):
+    return np.bincount(codes_a * levels_b + codes_b, minlength=levels_a * levels_b).reshape(levels_a, levels_b)
+
+
+def run_tests(df, resamples=BOOTSTRAP_RESAMPLES, n_jobs=STATS_JOBS):
+    """DataFrame con una fila por par probado: prueba, estadístico, p-valores corregidos, efecto e IC bootstrap."""
+    from joblib import Parallel, delayed
+    from scipy.stats import chi2_contingency
+
+    rng = np.random.default_rng(BOOTSTRAP_SEED)
+    rows, tasks = [], []
+
+    for column in NUMERIC_COLUMNS:
+        test, statistic, p_value, grid, low, high = _numeric_test(df, column, rng)
+        effect = cohens_d(grid, low, high) if test == 'welch' else rank_biserial(low, high)
+        pair = len(rows)
+        rows.append({'Variable A': column, 'Variable B': TARGET, 'test': test, 'Estadístico': float(statistic),
+                     'p': float(p_value), 'Efecto': float(effect),
+                     'Diferencia': float(mean_difference(grid, low, high)), 'n': int(low.sum() + high.sum())})
+        tasks += [(pair, delayed(_bootstrap_numeric)(grid, low, high, test, pair, chunk, size))
+                  for chunk, size in enumerate(_chunks(resamples))]
+
+    codes = {column: _codes(df[column]) for column in CATEGORICAL_COLUMNS}
+    for position, column_a in enumerate(CATEGORICAL_COLUMNS):
+        for column_b in CATEGORICAL_COLUMNS[position + 1:]:
+            table = contingency_table(*codes[column_a], *codes[column_b])
+            # Niveles sin registros (p. ej. tras una ingesta parcial) no entran en la prueba
+            table = table[table.sum(axis=1) > 0][:, table.sum(axis=0) > 0]
+            chi2, p_value, _, _ = chi2_contingency(table)
+            pair = len(rows)
+            rows.append({'Variable A': column_a, 'Variable B': column_b, 'test': 'chi2', 'Estadístico': float(chi2),
+                         'p': float(p_value), 'Efecto': float(cramers_v(table)),
+                         'Diferencia': np.nan, 'n': int(table.sum())})
+            tasks += [(pair, delayed(_bootstrap_categorical)(table, pair, chunk, size))
+                      for chunk, size in enumerate(_chunks(resamples))]
+
+    outcomes = Parallel(n_jobs=n_jobs)(task for _, task in tasks)
+
+    effects, differences = [[] for _ in rows], [[] for _ in rows]
+    for (pair, _), outcome in zip(tasks, outcomes):
+        if isinstance(outcome, tuple):
+            differences[pair].append(outcome[0])
+            outcome = outcome[1]
+        effects[pair].append(outcome)
+
+    for row, effect, difference in zip(rows, effects, differences):
+        row['Efecto inf.'], row['Efecto sup.'] = bootstrap_interval(np.concatenate(effect), row['Efecto'])
+        if row['test'] == 'chi2':
+            # La V de Cramér no es negativa
+            row['Efecto inf.'] = max(0.0, row['Efecto inf.'])
+        row['Diferencia inf.'], row['Diferencia sup.'] = (
+            bootstrap_interval(np.concatenate(difference), row['Diferencia']) if difference else (np.nan, np.nan)
+        )
+
+    table = pd.DataFrame(rows)
+    table['p Holm'] = holm(table['p'])
+    table['q BH'] = benjamini_hochberg(table['p'])
+    table['Significativa'] = table['p Holm'] < ALPHA
+    table['Medida de efecto'] = table['test'].map(EFFECT_NAMES)
+    table['Prueba'] = table['test'].map(TEST_NAMES)
+    return table.drop(columns='test').sort_values('p', ignore_index=True)
+
+
+def tests_key(snapshot_version):
+    # La versión de la instantánea (ingesta.py) incluye las reglas de Health_Risk; la del archivo
+    # (datos.data_version) no, y con otras reglas devolvería las pruebas de la variable anterior
+    return almacen_modelos.artifact_key(snapshot_version, NUMERIC_COLUMNS + CATEGORICAL_COLUMNS, {
+        'kind': 'hypothesis-tests', 'resamples': BOOTSTRAP_RESAMPLES, 'seed': BOOTSTRAP_SEED,
+        'confidence': CONFIDENCE, 'alpha': ALPHA,
+    })
+
+
+def load_or_test(df, snapshot_version):
+    """Tabla de pruebas de la instantánea `snapshot_version` (se calcula una vez entre procesos)."""
+    return almacen_modelos.get_or_create(tests_key(snapshot_version), lambda: run_tests(df))
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    from datos import DATA_PATH, add_health_risk, load_dataset
+
+    data = add_health_risk(load_dataset(sys.argv[1] if len(sys.argv) > 1 else DATA_PATH))
+
+    # Bloque vectorizado contra el bootstrap ingenuo (filas remuestreadas y scipy en un bucle)
+    from scipy.stats import chi2_contingency, mannwhitneyu
+
+    _, _, _, grid, low, high = _numeric_test(data, 'Coffee_Intake', np.random.default_rng(0))
+    values = data['Coffee_Intake'].to_numpy(dtype=float)
+    risk = data[TARGET].to_numpy()
+    table = contingency_table(*_codes(data['Country']), *_codes(data['Health_Risk']))
+    codes_a, codes_b = _codes(data['Country'])[0], _codes(data['Health_Risk'])[0]
+    loop_rng = np.random.default_rng(0)
+
+    def naive_numeric():
+        rows = loop_rng.integers(0, len(values), len(values))
+        mannwhitneyu(values[rows][risk[rows] == 1], values[rows][risk[rows] == 0])
+
+    def naive_categorical():
+        rows = loop_rng.integers(0, len(codes_a), len(codes_a))
+        chi2_contingency(pd.crosstab(codes_a[rows], codes_b[rows]).to_numpy())
+
+    for label, vectorized, naive in (
+        ("Rango-biserial (Coffee_Intake)", lambda: _bootstrap_numeric(grid, low, high, 'mannwhitney', 0, 0, BOOTSTRAP_CHUNK),
+         naive_numeric),
+        ("V de Cramér (Country x Health_Risk)", lambda: _bootstrap_categorical(table, 0, 0, BOOTSTRAP_CHUNK),
+         naive_categorical),
+    ):
+        start = time.perf_counter()
+        vectorized()
+        vectorized_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(BOOTSTRAP_CHUNK):
+            naive()
+        print(f"{label}: {BOOTSTRAP_CHUNK} remuestreos vectorizados {vectorized_seconds:.4f}s, "
+              f"en bucle {time.perf_counter() - start:.2f}s")
+
+    for jobs in sorted({1, STATS_JOBS}):
+        start = time.perf_counter()
+        result = run_tests(data, n_jobs=jobs)
+        print(f"{len(result)} pruebas, {BOOTSTRAP_RESAMPLES} remuestreos, {jobs} proceso(s): "
+              f"{time.perf_counter() - start:.2f}s")
+    with pd.option_context('display.width', 200, 'display.max_columns', 20):
+        print(result.drop(columns=['Estadístico']).round(4).to_string(index=False))
@@ -0,0 +1,207 @@
+"""Importancia por permutación agrupada por columna y explicaciones de predicciones individuales.
+
+La importancia Gini (feature_importances_) se calcula sobre las columnas ya
+expandidas por el OneHotEncoder y favorece a las variables con muchas categorías
+(Country, Occupation). Aquí la importancia de cada columna original es la caída
+del accuracy en la partición de prueba al permutar esa columna (todas sus
+columnas one-hot se mueven juntas), repetida PERMUTATION_REPEATS veces.
+
+Cada permutación usa su propia semilla, derivada de (PERMUTATION_SEED, columna,
+repetición): el resultado no depende de cuántos procesos participen ni del orden
+en que terminen. Las columnas se reparten en EXPLAIN_JOBS procesos con joblib y
+el preprocesamiento se aplica una sola vez (se permutan grupos de columnas de la
+matriz ya transformada).
+
+Explicaciones individuales: para EXPLAIN_EXAMPLES registros de prueba (los de
+mayor y menor probabilidad y los más cercanos al umbral), la contribución de
+cada columna es la probabilidad del registro menos el promedio de las
+probabilidades al reemplazar esa columna por los valores de BACKGROUND_ROWS
+registros de referencia (contribución intervencional, una columna a la vez).
+
+Todo se guarda en el almacén de artefactos con una clave derivada de la versión
+del modelo; la pestaña solo lo lee.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+import almacen_modelos
+from entrenamiento import TRAINING_CORES
+from modelo import split_train_test
+
+PERMUTATION_REPEATS = int(os.environ.get("PERMUTATION_REPEATS", "10"))
+PERMUTATION_SEED = 42
+EXPLAIN_JOBS = int(os.environ.get("EXPLAIN_JOBS", TRAINING_CORES))
+EXPLAIN_EXAMPLES = 12
+BACKGROUND_ROWS = 200
+
+
+class GroupedModel:
+    """Bosque del Pipeline evaluado sobre la matriz ya preprocesada, con las columnas agrupadas por variable original.
+
+    El preprocesamiento se hace una sola vez; permutar o reemplazar una variable
+    es mover su grupo de columnas (una numérica o todas sus columnas one-hot).
+    """
+
+    def __init__(self, artifact):
+        import copy
+
+        preprocessor = artifact['pipeline'].named_steps['preprocessor']
+        # Copia superficial: un hilo por evaluación (el paralelismo está en las tareas) sin tocar el artefacto
+        self.forest = copy.copy(artifact['pipeline'].named_steps['classifier'])
+        self.forest.n_jobs = 1
+        self.preprocessor = preprocessor
+        self.features = list(artifact['numerical_features']) + list(artifact['categorical_features'])
+
+        groups = {}
+        numeric = preprocessor.output_indices_['num']
+        for offset, column in enumerate(artifact['numerical_features']):
+            groups[column] = np.array([numeric.start + offset])
+        position = preprocessor.output_indices_['cat'].start
+        encoder = preprocessor.named_transformers_['cat']
+        for column, categories in zip(artifact['categorical_features'], encoder.categories_):
+            groups[column] = np.arange(position, position + len(categories))
+            position += len(categories)
+        self.groups = groups
+
+    def transform(self, X):
+        matrix = self.preprocessor.transform(X[self.features])
+        if hasattr(matrix, 'toarray'):
+            matrix = matrix.toarray()
+        return np.asarray(matrix, dtype=np.float32)
+
+    def predict_proba(self, matrix):
+        return self.forest.predict_proba(matrix)[:, 1]
+
+
+def _permuted_scores(model, matrix, y, column, position, repeats, seed):
+    """Accuracy con la variable `column` permutada, una vez por repetición (semilla por columna y repetición)."""
+    group = model.groups[column]
+    scores = []
+    for repeat in range(repeats):
+        rng = np.random.default_rng([seed, position, repeat])
+        permuted = matrix.copy()
+        permuted[:, group] = matrix[rng.permutation(len(matrix))][:, group]
+        scores.append(float(((model.predict_proba(permuted) >= 0.5) == y).mean()))
+    return scores
+
+
+def permutation_importance(model, matrix, y, repeats=PERMUTATION_REPEATS, seed=PERMUTATION_SEED, n_jobs=EXPLAIN_JOBS):
+    """DataFrame (Feature, Importance, Std) con la caída de accuracy al permutar cada variable original."""
+    from joblib import Parallel, delayed
+
+    y = np.asarray(y)
+    baseline = float(((model.predict_proba(matrix) >= 0.5) == y).mean())
+    scores = Parallel(n_jobs=n_jobs)(
+        delayed(_permuted_scores)(model, matrix, y, column, position, repeats, seed)
+        for position, column in enumerate(model.features)
+    )
+    drops = baseline - np.array(scores)
+    return pd.DataFrame({
+        'Feature': model.features,
+        'Importance': drops.mean(axis=1),
+        'Std': drops.std(axis=1),
+    }).sort_values('Importance', ascending=False, ignore_index=True)
+
+
+def _examples(probabilities, count=EXPLAIN_EXAMPLES):
+    """Posiciones de los registros a explicar: los más altos, los más bajos y los más cercanos a 0.5."""
+    order = np.argsort(probabilities)
+    third = count // 3
+    near = np.argsort(np.abs(probabilities - 0.5))
+    chosen = list(order[::-1][:third]) + list(near[:count - 2 * third]) + list(order[:third])
+    return list(dict.fromkeys(int(position) for position in chosen))
+
+
+def explain(model, matrix, background):
+    """Probabilidades y {variable: contribución} por fila de `matrix` (ambas matrices ya preprocesadas)."""
+    probabilities = model.predict_proba(matrix)
+    explanations = []
+    for row in range(len(matrix)):
+        batch = np.repeat(matrix[[row]], len(model.features) * len(background), axis=0)
+        for position, column in enumerate(model.features):
+            block = slice(position * len(background), (position + 1) * len(background))
+            batch[block, model.groups[column]] = background[:, model.groups[column]]
+        # Una sola evaluación por registro: n_variables * n_fondo filas
+        replaced = model.predict_proba(batch).reshape(len(model.features), -1).mean(axis=1)
+        explanations.append({column: float(probabilities[row] - replaced[position])
+                             for position, column in enumerate(model.features)})
+    return probabilities, explanations
+
+
+def compute_explanations(df, artifact):
+    """Importancia por permutación agrupada y explicaciones de ejemplo para el modelo `artifact`."""
+    _, X_test, _, y_test, _, _ = split_train_test(df)
+    model = GroupedModel(artifact)
+    matrix = model.transform(X_test)
+
+    importance = permutation_importance(model, matrix, y_test)
+
+    positions = _examples(model.predict_proba(matrix))
+    rng = np.random.default_rng(PERMUTATION_SEED)
+    background = matrix[rng.choice(len(matrix), size=min(BACKGROUND_ROWS, len(matrix)), replace=False)]
+    probabilities, contributions = explain(model, matrix[positions], background)
+
+    records = X_test.iloc[positions]
+    ids = df.loc[records.index, 'ID'] if 'ID' in df.columns else records.index
+    examples = [
+        {
+            'id': int(record_id),
+            'probability': float(probability),
+            'actual': int(actual),
+            'values': {column: (value.item() if hasattr(value, 'item') else value)
+                       for column, value in records.loc[index, model.features].items()},
+            'contributions': contribution,
+        }
+        for record_id, index, probability, actual, contribution
+        in zip(ids, records.index, probabilities, y_test.loc[records.index], contributions)
+    ]
+    return {
+        'permutation_importance': importance,
+        'repeats': PERMUTATION_REPEATS,
+        'examples': examples,
+        'background_rows': len(background),
+    }
+
+
+def explanations_key(model_version):
+    return almacen_modelos.artifact_key(model_version, [], {
+        'kind': 'explanations', 'repeats': PERMUTATION_REPEATS, 'seed': PERMUTATION_SEED,
+        'examples': EXPLAIN_EXAMPLES, 'background': BACKGROUND_ROWS,
+    })
+
+
+def load_or_explain(df, artifact):
+    """Explicaciones del modelo `artifact` (se calculan una vez por versión del modelo)."""
+    return almacen_modelos.get_or_create(
+        explanations_key(artifact['version']), lambda: compute_explanations(df, artifact)
+    )
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    from datos import DATA_PATH, add_health_risk, load_dataset
+    from modelo import load_or_train
+
+    data = add_health_risk(load_dataset(sys.argv[1] if len(sys.argv) > 1 else DATA_PATH))
+    trained = load_or_train(data)
+    _, X_eval, _, y_eval, _, _ = split_train_test(data)
+    grouped = GroupedModel(trained)
+    matrix_eval = grouped.transform(X_eval)
+
+    for jobs in sorted({1, EXPLAIN_JOBS}):
+        start = time.perf_counter()
+        result = permutation_importance(grouped, matrix_eval, y_eval, n_jobs=jobs)
+        print(f"Permutación ({PERMUTATION_REPEATS} repeticiones) con {jobs} proceso(s): {time.perf_counter() - start:.2f}s")
+    print(result.to_string(index=False))
+
+    gini = trained['importances'].head(5)
+    print("\nTop 5 Gini (columnas one-hot):")
+    print(gini.to_string(index=False))
+
+    start = time.perf_counter()
+    explained = compute_explanations(data, trained)
+    print(f"\nImportancia + {len(explained['examples'])} explicaciones: {time.perf_counter() - start:.2f}s")
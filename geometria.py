@@ -0,0 +1,164 @@
+"""Geometría de países para el mapa de coropletas, sin acceso a red.
+
+`python geometria.py` lee una sola vez el shapefile de Natural Earth incluido en
+el repositorio y escribe GEOMETRY_PATH: un JSON con
+
+- un GeoJSON por nivel de detalle (GEOMETRY_LEVELS), con los polígonos
+  simplificados a la tolerancia del nivel y las coordenadas cuantizadas a una
+  grilla acorde (pocas cifras decimales), y
+- un índice nombre de país normalizado -> código ISO 3166-1 alfa-3, con los
+  nombres de Natural Earth y los alias que usa el dataset (USA, UK, ...).
+
+En ejecución solo se lee ese JSON (no hace falta geopandas): el mapa se dibuja
+con geometría explícita (featureidkey='id'), no depende de la resolución de
+nombres de Plotly ni de la topología que descarga de su CDN, y el tamaño del
+payload es fijo para cada nivel.
+
+La construcción necesita geopandas y shapely >= 2.1 (coverage_simplify
+mantiene las fronteras compartidas al simplificar).
+"""
+import json
+import math
+import os
+import re
+import unicodedata
+from functools import lru_cache
+
+SHAPEFILE_PATH = "data/ne_110m_admin_0_countries.shp"
+GEOMETRY_PATH = os.environ.get("GEOMETRY_PATH", "assets/countries_110m.json")
+# Nivel de detalle -> tolerancia de simplificación en grados
+GEOMETRY_LEVELS = {'baja': 1.0, 'media': 0.3, 'alta': 0.05}
+DEFAULT_LEVEL = 'media'
+
+# Nombres del dataset (u otros habituales) que no figuran en Natural Earth
+COUNTRY_ALIASES = {
+    'USA': 'USA', 'US': 'USA', 'United States': 'USA', 'EEUU': 'USA',
+    'UK': 'GBR', 'Great Britain': 'GBR', 'Britain': 'GBR', 'England': 'GBR', 'Reino Unido': 'GBR',
+    'Korea': 'KOR', 'Republic of Korea': 'KOR', 'Holland': 'NLD', 'Czech Republic': 'CZE',
+}
+# Columnas del shapefile con nombres alternativos de cada país
+NAME_FIELDS = ['NAME', 'NAME_LONG', 'ADMIN', 'NAME_EN', 'NAME_ES', 'FORMAL_EN', 'ABBREV', 'BRK_NAME', 'NAME_SORT']
+
+
+def normalize_name(name):
+    """Minúsculas, sin acentos ni puntuación: 'Côte d'Ivoire' -> 'cote d ivoire'."""
+    text = unicodedata.normalize('NFKD', str(name)).encode('ascii', 'ignore').decode()
+    text = re.sub(r'[^a-z0-9]+', ' ', text.lower()).strip()
+    return re.sub(r'^the ', '', text)
+
+
+def _iso_code(record):
+    # Natural Earth marca algunos países (Francia, Noruega) con ISO_A3 = -99
+    for field in ('ISO_A3', 'ISO_A3_EH', 'ADM0_A3'):
+        code = record.get(field)
+        if code and code != '-99':
+            return code
+    return None
+
+
+def _decimals(tolerance):
+    """Cifras decimales suficientes para que la grilla sea ~10 veces más fina que la tolerancia."""
+    return max(0, math.ceil(-math.log10(tolerance / 10)))
+
+
+def _round_coordinates(coordinates, decimals):
+    if isinstance(coordinates[0], (int, float)):
+        return [round(coordinates[0], decimals), round(coordinates[1], decimals)]
+    return [_round_coordinates(part, decimals) for part in coordinates]
+
+
+def _dedupe_ring(ring):
+    """Elimina vértices repetidos que deja la cuantización; None si el anillo colapsa."""
+    points = [ring[0]]
+    for point in ring[1:]:
+        if point != points[-1]:
+            points.append(point)
+    return points if len(points) >= 4 else None
+
+
+def _quantized_geometry(geometry, decimals):
+    mapping = geometry.__geo_interface__
+    polygons = mapping['coordinates'] if mapping['type'] == 'MultiPolygon' else [mapping['coordinates']]
+    result = []
+    for polygon in polygons:
+        rings = [_dedupe_ring(ring) for ring in _round_coordinates(polygon, decimals)]
+        if rings[0] is None:  # exterior degenerado: islas que desaparecen a esta escala
+            continue
+        result.append([ring for ring in rings if ring is not None])
+    if not result:
+        return None
+    if len(result) == 1:
+        return {'type': 'Polygon', 'coordinates': result[0]}
+    return {'type': 'MultiPolygon', 'coordinates': result}
+
+
+def build(shapefile=SHAPEFILE_PATH, output=GEOMETRY_PATH, levels=GEOMETRY_LEVELS):
+    """Lee el shapefile, simplifica y cuantiza cada nivel y escribe el JSON de geometría."""
+    import geopandas as gpd
+    import shapely
+
+    countries = gpd.read_file(shapefile)
+    records = countries.drop(columns='geometry').to_dict('records')
+    codes = [_iso_code(record) for record in records]
+
+    names = {}
+    for record, code in zip(records, codes):
+        for field in NAME_FIELDS + ['ISO_A3', 'ADM0_A3']:
+            value = record.get(field)
+            if code and value and value != '-99':
+                names.setdefault(normalize_name(value), code)
+    for alias, code in COUNTRY_ALIASES.items():
+        names[normalize_name(alias)] = code
+
+    geometries = {}
+    for level, tolerance in levels.items():
+        simplified = shapely.coverage_simplify(countries.geometry.values, tolerance)
+        decimals = _decimals(tolerance)
+        features = []
+        for record, code, geometry in zip(records, codes, simplified):
+            shape = _quantized_geometry(geometry, decimals) if code else None
+            if shape is not None:
+                features.append({'type': 'Feature', 'id': code, 'properties': {'name': record['NAME']}, 'geometry': shape})
+        geometries[level] = {
+            'tolerance': tolerance,
+            'decimals': decimals,
+            'geojson': {'type': 'FeatureCollection', 'features': features},
+        }
+
+    payload = {'source': os.path.basename(shapefile), 'levels': geometries, 'names': names}
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    tmp_path = f"{output}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as fh:
+        json.dump(payload, fh, separators=(',', ':'), ensure_ascii=False)
+    os.replace(tmp_path, output)
+    return payload
+
+
+@lru_cache(maxsize=1)
+def load_geometry(path=GEOMETRY_PATH):
+    with open(path, encoding='utf-8') as fh:
+        return json.load(fh)
+
+
+def country_geojson(level=DEFAULT_LEVEL, path=GEOMETRY_PATH):
+    """FeatureCollection de países (id = ISO alfa-3) para el nivel de detalle pedido."""
+    return load_geometry(path)['levels'][level]['geojson']
+
+
+def iso_codes(countries, path=GEOMETRY_PATH):
+    """Código ISO alfa-3 de cada nombre de país (None si no se reconoce)."""
+    names = load_geometry(path)['names']
+    return [names.get(normalize_name(country)) for country in countries]
+
+
+if __name__ == "__main__":
+    import sys
+
+    shapefile = sys.argv[1] if len(sys.argv) > 1 else SHAPEFILE_PATH
+    output = sys.argv[2] if len(sys.argv) > 2 else GEOMETRY_PATH
+    payload = build(shapefile, output)
+    for level, data in payload['levels'].items():
+        size = len(json.dumps(data['geojson'], separators=(',', ':')))
+        print(f"{level:<6} tolerancia {data['tolerance']:<5} {data['decimals']} decimales  "
+              f"{len(data['geojson']['features'])} países  {size / 1024:7.1f} KB")
+    print(f"{len(payload['names'])} nombres en el índice -> {output}")
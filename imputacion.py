@@ -0,0 +1,300 @@
+"""Imputación de valores faltantes con vecinos más cercanos buscados en un KD-tree.
+
+NeighborImputer completa las columnas numéricas de NEIGHBOR_COLUMNS con el
+promedio de los N_NEIGHBORS registros completos más parecidos, comparando solo
+las columnas que el registro sí tiene (estandarizadas con la media y la
+desviación de los registros completos). Los registros se agrupan por patrón de
+faltantes y para cada patrón se arma, una sola vez, un KD-tree sobre esas
+columnas de los registros completos: cada búsqueda cuesta O(log n) en lugar de
+comparar contra todas las filas como KNNImputer (O(n²) en total).
+
+Las consultas se reparten en bloques de IMPUTE_CHUNK filas entre IMPUTE_JOBS
+hilos; la búsqueda del KD-tree de scikit-learn libera el GIL, así que los
+hilos corren en paralelo sin copiar el árbol a otros procesos (es lo mismo que
+hace NearestNeighbors con algorithm='kd_tree'). IMPUTE_JOBS sale por defecto
+del mismo presupuesto de núcleos que los trabajos (CORE_BUDGET, trabajos.py).
+
+Con más de IMPUTE_DONORS registros completos los donantes son una muestra al
+azar (semilla fija) de ese tamaño: con 7 columnas una muestra así ya es densa,
+y cada patrón de faltantes arma su propio árbol, así que el costo de armarlos
+deja de crecer con el tamaño de los datos.
+
+Las categóricas de CATEGORICAL_COLUMNS (y las numéricas de un registro sin
+ninguna columna numérica) se completan con la mediana por grupo de
+GROUP_COLUMNS: la mediana de los códigos en las categóricas ordenadas y la moda
+en las demás, o el valor global si el grupo no tiene datos.
+
+Health_Issues no se imputa: el valor "None" del CSV significa "sin problemas de
+salud" y se lee como faltante solo por el comportamiento por defecto de pandas.
+
+Ejecutar `python imputacion.py [filas ...] [--knn-max N]` compara tiempo y
+error contra KNNImputer con valores ocultos al azar (KNNImputer solo hasta N
+filas; para tamaños mayores se extrapola su costo cuadrático), mide las
+consultas con 1 y con IMPUTE_JOBS hilos y comprueba que un hilo de Python
+sigue avanzando mientras corre una consulta (que libera el GIL).
+"""
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+NEIGHBOR_COLUMNS = ['Age', 'Coffee_Intake', 'Caffeine_mg', 'Sleep_Hours', 'BMI', 'Heart_Rate',
+                    'Physical_Activity_Hours']
+CATEGORICAL_COLUMNS = ['Gender', 'Country', 'Occupation', 'Sleep_Quality', 'Stress_Level', 'Smoking',
+                       'Alcohol_Consumption']
+GROUP_COLUMNS = ['Country', 'Gender']
+N_NEIGHBORS = 5
+IMPUTE_CHUNK = 20_000
+# Por defecto el presupuesto de núcleos de trabajos.py (en un proceso del pool, la parte de ese proceso)
+IMPUTE_JOBS = int(os.environ.get("IMPUTE_JOBS", os.environ.get("CORE_BUDGET", max(1, (os.cpu_count() or 1) // 2))))
+IMPUTE_DONORS = int(os.environ.get("IMPUTE_DONORS", "100000"))
+IMPUTE_SEED = 42
+
+
+def has_missing(df, columns=NEIGHBOR_COLUMNS + CATEGORICAL_COLUMNS):
+    """True si `df` tiene faltantes en alguna de las columnas que se imputan (Health_Issues no cuenta)."""
+    present = [column for column in columns if column in df.columns]
+    return bool(df[present].isna().to_numpy().any())
+
+
+def _grouped_statistic(df, column, groups):
+    """(estadístico por grupo como Series con MultiIndex, estadístico global) de `column`.
+
+    Mediana de los códigos en las categóricas ordenadas y en las numéricas no
+    enteras; moda en las categóricas no ordenadas y en las enteras (indicadores 0/1).
+    """
+    values = df[column]
+    if isinstance(values.dtype, pd.CategoricalDtype) and values.cat.ordered:
+        codes = values.cat.codes.where(values.notna())
+        categories = values.cat.categories
+
+        def statistic(series):
+            series = series.dropna()
+            return categories[int(series.quantile(0.5, interpolation='lower'))] if len(series) else np.nan
+
+        frame = df[groups].assign(_value=codes)
+    else:
+        if pd.api.types.is_float_dtype(values.dtype):
+            def statistic(series):
+                return series.median()
+        else:
+            def statistic(series):
+                mode = series.dropna().mode()
+                return mode.iloc[0] if len(mode) else np.nan
+        frame = df[groups].assign(_value=values.astype(object) if isinstance(values.dtype, pd.CategoricalDtype)
+                                  else values)
+
+    by_group = frame.dropna(subset=groups).groupby(groups, observed=True)['_value'].agg(statistic)
+    by_group.index = pd.MultiIndex.from_frame(by_group.index.to_frame().astype(str))
+    return by_group, statistic(frame['_value'])
+
+
+class NeighborImputer:
+    """Imputador por vecinos más cercanos (KD-tree) con mediana por grupo como respaldo; interfaz fit/transform."""
+
+    def __init__(self, n_neighbors=N_NEIGHBORS, numeric=NEIGHBOR_COLUMNS, categorical=CATEGORICAL_COLUMNS,
+                 groups=GROUP_COLUMNS, chunk=IMPUTE_CHUNK, n_jobs=IMPUTE_JOBS, max_donors=IMPUTE_DONORS,
+                 seed=IMPUTE_SEED):
+        self.n_neighbors = n_neighbors
+        self.numeric = list(numeric)
+        self.categorical = list(categorical)
+        self.groups = list(groups)
+        self.chunk = chunk
+        self.n_jobs = n_jobs
+        self.max_donors = max_donors
+        self.seed = seed
+
+    def fit(self, df):
+        self.numeric_ = [c for c in self.numeric if c in df.columns]
+        values = df[self.numeric_].to_numpy(dtype=np.float64)
+        donors = values[~np.isnan(values).any(axis=1)]
+        if len(donors) > self.max_donors:
+            rng = np.random.default_rng(self.seed)
+            donors = donors[np.sort(rng.choice(len(donors), size=self.max_donors, replace=False))]
+        self.center_ = donors.mean(axis=0) if len(donors) else np.zeros(len(self.numeric_))
+        scale = donors.std(axis=0) if len(donors) else np.ones(len(self.numeric_))
+        self.scale_ = np.where(scale > 0, scale, 1)
+        self.donor_values_ = donors
+        self.donors_ = (donors - self.center_) / self.scale_
+
+        self.fallback_ = {
+            column: _grouped_statistic(df, column, self.groups)
+            for column in self.numeric_ + [c for c in self.categorical if c in df.columns]
+        }
+        # Un KD-tree por conjunto de columnas observadas; se arman al primer uso
+        self._trees = {}
+        self._trees_lock = threading.Lock()
+        return self
+
+    def _tree(self, observed):
+        from sklearn.neighbors import KDTree
+
+        with self._trees_lock:
+            if observed not in self._trees:
+                self._trees[observed] = KDTree(self.donors_[:, list(observed)])
+            return self._trees[observed]
+
+    def _neighbors(self, tree, queries):
+        """Índices (filas x vecinos) de los donantes más cercanos, por bloques en paralelo."""
+        k = min(self.n_neighbors, len(self.donors_))
+        blocks = [queries[start:start + self.chunk] for start in range(0, len(queries), self.chunk)]
+        if self.n_jobs == 1 or len(blocks) == 1:
+            results = [tree.query(block, k=k, return_distance=False) for block in blocks]
+        else:
+            from joblib import Parallel, delayed
+
+            results = Parallel(n_jobs=self.n_jobs, prefer='threads')(
+                delayed(tree.query)(block, k=k, return_distance=False) for block in blocks
+            )
+        return np.vstack(results)
+
+    def _fill_grouped(self, out, column):
+        missing = out[column].isna().to_numpy()
+        if not missing.any() or column not in self.fallback_:
+            return
+        by_group, overall = self.fallback_[column]
+        keys = pd.MultiIndex.from_frame(out.loc[missing, self.groups].astype(str))
+        fill = by_group.reindex(keys).to_numpy(dtype=object)
+        fill[pd.isna(fill)] = overall
+        if isinstance(out[column].dtype, pd.CategoricalDtype):
+            new = pd.Index(fill).unique().difference(out[column].cat.categories)
+            if len(new):
+                out[column] = out[column].cat.add_categories(new)
+        else:
+            fill = fill.astype(np.float64)
+        out.loc[missing, column] = fill
+
+    def transform(self, df):
+        """Copia de `df` sin faltantes en las columnas numéricas y categóricas configuradas."""
+        out = df.copy()
+        values = out[self.numeric_].to_numpy(dtype=np.float64, copy=True)
+        missing = np.isnan(values)
+        rows = np.flatnonzero(missing.any(axis=1))
+
+        if len(rows) and len(self.donors_):
+            patterns, inverse = np.unique(missing[rows], axis=0, return_inverse=True)
+            for position, pattern in enumerate(patterns):
+                observed = np.flatnonzero(~pattern)
+                if len(observed) == 0:
+                    continue  # sin columnas para comparar: mediana por grupo
+                members = rows[inverse.ravel() == position]
+                queries = (values[np.ix_(members, observed)] - self.center_[observed]) / self.scale_[observed]
+                neighbors = self._neighbors(self._tree(tuple(observed)), queries)
+                targets = np.flatnonzero(pattern)
+                values[np.ix_(members, targets)] = self.donor_values_[neighbors][:, :, targets].mean(axis=1)
+
+            for position, column in enumerate(self.numeric_):
+                if missing[:, position].any():
+                    out[column] = values[:, position].astype(out[column].dtype)
+
+        for column in self.numeric_ + [c for c in self.categorical if c in out.columns]:
+            self._fill_grouped(out, column)
+        return out
+
+    def fit_transform(self, df):
+        return self.fit(df).transform(df)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    from sklearn.impute import KNNImputer
+
+    from datos import DATA_PATH, load_dataset
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sizes", nargs="*", type=int, default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--knn-max", type=int, default=100_000, help="filas máximas para correr KNNImputer")
+    parser.add_argument("--missing", type=float, default=0.05, help="fracción de celdas ocultas")
+    args = parser.parse_args()
+
+    base = load_dataset(DATA_PATH)
+    rng = np.random.default_rng(0)
+
+    def synthetic(n_rows):
+        """Filas de la base repetidas con ruido en las numéricas (sin duplicados exactos)."""
+        data = base.iloc[rng.integers(0, len(base), n_rows)].reset_index(drop=True)
+        for column in NEIGHBOR_COLUMNS:
+            noisy = data[column].astype(np.float64) * rng.normal(1, 0.05, n_rows)
+            data[column] = noisy.round().astype(data[column].dtype) if pd.api.types.is_integer_dtype(
+                data[column].dtype) else noisy.astype(data[column].dtype)
+        return data
+
+    quadratic = None
+    print(f"{'filas':>10} {'KD-tree (s)':>12} {'KNNImputer (s)':>15} {'NRMSE KD-tree':>14} {'NRMSE KNN':>10} "
+          f"{'acierto categ.':>15}")
+    for n_rows in args.sizes:
+        truth = synthetic(n_rows)
+        numeric = truth[NEIGHBOR_COLUMNS].astype(np.float64)
+        hidden_numeric = rng.random(numeric.shape) < args.missing
+        masked = truth.copy()
+        for position, column in enumerate(NEIGHBOR_COLUMNS):
+            masked[column] = numeric[column].mask(hidden_numeric[:, position])
+        hidden_categorical = {column: rng.random(n_rows) < args.missing for column in CATEGORICAL_COLUMNS}
+        for column, hidden in hidden_categorical.items():
+            masked[column] = masked[column].astype(object if isinstance(masked[column].dtype, pd.CategoricalDtype)
+                                                   else np.float64).mask(hidden)
+            if isinstance(truth[column].dtype, pd.CategoricalDtype):
+                masked[column] = masked[column].astype(truth[column].dtype)
+
+        std = numeric.std().to_numpy()
+
+        def nrmse(imputed):
+            errors = ((imputed - numeric.to_numpy()) / std)[hidden_numeric]
+            return np.sqrt(np.mean(errors ** 2))
+
+        start = time.perf_counter()
+        result = NeighborImputer().fit_transform(masked)
+        ours = time.perf_counter() - start
+        ours_error = nrmse(result[NEIGHBOR_COLUMNS].to_numpy(dtype=np.float64))
+        hits = [(result[column].astype(str)[hidden] == truth[column].astype(str)[hidden]).mean()
+                for column, hidden in hidden_categorical.items()]
+
+        if n_rows <= args.knn_max:
+            # Misma estandarización que el KD-tree, para comparar el error en igualdad de condiciones
+            start = time.perf_counter()
+            matrix = masked[NEIGHBOR_COLUMNS].to_numpy(dtype=np.float64)
+            center, spread = np.nanmean(matrix, axis=0), np.nanstd(matrix, axis=0)
+            knn = KNNImputer(n_neighbors=N_NEIGHBORS).fit_transform((matrix - center) / spread) * spread + center
+            knn_seconds = time.perf_counter() - start
+            quadratic = knn_seconds / n_rows ** 2
+            knn_label, knn_error = f"{knn_seconds:.2f}", f"{nrmse(knn):.4f}"
+        else:
+            knn_label = f"~{quadratic * n_rows ** 2:.0f} (est.)" if quadratic else "omitido"
+            knn_error = "—"
+        print(f"{n_rows:>10,} {ours:>12.2f} {knn_label:>15} {ours_error:>14.4f} {knn_error:>10} {np.mean(hits):>15.3f}")
+    print(f"(NRMSE: error cuadrático medio de las celdas ocultas en desviaciones estándar; "
+          f"{IMPUTE_JOBS} hilo(s) para las consultas)")
+
+    # Consultas del KD-tree con hilos, sobre los donantes del último tamaño
+    imputer = NeighborImputer().fit(masked)
+    tree = imputer._tree(tuple(range(len(imputer.numeric_))))
+    queries = imputer.donors_[rng.integers(0, len(imputer.donors_), 100_000)]
+    queries = queries + rng.normal(0, 0.05, queries.shape)
+    for jobs in sorted({1, IMPUTE_JOBS}):
+        imputer.n_jobs = jobs
+        start = time.perf_counter()
+        imputer._neighbors(tree, queries)
+        print(f"{len(queries):,} consultas con {jobs} hilo(s): {time.perf_counter() - start:.2f}s")
+
+    # Si la consulta retuviera el GIL, un hilo de Python no avanzaría mientras corre
+    stop = threading.Event()
+    spins = []
+
+    def spin():
+        count = 0
+        while not stop.is_set():
+            count += 1
+        spins.append(count)
+
+    spinner = threading.Thread(target=spin)
+    spinner.start()
+    start = time.perf_counter()
+    tree.query(queries, k=N_NEIGHBORS, return_distance=False)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    spinner.join()
+    print(f"Un hilo de Python avanzó {spins[0]:,} iteraciones durante una consulta de {elapsed:.2f}s "
+          f"(0 si la consulta retuviera el GIL)")
@@ -0,0 +1,140 @@
+"""Índices de bitmaps sobre las columnas categóricas para el filtrado cruzado.
+
+Al cargar los datos se construye un bitset comprimido (np.packbits, 1 bit por
+fila, en palabras uint64) por cada valor de cada columna de filtro. Un filtro se evalúa combinando
+bitsets con operaciones bit a bit: OR entre los valores elegidos de una misma
+columna y AND entre columnas. No se recorre el DataFrame.
+
+Ejecutar `python indices.py [filas]` mide la latencia de evaluación de filtros
+(objetivo: menos de FILTER_LATENCY_TARGET_MS).
+"""
+import numpy as np
+import pandas as pd
+
+FILTER_COLUMNS = ['Country', 'Gender', 'Occupation', 'Stress_Level', 'Sleep_Quality']
+FILTER_LATENCY_TARGET_MS = 1.0
+
+
+def filter_key(filters):
+    """Forma canónica y hashable de un filtro {columna: [valores]} (sin columnas vacías)."""
+    return tuple(sorted((column, tuple(sorted(values))) for column, values in (filters or {}).items() if values))
+
+
+def _pack(mask):
+    """Empaqueta una máscara booleana en palabras uint64 (1 bit por fila)."""
+    packed = np.packbits(mask)
+    padded = np.zeros(-(-len(packed) // 8) * 8, dtype=np.uint8)
+    padded[:len(packed)] = packed
+    return padded.view(np.uint64)
+
+
+class BitmapIndex:
+    """Un bitset por valor de cada columna categórica de FILTER_COLUMNS."""
+
+    def __init__(self, df, columns=FILTER_COLUMNS):
+        self.n_rows = len(df)
+        self.bitmaps = {}
+        for column in columns:
+            values = df[column]
+            if not isinstance(values.dtype, pd.CategoricalDtype):
+                values = values.astype('category')
+            codes = values.cat.codes.to_numpy()
+            self.bitmaps[column] = {
+                category: _pack(codes == code)
+                for code, category in enumerate(values.cat.categories)
+            }
+        self._all = _pack(np.ones(self.n_rows, dtype=bool))
+
+    @classmethod
+    def from_bitmaps(cls, n_rows, bitmaps):
+        """Índice sobre bitsets ya construidos (p. ej. mapeados desde almacen_columnar.py)."""
+        index = cls.__new__(cls)
+        index.n_rows = n_rows
+        index.bitmaps = bitmaps
+        index._all = _pack(np.ones(n_rows, dtype=bool))
+        return index
+
+    def values(self, column):
+        return list(self.bitmaps[column])
+
+    def _column_bits(self, column, selected):
+        """OR de los bitsets elegidos; si es más corto, NOT del OR de los no elegidos.
+
+        Devuelve siempre un arreglo nuevo (el llamador puede modificarlo).
+        """
+        bitmaps = self.bitmaps[column]
+        chosen = [bitmaps[value] for value in selected if value in bitmaps]
+        others = [bits for value, bits in bitmaps.items() if value not in selected]
+        negate = len(others) < len(chosen)
+        operands = others if negate else chosen
+        if not operands:
+            return self._all.copy() if negate else np.zeros_like(self._all)
+
+        bits = operands[0].copy()
+        for other in operands[1:]:
+            np.bitwise_or(bits, other, out=bits)
+        if negate:
+            np.bitwise_xor(bits, self._all, out=bits)
+        return bits
+
+    def evaluate(self, filters):
+        """Bitset (palabras uint64) de las filas que cumplen el filtro."""
+        result = None
+        for column, selected in filter_key(filters):
+            # Una columna con un solo valor se combina directamente, sin copiar su bitset
+            if result is not None and len(selected) == 1 and selected[0] in self.bitmaps[column]:
+                np.bitwise_and(result, self.bitmaps[column][selected[0]], out=result)
+                continue
+            column_bits = self._column_bits(column, set(selected))
+            if result is None:
+                result = column_bits
+            else:
+                np.bitwise_and(result, column_bits, out=result)
+        return self._all if result is None else result
+
+    def mask(self, filters):
+        """Máscara booleana de longitud n_rows."""
+        return np.unpackbits(self.evaluate(filters).view(np.uint8), count=self.n_rows).view(bool)
+
+    def count(self, filters):
+        """Cantidad de filas seleccionadas, sin desempaquetar el bitset."""
+        bits = self.evaluate(filters)
+        if hasattr(np, 'bitwise_count'):
+            return int(np.bitwise_count(bits).sum())
+        return int(self.mask(filters).sum())
+
+    def select(self, df, filters):
+        """Filas de df que cumplen el filtro (df completo si no hay filtro)."""
+        if not filter_key(filters):
+            return df
+        return df[self.mask(filters)]
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    from datos import DATA_PATH, load_dataset
+
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    data = load_dataset(DATA_PATH)
+    data = pd.concat([data] * -(-n_rows // len(data)), ignore_index=True).iloc[:n_rows]
+
+    start = time.perf_counter()
+    index = BitmapIndex(data)
+    print(f"Construcción del índice ({n_rows:,} filas): {time.perf_counter() - start:.3f}s")
+
+    cases = {
+        'un valor': {'Country': ['Germany']},
+        'varias columnas': {'Country': ['Germany', 'Spain', 'Brazil'], 'Gender': ['Female'], 'Stress_Level': ['High', 'Medium']},
+        'todas las columnas': {'Country': ['USA'], 'Gender': ['Male'], 'Occupation': ['Office'],
+                               'Stress_Level': ['Low'], 'Sleep_Quality': ['Good', 'Excellent']},
+    }
+    for name, filters in cases.items():
+        repeats = 50
+        start = time.perf_counter()
+        for _ in range(repeats):
+            index.evaluate(filters)
+        elapsed_ms = (time.perf_counter() - start) / repeats * 1000
+        status = "OK" if elapsed_ms < FILTER_LATENCY_TARGET_MS else "SOBRE EL OBJETIVO"
+        print(f"  {name:<20} {elapsed_ms:.3f} ms  ({index.count(filters):,} filas)  {status}")
@@ -0,0 +1,322 @@
+"""Ingesta incremental de lotes nuevos sin reiniciar la aplicación.
+
+El estado de los datos es una instantánea inmutable (DataSnapshot) con los
+segmentos de filas, sus índices de bitmaps, el cubo de agregados, los
+histogramas y los co-momentos de las correlaciones acumulados. Un lote nuevo:
+
+1. se tipa con los dtypes del dataset (datos.coerce_batch) y, si tiene
+   faltantes, se completan con vecinos de la base (imputacion.NeighborImputer,
+   que se ajusta una vez por proceso con el primer lote que lo necesita),
+2. se puntúa Health_Risk solo para sus filas,
+3. se indexa como un segmento nuevo y se fusiona con el cubo, los histogramas
+   y los co-momentos,
+4. se publica como una nueva instantánea con un solo cambio de referencia.
+
+Ningún paso recorre las filas ya ingeridas, así que la latencia depende del
+tamaño del lote y no del dataset. Cada request toma la instantánea vigente al
+comienzo (current()) y nunca ve un estado a medio actualizar.
+
+Los lotes llegan como CSV a INGEST_DIR, ya sea copiados ahí o subidos con
+POST /api/ingest. Cada worker de gunicorn revisa el directorio cada
+INGEST_POLL_SECONDS e ingiere los archivos que aún no tiene, en orden de nombre;
+los que no pasan la validación se mueven a INGEST_DIR/rejected.
+
+Para copiar un lote a mano, escribirlo con un nombre que empiece con punto
+(p. ej. `.lote.csv.tmp`) y renombrarlo al terminar (`mv`, atómico en el mismo
+sistema de archivos), como hace POST /api/ingest. Los archivos ocultos se
+ignoran y, por si se copió directo con cp o scp, un CSV modificado hace menos
+de INGEST_SETTLE_SECONDS se deja para la próxima revisión.
+"""
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import cached_property
+
+import pandas as pd
+
+from almacen_columnar import load_base
+from correlacion import GroupedCoMoments
+from cubo import AggregateCube
+from datos import add_health_risk, coerce_batch, scored_version
+from imputacion import has_missing
+from indices import BitmapIndex, filter_key
+from resumen import RunningHistogram
+
+INGEST_DIR = os.environ.get("INGEST_DIR", "data/incoming")
+INGEST_POLL_SECONDS = float(os.environ.get("INGEST_POLL_SECONDS", "10"))
+# Un CSV se ingiere solo si no cambió en este tiempo (puede estar copiándose todavía)
+INGEST_SETTLE_SECONDS = float(os.environ.get("INGEST_SETTLE_SECONDS", "5"))
+# Instantáneas recientes que se conservan por versión (un trabajo en segundo plano puede pedir una anterior)
+SNAPSHOT_HISTORY = 4
+# Si se define, POST /api/ingest exige el encabezado X-Ingest-Token con este valor
+INGEST_TOKEN = os.environ.get("INGEST_TOKEN")
+
+HISTOGRAM_COLUMNS = ['Coffee_Intake', 'Sleep_Hours', 'Heart_Rate', 'BMI']
+
+
+def _align_categories(frames):
+    """Unifica las categorías de cada columna categórica antes de concatenar."""
+    first = frames[0]
+    aligned = [frame.copy(deep=False) for frame in frames]
+    for column in first.columns:
+        if not isinstance(first[column].dtype, pd.CategoricalDtype):
+            continue
+        categories = first[column].cat.categories
+        for frame in frames[1:]:
+            categories = categories.append(frame[column].cat.categories.difference(categories))
+        dtype = pd.CategoricalDtype(categories, ordered=first[column].cat.ordered)
+        for frame in aligned:
+            frame[column] = frame[column].cat.set_categories(dtype.categories)
+    return aligned
+
+
+class DataSnapshot:
+    """Versión inmutable de los datos y de sus estructuras derivadas."""
+
+    def __init__(self, version, segments, indexes, cube, histograms, correlations, batches=(), imputer=None):
+        self.version = version
+        self.segments = tuple(segments)
+        self.indexes = tuple(indexes)
+        self.cube = cube
+        self.histograms = histograms
+        self.correlations = correlations
+        self.batches = frozenset(batches)
+        self._imputer = imputer
+        self.n_rows = sum(len(segment) for segment in self.segments)
+
+    @classmethod
+    def from_frame(cls, df, version):
+        histograms = {column: RunningHistogram.from_values(df[column]) for column in HISTOGRAM_COLUMNS}
+        return cls(version, [df], [BitmapIndex(df)], AggregateCube.from_frame(df), histograms,
+                   GroupedCoMoments.from_frame(df))
+
+    # Las instantáneas se usan como clave de cachés (lru_cache): se comparan por versión
+    def __hash__(self):
+        return hash(self.version)
+
+    def __eq__(self, other):
+        return isinstance(other, DataSnapshot) and other.version == self.version
+
+    @cached_property
+    def frame(self):
+        """Todas las filas en un solo DataFrame (se concatena solo cuando se pide)."""
+        if len(self.segments) == 1:
+            return self.segments[0]
+        return pd.concat(_align_categories(list(self.segments)), ignore_index=True)
+
+    @property
+    def imputer(self):
+        """Imputador ajustado sobre la base (el primer segmento); se arma con el primer lote con faltantes."""
+        if self._imputer is None:
+            from imputacion import NeighborImputer
+
+            self._imputer = NeighborImputer().fit(self.segments[0])
+        return self._imputer
+
+    def values(self, column):
+        seen = []
+        for index in self.indexes:
+            seen.extend(value for value in index.values(column) if value not in seen)
+        return seen
+
+    def select(self, filters):
+        """Filas que cumplen el filtro, evaluado segmento por segmento con los bitmaps."""
+        if not filter_key(filters):
+            return self.frame
+        parts = [index.select(segment, filters) for segment, index in zip(self.segments, self.indexes)]
+        if len(parts) == 1:
+            return parts[0]
+        return pd.concat(_align_categories(parts), ignore_index=True)
+
+    def count(self, filters):
+        return sum(index.count(filters) for index in self.indexes)
+
+    def with_batch(self, batch, name):
+        """Nueva instantánea con el lote agregado; solo trabaja sobre las filas del lote."""
+        # Ajustar el imputador recorre toda la base: solo si el lote lo necesita
+        imputer = self.imputer if has_missing(batch) else None
+        rows = add_health_risk(coerce_batch(batch, self.segments[0], imputer))
+        histograms = {column: hist.updated(rows[column]) for column, hist in self.histograms.items()}
+        version = hashlib.sha256(f"{self.version}:{name}:{len(rows)}".encode()).hexdigest()[:16]
+        return DataSnapshot(
+            version,
+            self.segments + (rows,),
+            self.indexes + (BitmapIndex(rows),),
+            self.cube.merge(AggregateCube.from_frame(rows)),
+            histograms,
+            self.correlations.updated(rows),
+            self.batches | {name},
+            imputer=self._imputer,
+        )
+
+
+_snapshot = None
+_write_lock = threading.Lock()
+_watcher = None
+# Lotes inválidos ya vistos por este proceso (por si no se pudieron mover)
+_rejected = set()
+_history = OrderedDict()
+
+logger = logging.getLogger(__name__)
+
+
+def current():
+    """Instantánea vigente. Leer una referencia es atómico: no hace falta candado."""
+    return _snapshot
+
+
+def _publish(snapshot):
+    """Publica `snapshot` como vigente (se llama con _write_lock tomado)."""
+    global _snapshot
+    _snapshot = snapshot
+    _history[snapshot.version] = snapshot
+    while len(_history) > SNAPSHOT_HISTORY:
+        _history.popitem(last=False)
+
+
+def snapshot_at(version):
+    """Instantánea con versión `version`, ingiriendo antes los lotes pendientes.
+
+    Sirve para los trabajos en segundo plano, que reciben la versión que vio el
+    worker web: se usa la vigente o una de las SNAPSHOT_HISTORY más recientes. Si
+    no está (otro orden de lotes o una versión ya descartada) es un ValueError:
+    el resultado no debe guardarse con la clave de otros datos. Antes se espera
+    hasta INGEST_SETTLE_SECONDS, por si el lote recién llegó y aún no se ingiere.
+    """
+    deadline = time.monotonic() + INGEST_SETTLE_SECONDS + 1
+    while True:
+        ingest_pending()
+        snapshot = _history.get(version)
+        if snapshot is not None:
+            return snapshot
+        if time.monotonic() >= deadline:
+            raise ValueError(f"La versión de datos {version} no está disponible en este proceso "
+                             f"(vigente: {_snapshot.version})")
+        time.sleep(0.5)
+
+
+def initialize(path):
+    """Carga el dataset base, ingiere los lotes ya presentes en INGEST_DIR y publica la instantánea."""
+    with _write_lock:
+        if _snapshot is None:
+            # Datos, índice, cubo, histogramas y co-momentos base mapeados desde el almacén
+            # compartido (almacen_columnar.py): no se recalculan en cada worker
+            df, index, cube, histograms, correlations = load_base(path, HISTOGRAM_COLUMNS)
+            # La versión incluye las reglas de Health_Risk: de ella dependen las lru_cache,
+            # los ETag y la caché compartida
+            _publish(DataSnapshot(scored_version(path), [df], [index], cube, histograms, correlations))
+    ingest_pending()
+    return _snapshot
+
+
+def ingest_frame(batch, name):
+    """Agrega un lote (DataFrame) y publica la nueva instantánea. Devuelve la instantánea."""
+    with _write_lock:
+        if name in _snapshot.batches:
+            return _snapshot
+        snapshot = _snapshot.with_batch(batch, name)
+        _publish(snapshot)
+    return snapshot
+
+
+def ingest_pending(directory=None):
+    """Ingiere, en orden de nombre, los CSV de `directory` que esta instantánea aún no tiene.
+
+    Un archivo inválido se registra en el log y se mueve a `directory`/rejected
+    para no reintentarlo en cada revisión; los siguientes se ingieren igual. Los
+    archivos ocultos (en escritura) y los modificados hace menos de
+    INGEST_SETTLE_SECONDS se dejan para la próxima revisión.
+    """
+    directory = directory or INGEST_DIR
+    if not os.path.isdir(directory):
+        return _snapshot
+    for name in sorted(os.listdir(directory)):
+        if (name.startswith(".") or not name.endswith(".csv") or name in _snapshot.batches
+                or name in _rejected):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            if time.time() - os.path.getmtime(path) < INGEST_SETTLE_SECONDS:
+                # Puede estar copiándose: se espera a que deje de cambiar
+                continue
+            ingest_frame(pd.read_csv(path), name)
+        except FileNotFoundError:
+            continue  # otro worker ya lo movió a rechazados
+        except (ValueError, pd.errors.ParserError) as exc:
+            logger.error("Lote %s rechazado: %s", name, exc)
+            _reject(directory, name)
+    return _snapshot
+
+
+def _reject(directory, name):
+    _rejected.add(name)
+    rejected_dir = os.path.join(directory, "rejected")
+    try:
+        os.makedirs(rejected_dir, exist_ok=True)
+        os.replace(os.path.join(directory, name), os.path.join(rejected_dir, name))
+    except OSError as exc:
+        logger.warning("No se pudo mover %s a %s: %s", name, rejected_dir, exc)
+
+
+def start_watcher(interval=None):
+    """Hilo daemon que revisa INGEST_DIR periódicamente (uno por proceso)."""
+    global _watcher
+    interval = INGEST_POLL_SECONDS if interval is None else interval
+    if _watcher is not None or interval <= 0:
+        return
+
+    def watch():
+        while True:
+            time.sleep(interval)
+            try:
+                ingest_pending()
+            except Exception as exc:  # un lote inválido no debe detener el hilo
+                logger.exception("Error al ingerir lotes: %s", exc)
+
+    _watcher = threading.Thread(target=watch, name="ingest-watcher", daemon=True)
+    _watcher.start()
+
+
+def register_routes(server):
+    """Registra POST /api/ingest (CSV en el cuerpo o en el campo de formulario 'file')."""
+    import io
+
+    from flask import jsonify, request
+
+    @server.route("/api/ingest", methods=["POST"])
+    def api_ingest():
+        if INGEST_TOKEN and request.headers.get("X-Ingest-Token") != INGEST_TOKEN:
+            return jsonify(error="Token de ingesta inválido"), 403
+        if _snapshot is None:
+            return jsonify(error="Los datos aún no están cargados"), 503
+
+        upload = request.files.get("file")
+        payload = upload.read() if upload else request.get_data()
+        if not payload:
+            return jsonify(error="El lote está vacío"), 400
+
+        start = time.perf_counter()
+        try:
+            batch = pd.read_csv(io.BytesIO(payload))
+            name = f"{time.strftime('%Y%m%d-%H%M%S')}-{hashlib.sha256(payload).hexdigest()[:12]}.csv"
+            snapshot = ingest_frame(batch, name)
+        except (ValueError, pd.errors.ParserError) as exc:
+            return jsonify(error=str(exc)), 400
+
+        # Se guarda en INGEST_DIR (escritura atómica) para que los demás workers lo ingieran
+        os.makedirs(INGEST_DIR, exist_ok=True)
+        tmp_path = os.path.join(INGEST_DIR, f".{name}.tmp")
+        with open(tmp_path, "wb") as fh:
+            fh.write(payload)
+        os.replace(tmp_path, os.path.join(INGEST_DIR, name))
+
+        return jsonify(
+            batch=name,
+            rows_added=len(batch),
+            total_rows=snapshot.n_rows,
+            version=snapshot.version,
+            latency_ms=round((time.perf_counter() - start) * 1000, 2),
+        )
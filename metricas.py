@@ -0,0 +1,280 @@
+"""Métricas de rendimiento por ruta y por callback, en formato Prometheus.
+
+Un par de hooks de Flask (before_request / after_request) mide cada request:
+tiempo de reloj, tiempo de CPU del hilo que la atiende, bytes de la respuesta y
+si se resolvió desde una caché (caché compartida de cache_compartida.py o un 304
+por ETag). Las requests a /_dash-update-component se etiquetan con el id del
+callback (su output) en lugar de la ruta; el callback de páginas, además, con
+la ruta de la página pedida. El output lo envía el cliente: solo se usa si es
+un callback registrado en la app y la respuesta no es un error (si no, la
+etiqueta es "desconocido"), para que la cantidad de series quede acotada.
+
+Todo se agrega en memoria, por proceso, en histogramas de latencia con los
+buckets de LATENCY_BUCKETS, y se publica en GET /metrics (formato de texto de
+Prometheus). Con varios workers de gunicorn cada uno expone sus propias series:
+Prometheus debe scrapear cada worker o sumar en la consulta.
+
+Perfilador por muestreo (opcional): con PROFILE_SLOW_MS > 0, un hilo toma cada
+PROFILE_INTERVAL_MS la pila de los hilos que están atendiendo requests. Si una
+request tarda más de PROFILE_SLOW_MS, sus muestras se guardan en PROFILE_DIR en
+formato "collapsed" (una línea por pila con su cantidad de muestras), listo para
+flamegraph.pl o speedscope.
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PROFILE_SLOW_MS = float(os.environ.get("PROFILE_SLOW_MS", "0"))
+PROFILE_INTERVAL_MS = float(os.environ.get("PROFILE_INTERVAL_MS", "5"))
+PROFILE_DIR = os.environ.get("PROFILE_DIR", "artifacts/profiles")
+# Perfiles que se conservan en PROFILE_DIR (se borran los más viejos)
+PROFILE_KEEP = int(os.environ.get("PROFILE_KEEP", "50"))
+
+DASH_CALLBACK_PATH = "/_dash-update-component"
+# Ids del enrutador de páginas de Dash (dash._pages)
+PAGES_CONTENT_ID = "_pages_content"
+PAGES_LOCATION_ID = "_pages_location"
+# Argumentos de ruta cuyo valor entra en la etiqueta (p. ej. /api/payload/<name>)
+LABELED_VIEW_ARGS = ('name',)
+
+
+class RequestStats:
+    """Histograma de latencia y totales de CPU, bytes y resultados de caché de un endpoint."""
+
+    def __init__(self):
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.bytes = 0
+        self.cache = Counter()
+
+    def observe(self, wall, cpu, size, cache):
+        for position, bound in enumerate(LATENCY_BUCKETS):
+            if wall <= bound:
+                self.buckets[position] += 1
+        self.count += 1
+        self.wall += wall
+        self.cpu += cpu
+        self.bytes += size
+        self.cache[cache] += 1
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = defaultdict(RequestStats)
+        self.slow_profiles = 0
+
+    def observe(self, kind, name, wall, cpu, size, cache):
+        with self._lock:
+            self._stats[(kind, name)].observe(wall, cpu, size, cache)
+
+    def render(self):
+        """Texto en formato de exposición de Prometheus."""
+        with self._lock:
+            items = sorted(self._stats.items())
+            lines = [
+                "# HELP dash_request_duration_seconds Tiempo de reloj por ruta o callback.",
+                "# TYPE dash_request_duration_seconds histogram",
+            ]
+            for (kind, name), stats in items:
+                labels = f'kind="{kind}",name="{_escape(name)}"'
+                for bound, count in zip(LATENCY_BUCKETS, stats.buckets):
+                    lines.append(f'dash_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'dash_request_duration_seconds_bucket{{{labels},le="+Inf"}} {stats.count}')
+                lines.append(f"dash_request_duration_seconds_sum{{{labels}}} {stats.wall:.6f}")
+                lines.append(f"dash_request_duration_seconds_count{{{labels}}} {stats.count}")
+
+            for metric, help_text, attribute in (
+                ("dash_request_cpu_seconds_total", "Tiempo de CPU del hilo que atendió la request.", "cpu"),
+                ("dash_response_bytes_total", "Bytes enviados en el cuerpo de la respuesta.", "bytes"),
+            ):
+                lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+                for (kind, name), stats in items:
+                    value = getattr(stats, attribute)
+                    lines.append(f'{metric}{{kind="{kind}",name="{_escape(name)}"}} {value:.6f}'
+                                 if isinstance(value, float) else
+                                 f'{metric}{{kind="{kind}",name="{_escape(name)}"}} {value}')
+
+            lines += [
+                "# HELP dash_requests_total Requests por resultado de caché (hit, miss o none).",
+                "# TYPE dash_requests_total counter",
+            ]
+            for (kind, name), stats in items:
+                for cache, count in sorted(stats.cache.items()):
+                    lines.append(f'dash_requests_total{{kind="{kind}",name="{_escape(name)}",cache="{cache}"}} {count}')
+
+            lines += [
+                "# HELP dash_slow_request_profiles_total Perfiles guardados de requests lentas.",
+                "# TYPE dash_slow_request_profiles_total counter",
+                f"dash_slow_request_profiles_total {self.slow_profiles}",
+            ]
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class SamplingProfiler:
+    """Muestrea las pilas de los hilos con requests en curso y guarda las de requests lentas."""
+
+    def __init__(self, registry, threshold_ms=PROFILE_SLOW_MS, interval_ms=PROFILE_INTERVAL_MS,
+                 directory=PROFILE_DIR, keep=PROFILE_KEEP):
+        self.registry = registry
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_ms / 1000
+        self.directory = directory
+        self.keep = keep
+        self._active = {}
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def begin(self):
+        with self._lock:
+            self._active[threading.get_ident()] = Counter()
+
+    def end(self, label, wall):
+        with self._lock:
+            samples = self._active.pop(threading.get_ident(), None)
+        if samples and wall >= self.threshold:
+            self._save(label, wall, samples)
+
+    def _run(self):
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._active:
+                    continue
+                frames = sys._current_frames()
+                for thread_id, samples in self._active.items():
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        samples[_collapse(frame)] += 1
+
+    def _save(self, label, wall, samples):
+        os.makedirs(self.directory, exist_ok=True)
+        safe_label = "".join(c if c.isalnum() or c in "-_." else "_" for c in label)[:80]
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{int(wall * 1000)}ms-{safe_label}.collapsed"
+        with open(os.path.join(self.directory, name), "w", encoding="utf-8") as fh:
+            for stack, count in samples.most_common():
+                fh.write(f"{stack} {count}\n")
+        self.registry.slow_profiles += 1
+
+        profiles = sorted(entry for entry in os.listdir(self.directory) if entry.endswith(".collapsed"))
+        for old in profiles[:-self.keep]:
+            os.remove(os.path.join(self.directory, old))
+
+
+def _collapse(frame):
+    """Pila en formato collapsed: funciones de la raíz a la hoja separadas por ';'."""
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(stack))
+
+
+registry = Registry()
+_cache_events = threading.local()
+
+
+def record_cache(hit):
+    """Anota un acierto o fallo de caché para la request en curso (lo llama cache_compartida.py)."""
+    events = getattr(_cache_events, 'events', None)
+    if events is not None:
+        events['hit' if hit else 'miss'] += 1
+
+
+def _page_path(pathname):
+    """Ruta registrada de la página (acota las etiquetas: cualquier otra ruta es 'no_encontrada')."""
+    import dash
+
+    paths = {page['path'] for page in dash.page_registry.values()}
+    return pathname if pathname in paths else 'no_encontrada'
+
+
+# Callbacks de la app (app.callback_map, se completa al primer request de Dash)
+_callback_map = {}
+
+
+def _endpoint_name(request, response):
+    """('callback', id del output) o ('route', regla de la URL), con la página o el payload si aplica."""
+    if request.path == DASH_CALLBACK_PATH:
+        body = request.get_json(silent=True) or {}
+        name = body.get('output')
+        if response.status_code >= 400 or not isinstance(name, str) or name not in _callback_map:
+            return 'callback', 'desconocido'
+        if PAGES_CONTENT_ID in name:
+            # El callback que arma cada página: se separa por ruta para saber qué página es lenta
+            pathname = next((item.get('value') for item in body.get('inputs', [])
+                             if isinstance(item, dict) and item.get('id') == PAGES_LOCATION_ID
+                             and item.get('property') == 'pathname'), None)
+            name = f"{name} {_page_path(pathname)}"
+        return 'callback', name
+    rule = request.url_rule
+    if rule is None:
+        return 'route', 'sin_ruta'
+    name = rule.rule
+    # Solo con respuestas exitosas, para que una URL inventada no cree series nuevas
+    if response.status_code < 400:
+        for arg in LABELED_VIEW_ARGS:
+            if arg in (request.view_args or {}):
+                name = name.replace(f"<{arg}>", str(request.view_args[arg]))
+    return 'route', name
+
+
+def register(server, callback_map=None, profiler_threshold_ms=PROFILE_SLOW_MS):
+    """Agrega los hooks de medición al servidor Flask y la ruta GET /metrics.
+
+    `callback_map` es app.callback_map de Dash: las requests de callbacks se
+    etiquetan con su output solo si está ahí.
+    """
+    global _callback_map
+    from flask import Response, g, request
+
+    if callback_map is not None:
+        _callback_map = callback_map
+
+    profiler = SamplingProfiler(registry, profiler_threshold_ms) if profiler_threshold_ms > 0 else None
+
+    @server.before_request
+    def _start_timer():
+        g.metrics_start = (time.perf_counter(), time.thread_time())
+        _cache_events.events = Counter()
+        if profiler is not None:
+            profiler.begin()
+
+    @server.after_request
+    def _record(response):
+        start = g.pop('metrics_start', None)
+        if start is None or request.path == "/metrics":
+            return response
+        wall = time.perf_counter() - start[0]
+        cpu = time.thread_time() - start[1]
+
+        events = getattr(_cache_events, 'events', None) or Counter()
+        _cache_events.events = None
+        if response.status_code == 304 or (events['hit'] and not events['miss']):
+            cache = 'hit'
+        else:
+            cache = 'miss' if events['miss'] else 'none'
+
+        size = response.content_length
+        if size is None and not response.direct_passthrough and not response.is_streamed:
+            size = len(response.get_data())
+        kind, name = _endpoint_name(request, response)
+        registry.observe(kind, name, wall, cpu, size or 0, cache)
+        if profiler is not None:
+            profiler.end(name, wall)
+        return response
+
+    @server.route("/metrics")
+    def metrics():
+        return Response(registry.render(), mimetype="text/plain; version=0.0.4")
@@ -0,0 +1,152 @@
+"""Entrenamiento del modelo Random Forest de Health_Risk.
+
+El Pipeline ajustado, sus métricas y la importancia de características se
+guardan en el almacén de artefactos (almacen_modelos.py), de modo que el modelo
+se entrena una vez por combinación de datos/características/hiperparámetros y
+los workers solo lo cargan.
+
+Ejecutar `python modelo.py` compara el tiempo y la memoria del entrenamiento
+en frío contra la carga desde el almacén.
+"""
+import pandas as pd
+
+import almacen_modelos
+
+# scikit-learn se importa dentro de las funciones: solo hace falta al entrenar
+# (o al deserializar un artefacto), no al importar las páginas.
+
+# Columnas que no entran al modelo (identificador, fuga de la variable objetivo, etc.)
+DROP_COLUMNS = ['ID', 'Health_Issues', 'Caffeine_mg', 'Health_Risk', 'Health_Risk_Label']
+TARGET = 'Health_Risk'
+
+MODEL_PARAMS = {"n_estimators": 100, "random_state": 42, "n_jobs": -1}
+TEST_SIZE = 0.3
+SPLIT_SEED = 42
+
+
+def split_features(df):
+    """Devuelve X, y y las listas de características numéricas y categóricas."""
+    X = df.drop(columns=DROP_COLUMNS)
+    y = df[TARGET]
+    numerical_features = list(X.select_dtypes(include='number').columns)
+    categorical_features = list(X.select_dtypes(include=['category', 'object']).columns)
+    return X, y, numerical_features, categorical_features
+
+
+def build_pipeline(numerical_features, categorical_features, params=None):
+    from sklearn.compose import ColumnTransformer
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+    preprocessor = ColumnTransformer(
+        transformers=[
+            ('num', StandardScaler(), numerical_features),
+            ('cat', OneHotEncoder(handle_unknown='ignore'), categorical_features)
+        ],
+        remainder='passthrough'
+    )
+    return Pipeline(steps=[
+        ('preprocessor', preprocessor),
+        ('classifier', RandomForestClassifier(**(params or MODEL_PARAMS)))
+    ])
+
+
+def split_train_test(df):
+    """Partición estratificada fija: X_train, X_test, y_train, y_test y las listas de características."""
+    from sklearn.model_selection import train_test_split
+
+    X, y, numerical_features, categorical_features = split_features(df)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=TEST_SIZE, random_state=SPLIT_SEED, stratify=y
+    )
+    return X_train, X_test, y_train, y_test, numerical_features, categorical_features
+
+
+def evaluate_model(model, X_test, y_test, numerical_features, categorical_features):
+    """Artefacto completo (modelo, métricas en el conjunto de prueba, importancias) de un Pipeline ajustado."""
+    from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score
+
+    y_pred = model.predict(X_test)
+
+    metrics = {
+        'accuracy': accuracy_score(y_test, y_pred),
+        'precision': precision_score(y_test, y_pred),
+        'recall': recall_score(y_test, y_pred),
+        'f1': f1_score(y_test, y_pred),
+    }
+
+    ohe_feature_names = model.named_steps['preprocessor'].named_transformers_['cat'].get_feature_names_out(categorical_features)
+    importances = pd.DataFrame({
+        'Feature': list(numerical_features) + list(ohe_feature_names),
+        'Importance': model.named_steps['classifier'].feature_importances_
+    }).sort_values(by='Importance', ascending=False)
+
+    return {
+        'pipeline': model,
+        'metrics': metrics,
+        'importances': importances,
+        'numerical_features': numerical_features,
+        'categorical_features': categorical_features,
+    }
+
+
+def train_model(df, params=None):
+    """Entrena el Pipeline y devuelve el artefacto completo (modelo, métricas, importancias)."""
+    X_train, X_test, y_train, y_test, numerical_features, categorical_features = split_train_test(df)
+
+    model = build_pipeline(numerical_features, categorical_features, params)
+    model.fit(X_train, y_train)
+    return evaluate_model(model, X_test, y_test, numerical_features, categorical_features)
+
+
+def model_key(df, params=None):
+    X, _, numerical_features, categorical_features = split_features(df)
+    return almacen_modelos.artifact_key(
+        almacen_modelos.dataset_hash(df[list(X.columns) + [TARGET]]),
+        numerical_features + categorical_features,
+        {**(params or MODEL_PARAMS), 'test_size': TEST_SIZE, 'split_seed': SPLIT_SEED},
+    )
+
+
+def load_or_train(df, params=None):
+    """Carga el artefacto del almacén o lo entrena (una sola vez entre procesos).
+
+    Sin hiperparámetros explícitos se usa el modelo ganador de la búsqueda de
+    entrenamiento.py si ya está guardado (o se busca, con MODEL_SEARCH=1); si no,
+    el Random Forest fijo de MODEL_PARAMS.
+    """
+    if params is None:
+        import entrenamiento
+
+        artifact = entrenamiento.load_best(df)
+        if artifact is not None:
+            return artifact
+    key = model_key(df, params)
+    artifact = almacen_modelos.get_or_create(key, lambda: train_model(df, params))
+    return {**artifact, 'version': key}
+
+
+if __name__ == "__main__":
+    import resource
+    import sys
+    import tempfile
+    import time
+
+    from datos import DATA_PATH, add_health_risk, load_dataset
+
+    data = add_health_risk(load_dataset(sys.argv[1] if len(sys.argv) > 1 else DATA_PATH))
+
+    def rss_mb():
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    with tempfile.TemporaryDirectory() as store_dir:
+        almacen_modelos.MODEL_STORE_DIR = store_dir
+        base = rss_mb()
+        start = time.perf_counter()
+        load_or_train(data)
+        print(f"Entrenamiento en frío: {time.perf_counter() - start:.2f}s, +{rss_mb() - base:.0f} MB de RSS máximo")
+
+        start = time.perf_counter()
+        load_or_train(data)
+        print(f"Carga desde el almacén: {time.perf_counter() - start:.2f}s")
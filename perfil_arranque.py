@@ -0,0 +1,101 @@
+"""Perfil del costo de importación del dashboard.
+
+Ejecuta `python -X importtime -c "import app"` en un proceso limpio y desglosa
+el tiempo de arranque por paquete de primer nivel y por página registrada
+(`pages.<nombre>`).
+
+Uso:
+    python perfil_arranque.py            # tabla con el desglose
+    python perfil_arranque.py --check    # además falla (exit 1) si se supera el presupuesto
+
+El presupuesto de arranque se define en STARTUP_BUDGET_S (segundos) y puede
+sobrescribirse con la variable de entorno del mismo nombre. La prueba
+tests/test_arranque.py aplica el mismo presupuesto junto con el resto de la
+suite, sobre una estructura desplegada (pages/, data/, assets/) que arma con
+enlaces al repositorio.
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+STARTUP_BUDGET_S = float(os.environ.get("STARTUP_BUDGET_S", "3.0"))
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+# Dash carga las páginas con exec_module y -X importtime no las registra, así que
+# el proceso hijo mide cada página envolviendo SourceFileLoader.exec_module.
+_CHILD = """
+import json, time
+from importlib.machinery import SourceFileLoader
+_exec = SourceFileLoader.exec_module
+pages = {}
+def _timed(self, module):
+    start = time.perf_counter()
+    _exec(self, module)
+    if module.__name__.startswith("pages."):
+        pages[module.__name__] = int((time.perf_counter() - start) * 1e6)
+SourceFileLoader.exec_module = _timed
+import %s
+print(json.dumps(pages))
+"""
+
+
+def profile_imports(module="app", cwd=None):
+    """Importa `module` en un proceso limpio.
+
+    Devuelve ([(módulo, self_us, cumulative_us, profundidad)], {página: cumulative_us}).
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _CHILD % module],
+        cwd=cwd, capture_output=True, text=True, check=True,
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return entries, json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def summarize(entries, module="app"):
+    """Agrupa el tiempo propio por paquete de primer nivel y obtiene el total de `module`."""
+    by_package = defaultdict(int)
+    total_us = 0
+    for name, self_us, cumulative_us, _ in entries:
+        by_package[name.split(".")[0]] += self_us
+        if name == module:
+            total_us = cumulative_us
+    return total_us, dict(by_package)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="app")
+    parser.add_argument("--top", type=int, default=15, help="paquetes a mostrar")
+    parser.add_argument("--check", action="store_true", help="falla si se supera STARTUP_BUDGET_S")
+    args = parser.parse_args(argv)
+
+    entries, pages = profile_imports(args.module)
+    total_us, by_package = summarize(entries, args.module)
+
+    print(f"Importación de {args.module}: {total_us / 1e6:.2f}s (presupuesto {STARTUP_BUDGET_S:.2f}s)\n")
+    print("Por paquete (tiempo propio):")
+    for name, self_us in sorted(by_package.items(), key=lambda kv: -kv[1])[:args.top]:
+        print(f"  {name:<30} {self_us / 1e3:>9.1f} ms")
+    print("\nPor página registrada (acumulado):")
+    for name, cumulative_us in sorted(pages.items(), key=lambda kv: -kv[1]):
+        print(f"  {name:<30} {cumulative_us / 1e3:>9.1f} ms")
+
+    if args.check and total_us / 1e6 > STARTUP_BUDGET_S:
+        print(f"\nPresupuesto de arranque superado: {total_us / 1e6:.2f}s > {STARTUP_BUDGET_S:.2f}s")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,289 @@
+"""Servicio de predicción por lotes: POST /api/predict.
+
+Recibe registros en JSON (lista de objetos o {"records": [...]}) o CSV
+(Content-Type text/csv o campo de formulario 'file') y devuelve la probabilidad
+de Health_Risk alto para cada uno.
+
+Las solicitudes concurrentes se agrupan en micro-lotes (MicroBatcher): un hilo
+junta lo que llega durante BATCH_WINDOW_MS (hasta BATCH_MAX_ROWS filas) y hace
+una sola evaluación del modelo. Por defecto se usa el evaluador plano de
+arbol_plano.py; con ?engine=pipeline se usa Pipeline.predict_proba directamente.
+
+Cuando llega una versión de datos nueva (una ingesta), el modelo se reentrena
+como trabajo en segundo plano (trabajos.py) y mientras tanto se sigue usando el
+último modelo compilado; ninguna solicitud espera el entrenamiento.
+
+Ejecutar `python prediccion.py` compara filas/s y latencia p99 de ambos caminos.
+"""
+import io
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import numpy as np
+import pandas as pd
+
+import almacen_modelos
+import ingesta
+import trabajos
+from arbol_plano import FlatModel
+from datos import SCHEMA, check_integer_values
+from modelo import load_or_train
+
+BATCH_WINDOW_MS = float(os.environ.get("PREDICT_BATCH_WINDOW_MS", "5"))
+BATCH_MAX_ROWS = int(os.environ.get("PREDICT_BATCH_MAX_ROWS", "2048"))
+MAX_REQUEST_ROWS = int(os.environ.get("PREDICT_MAX_REQUEST_ROWS", "100000"))
+# Modelos compilados que se conservan (uno por versión de datos)
+MODEL_CACHE_SIZE = 2
+
+
+class CompiledModel:
+    """Artefacto entrenado + su versión plana para inferencia."""
+
+    def __init__(self, artifact):
+        self.artifact = artifact
+        self.version = artifact['version']
+        self.pipeline = artifact['pipeline']
+        self.flat = FlatModel(artifact)
+        self.features = self.flat.features
+
+    # Se usa como clave de cachés (lru_cache): se compara por versión
+    def __hash__(self):
+        return hash(self.version)
+
+    def __eq__(self, other):
+        return isinstance(other, CompiledModel) and other.version == self.version
+
+
+_models = OrderedDict()
+_models_lock = threading.Lock()
+# Versión de datos -> id del trabajo que entrena su modelo
+_training = {}
+
+
+def train_model_job(progress, version):
+    """Trabajo en segundo plano: entrena (o carga) el modelo de la versión de datos `version`; devuelve su clave."""
+    snapshot = ingesta.snapshot_at(version)
+    progress(0.05, "Entrenando el modelo")
+    return load_or_train(snapshot.frame)['version']
+
+
+trabajos.register_job('train-model', train_model_job)
+
+
+def _store(version, artifact):
+    with _models_lock:
+        model = _models.get(version)
+        if model is None:
+            model = _models[version] = CompiledModel(artifact)
+        _models.move_to_end(version)
+        while len(_models) > MODEL_CACHE_SIZE:
+            _models.popitem(last=False)
+        return model
+
+
+def get_model(snapshot=None):
+    """Modelo compilado para la instantánea de datos vigente, o el último disponible mientras se entrena.
+
+    Solo el primer modelo del proceso se carga (o entrena) dentro de la
+    solicitud: no hay otro que servir. Los siguientes se entrenan en el pool de
+    trabajos y se usan en cuanto el trabajo termina.
+    """
+    snapshot = snapshot or ingesta.current()
+    with _models_lock:
+        if snapshot.version in _models:
+            _models.move_to_end(snapshot.version)
+            return _models[snapshot.version]
+        latest = _models[next(reversed(_models))] if _models else None
+        job = _training.get(snapshot.version)
+    if latest is None:
+        return _store(snapshot.version, load_or_train(snapshot.frame))
+
+    if job is None:
+        job = _training[snapshot.version] = trabajos.submit('train-model', snapshot.version)
+    record = trabajos.status(job)
+    if record is not None and record['status'] == 'done':
+        _training.pop(snapshot.version, None)
+        key = trabajos.result(job)
+        return _store(snapshot.version, {**almacen_modelos.load_artifact(key), 'version': key})
+    if record is None or record['status'] in trabajos.FINAL_STATES:
+        # Falló o se canceló: se vuelve a enviar en la próxima solicitud
+        _training.pop(snapshot.version, None)
+    return latest
+
+
+def prepare_records(records, features):
+    """Valida y tipa los registros de entrada igual que el dataset de entrenamiento."""
+    missing = [column for column in features if column not in records.columns]
+    if missing:
+        raise ValueError(f"Faltan campos: {missing}")
+    if len(records) > MAX_REQUEST_ROWS:
+        raise ValueError(f"Máximo {MAX_REQUEST_ROWS} registros por solicitud")
+
+    columns = {}
+    for column in features:
+        dtype = SCHEMA.get(column)
+        if isinstance(dtype, str) and dtype != 'category':
+            values = pd.to_numeric(records[column], errors='raise')
+            # El evaluador plano y el Pipeline mandan los faltantes a hojas distintas: se rechazan
+            if not np.isfinite(values.to_numpy(dtype=np.float64)).all():
+                raise ValueError(f"Valores faltantes o no finitos en {column}")
+            if pd.api.types.is_integer_dtype(dtype):
+                # astype a int8/int16 daría la vuelta a los valores fuera de rango (Age=300 -> 44)
+                check_integer_values(values, dtype, column)
+            columns[column] = values.astype(dtype)
+        else:
+            if records[column].isna().any():
+                raise ValueError(f"Valores faltantes en {column}")
+            columns[column] = records[column].astype(str).astype(object)
+    return pd.DataFrame(columns)
+
+
+class MicroBatcher:
+    """Agrupa solicitudes concurrentes y las evalúa en una sola llamada."""
+
+    def __init__(self, window_ms=BATCH_WINDOW_MS, max_rows=BATCH_MAX_ROWS):
+        self.window = window_ms / 1000
+        self.max_rows = max_rows
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="predict-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, model, records):
+        """Encola los registros (ya preparados) y espera sus probabilidades."""
+        future = Future()
+        self._queue.put((model, records, future))
+        return future.result()
+
+    def _collect(self):
+        items = [self._queue.get()]
+        rows = len(items[0][1])
+        deadline = time.perf_counter() + self.window
+        while rows < self.max_rows:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            items.append(item)
+            rows += len(item[1])
+        return items
+
+    def _run(self):
+        while True:
+            items = self._collect()
+            # Solo se combinan solicitudes de la misma versión del modelo
+            by_model = OrderedDict()
+            for model, records, future in items:
+                by_model.setdefault(id(model), (model, []))[1].append((records, future))
+            for model, pending in by_model.values():
+                try:
+                    batch = pd.concat([records for records, _ in pending], ignore_index=True)
+                    probabilities = model.flat.predict_proba(batch)
+                except Exception as exc:
+                    for _, future in pending:
+                        future.set_exception(exc)
+                    continue
+                start = 0
+                for records, future in pending:
+                    future.set_result(probabilities[start:start + len(records)])
+                    start += len(records)
+
+
+_batcher = None
+_batcher_lock = threading.Lock()
+
+
+def get_batcher():
+    global _batcher
+    with _batcher_lock:
+        if _batcher is None:
+            _batcher = MicroBatcher()
+        return _batcher
+
+
+def predict(records, engine='flat'):
+    """Probabilidades de riesgo alto para un DataFrame de registros crudos."""
+    model = get_model()
+    prepared = prepare_records(records, model.features)
+    if engine == 'pipeline':
+        return model, model.pipeline.predict_proba(prepared)[:, 1]
+    return model, get_batcher().submit(model, prepared)
+
+
+def _parse_request(request):
+    upload = request.files.get('file')
+    if upload is not None or (request.mimetype or '').endswith('csv'):
+        payload = upload.read() if upload is not None else request.get_data()
+        return pd.read_csv(io.BytesIO(payload))
+
+    payload = request.get_json(silent=True)
+    if isinstance(payload, dict):
+        payload = payload.get('records', [payload])
+    if not isinstance(payload, list) or not payload:
+        raise ValueError("Se espera una lista de registros en JSON o un CSV")
+    return pd.DataFrame.from_records(payload)
+
+
+def register_routes(server):
+    from flask import jsonify, request
+
+    @server.route("/api/predict", methods=["POST"])
+    def api_predict():
+        if ingesta.current() is None:
+            return jsonify(error="Los datos aún no están cargados"), 503
+        engine = request.args.get('engine', 'flat')
+        try:
+            records = _parse_request(request)
+            model, probabilities = predict(records, engine)
+        except (ValueError, TypeError, pd.errors.ParserError) as exc:
+            return jsonify(error=str(exc)), 400
+
+        return jsonify(
+            model_version=model.version,
+            engine=engine,
+            probabilities=np.round(probabilities, 6).tolist(),
+            labels=['High Risk' if p >= 0.5 else 'Low Risk' for p in probabilities],
+        )
+
+
+if __name__ == "__main__":
+    import sys
+    import warnings
+    from concurrent.futures import ThreadPoolExecutor
+
+    from datos import DATA_PATH
+
+    warnings.filterwarnings("ignore")
+    snapshot = ingesta.initialize(sys.argv[1] if len(sys.argv) > 1 else DATA_PATH)
+    model = get_model(snapshot)
+    sample = prepare_records(snapshot.frame.sample(2000, random_state=0), model.features)
+
+    def run(label, call, rows_per_request, clients=16, requests_per_client=25):
+        latencies = []
+
+        def client(seed):
+            rng = np.random.default_rng(seed)
+            for _ in range(requests_per_client):
+                start_row = rng.integers(0, len(sample) - rows_per_request + 1)
+                records = sample.iloc[start_row:start_row + rows_per_request]
+                start = time.perf_counter()
+                call(records)
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(clients) as pool:
+            list(pool.map(client, range(clients)))
+        elapsed = time.perf_counter() - start
+        total_rows = clients * requests_per_client * rows_per_request
+        print(f"  {label:<28} {total_rows / elapsed:>10,.0f} filas/s   p99 {np.percentile(latencies, 99) * 1000:7.1f} ms")
+
+    for rows_per_request in (1, 10, 100):
+        print(f"{rows_per_request} fila(s) por solicitud, 16 clientes concurrentes:")
+        run("Pipeline.predict_proba", lambda r: model.pipeline.predict_proba(r), rows_per_request)
+        run("micro-lotes + bosque plano", lambda r: get_batcher().submit(model, r), rows_per_request)
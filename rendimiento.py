@@ -0,0 +1,259 @@
+"""Suite de benchmarks de los caminos críticos del dashboard.
+
+Mide, sobre copias escaladas del dataset sintético (BENCHMARK_ROWS filas):
+
+- importación de app.py y de cada página (perfil_arranque.py),
+- carga del CSV tipado y desde la caché Arrow (datos.py),
+- puntuación de Health_Risk vectorizada y fila a fila (puntuacion.py),
+- get_univariate_plots, get_bivariate_plots, get_geographic_plot y
+  get_model_analysis (entrenamiento en frío; validación cruzada, permutación y
+  explicaciones en frío con el modelo ya entrenado; todo desde los artefactos),
+- generación de layout() de cada página y bytes serializados por página
+  (y por pestaña de resultados, sin comprimir y con gzip; en las pestañas con
+  trabajo en segundo plano, también el contenido que arma el trabajo).
+
+Los resultados se escriben en JSON (BENCHMARK_DIR/results-<fecha>.json y
+latest.json) y se comparan con la línea base guardada (BENCHMARK_BASELINE). Un
+tiempo es regresión si supera la base en más de THRESHOLDS['seconds'] veces y
+en más de MIN_SECONDS_DELTA; un tamaño, si la supera en THRESHOLDS['bytes'].
+La línea base depende de la máquina: se regenera con --save-baseline. Las
+mediciones que no están en la base se reportan como nuevas (sin comparar).
+
+Uso (desde el directorio de la app, con pages/ y data/):
+    python rendimiento.py                     # corre y compara con la base
+    python rendimiento.py --rows 10000        # solo ese tamaño
+    python rendimiento.py --check             # exit 1 si hay regresiones
+    python rendimiento.py --save-baseline     # guarda estos resultados como base
+"""
+import argparse
+import gzip
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+BENCHMARK_ROWS = [10_000, 100_000, 1_000_000]
+# El entrenamiento y la puntuación fila a fila solo se miden hasta estos tamaños
+MODEL_MAX_ROWS = 100_000
+ROWWISE_MAX_ROWS = 100_000
+BENCHMARK_DIR = os.environ.get("BENCHMARK_DIR", "artifacts/benchmarks")
+BENCHMARK_BASELINE = os.environ.get("BENCHMARK_BASELINE", "benchmark_baseline.json")
+# Factor máximo respecto de la línea base antes de considerar una regresión
+THRESHOLDS = {
+    'seconds': float(os.environ.get("BENCHMARK_TIME_THRESHOLD", "1.25")),
+    'bytes': float(os.environ.get("BENCHMARK_BYTES_THRESHOLD", "1.10")),
+}
+# Diferencias de tiempo menores a esto se consideran ruido
+MIN_SECONDS_DELTA = 0.005
+# Pestañas de resultados que muestran un job_panel, con la función del trabajo que arma su contenido
+JOB_TABS = {'tab-4': 'prepare_model_analysis', 'tab-5': 'prepare_statistical_tests'}
+
+
+def measure(func, min_time=0.5, max_repeats=7):
+    """Mediana de varias ejecuciones de func() (al menos una; hasta min_time segundos o max_repeats)."""
+    timings = []
+    while not timings or (sum(timings) < min_time and len(timings) < max_repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+class Results:
+    def __init__(self):
+        self.values = {}
+
+    def add(self, name, value, metric='seconds', rows=None):
+        self.values[name] = {'value': value, 'metric': metric, 'rows': rows}
+        shown = f"{value * 1000:10.1f} ms" if metric == 'seconds' else f"{value / 1024:10.1f} KB"
+        print(f"  {name:<45} {shown}", flush=True)
+
+    def time(self, name, func, rows=None, **kwargs):
+        self.add(name, measure(func, **kwargs), 'seconds', rows)
+
+
+def bench_imports(results):
+    from perfil_arranque import profile_imports, summarize
+
+    entries, pages = profile_imports("app")
+    total_us, _ = summarize(entries, "app")
+    results.add("import/app", total_us / 1e6)
+    for page, cumulative_us in sorted(pages.items()):
+        results.add(f"import/{page}", cumulative_us / 1e6)
+
+
+def _serialized(value):
+    from plotly.io.json import to_json_plotly
+
+    return to_json_plotly(value).encode()
+
+
+def bench_pages(results):
+    """layout() de cada página registrada y bytes de su JSON."""
+    import dash
+
+    for page in dash.page_registry.values():
+        layout = page['layout']
+        name = page['module']
+        if callable(layout):
+            results.time(f"layout/{name}", layout)
+            layout = layout()
+        results.add(f"payload/{name}", len(_serialized(layout)), 'bytes')
+
+
+def bench_dataset(results, resultados, n_rows, workdir):
+    import almacen_modelos
+    import datos
+    from cubo import AggregateCube
+    from puntuacion import compute_health_risk, score_health_risk
+    from resumen import RunningHistogram
+
+    csv_path = datos._scaled_csv(datos.DATA_PATH, n_rows, workdir)
+    cache_dir = os.path.join(workdir, f"cache-{n_rows}")
+    tag = f"[{n_rows}]"
+
+    results.time(f"load/csv{tag}", lambda: datos.read_csv(csv_path), n_rows)
+    datos.load_dataset(csv_path, cache_dir=cache_dir)
+    results.time(f"load/arrow_cache{tag}", lambda: datos.load_dataset(csv_path, cache_dir=cache_dir), n_rows)
+
+    df = datos.load_dataset(csv_path, cache_dir=cache_dir)
+    results.time(f"score/vectorized{tag}", lambda: score_health_risk(df), n_rows)
+    if n_rows <= ROWWISE_MAX_ROWS:
+        results.time(f"score/compute_health_risk{tag}", lambda: df.apply(compute_health_risk, axis=1), n_rows,
+                     max_repeats=1)
+    datos.add_health_risk(df)
+
+    histograms = {column: RunningHistogram.from_values(df[column]) for column in resultados.ingesta.HISTOGRAM_COLUMNS}
+    cube = AggregateCube.from_frame(df)
+    results.time(f"plots/univariate{tag}", lambda: resultados.get_univariate_plots(df, histograms), n_rows)
+    results.time(f"plots/bivariate{tag}", lambda: resultados.get_bivariate_plots(df), n_rows)
+    results.time(f"plots/geographic{tag}", lambda: resultados.get_geographic_plot(cube), n_rows)
+
+    if n_rows <= MODEL_MAX_ROWS:
+        # Almacén de modelos vacío: la primera llamada entrena, las siguientes cargan el artefacto
+        store_dir = almacen_modelos.MODEL_STORE_DIR
+        almacen_modelos.MODEL_STORE_DIR = os.path.join(workdir, f"models-{n_rows}")
+        try:
+            results.time(f"model/train{tag}", lambda: resultados.load_or_train(df), n_rows, max_repeats=1)
+            # Con el modelo ya entrenado: validación cruzada, permutación y explicaciones en frío
+            results.time(f"model/analysis{tag}", lambda: resultados.get_model_analysis(df), n_rows, max_repeats=1)
+            results.time(f"model/load{tag}", lambda: resultados.get_model_analysis(df), n_rows)
+        finally:
+            almacen_modelos.MODEL_STORE_DIR = store_dir
+
+
+def bench_tabs(results, resultados):
+    """Bytes de cada pestaña de resultados con el dataset de la app (sin comprimir y con gzip)."""
+    snapshot = resultados.ingesta.current()
+    for tab in resultados.TAB_SECTIONS:
+        payload = _serialized(resultados.build_tab_content(tab, snapshot, ()))
+        results.add(f"payload/results-{tab}", len(payload), 'bytes')
+        results.add(f"payload/results-{tab}.gz", len(gzip.compress(payload, compresslevel=6)), 'bytes')
+
+    # Las pestañas con trabajo en segundo plano solo envían el panel; el contenido llega con el resultado
+    for tab, prepare in JOB_TABS.items():
+        payload = _serialized(getattr(resultados, prepare)(lambda fraction, message: None, snapshot.version))
+        results.add(f"payload/results-{tab}-job", len(payload), 'bytes')
+        results.add(f"payload/results-{tab}-job.gz", len(gzip.compress(payload, compresslevel=6)), 'bytes')
+
+
+def compare(current, baseline):
+    """Lista de (nombre, base, actual, razón, regresión) de cada medición actual.
+
+    Las que no están en la línea base se devuelven con base y razón None (nuevas):
+    no pueden ser regresión, pero indican que la base está desactualizada.
+    """
+    rows = []
+    for name, entry in current.items():
+        if name not in baseline:
+            rows.append((name, None, entry['value'], None, False))
+            continue
+        base, value = baseline[name]['value'], entry['value']
+        ratio = value / base if base else float('inf')
+        regression = ratio > THRESHOLDS[entry['metric']]
+        if entry['metric'] == 'seconds':
+            regression = regression and value - base > MIN_SECONDS_DELTA
+        rows.append((name, base, value, ratio, regression))
+    return rows
+
+
+def run(rows):
+    import warnings
+
+    warnings.filterwarnings("ignore")
+    results = Results()
+    print("Importación (proceso limpio):")
+    bench_imports(results)
+
+    import app  # noqa: F401  (registra las páginas)
+    resultados = sys.modules['pages.resultados']
+    print("Páginas:")
+    bench_pages(results)
+    bench_tabs(results, resultados)
+
+    workdir = tempfile.mkdtemp()
+    try:
+        for n_rows in rows:
+            print(f"Dataset escalado a {n_rows:,} filas:")
+            bench_dataset(results, resultados, n_rows, workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results.values
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=BENCHMARK_ROWS)
+    parser.add_argument("--check", action="store_true", help="exit 1 si hay regresiones")
+    parser.add_argument("--save-baseline", action="store_true", help="guarda los resultados como línea base")
+    args = parser.parse_args(argv)
+
+    values = run(args.rows)
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'rows': args.rows,
+        },
+        'results': values,
+    }
+    os.makedirs(BENCHMARK_DIR, exist_ok=True)
+    for name in (f"results-{time.strftime('%Y%m%d-%H%M%S')}.json", "latest.json"):
+        with open(os.path.join(BENCHMARK_DIR, name), "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+
+    if args.save_baseline:
+        with open(BENCHMARK_BASELINE, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"\nLínea base guardada en {BENCHMARK_BASELINE}")
+        return 0
+    if not os.path.exists(BENCHMARK_BASELINE):
+        print(f"\nNo hay línea base ({BENCHMARK_BASELINE}); ejecute con --save-baseline")
+        return 0
+
+    with open(BENCHMARK_BASELINE, encoding="utf-8") as fh:
+        baseline = json.load(fh)['results']
+    rows = compare(values, baseline)
+    regressions = [row for row in rows if row[4]]
+    new = [row for row in rows if row[1] is None]
+    print(f"\nComparación con {BENCHMARK_BASELINE} (umbral tiempo x{THRESHOLDS['seconds']}, bytes x{THRESHOLDS['bytes']}):")
+    for name, base, value, ratio, regression in rows:
+        if base is None:
+            print(f"  {name:<45} {'':>6}  nueva")
+            continue
+        marker = "REGRESIÓN" if regression else ("mejora" if ratio < 1 / THRESHOLDS[values[name]['metric']] else "")
+        print(f"  {name:<45} x{ratio:5.2f}  {marker}")
+    print(f"\n{len(regressions)} regresión(es) en {len(rows) - len(new)} mediciones comparadas")
+    if new:
+        print(f"{len(new)} medición(es) sin línea base: ejecute con --save-baseline para incluirlas")
+    return 1 if args.check and regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""Respuestas JSON preserializadas y comprimidas, servidas con caché HTTP.
+
+Los callbacks de Dash responden por POST: cada vez se vuelve a serializar la
+figura a JSON y se envía sin comprimir, y el navegador no puede cachear nada.
+Para el contenido pesado (las pestañas de resultados) se registra un payload
+con nombre que se sirve por GET /api/payload/<nombre>:
+
+- el objeto se serializa una sola vez por versión de datos y argumentos (con el
+  codificador de Plotly/Dash, que usa orjson si está instalado), se comprime con
+  gzip y los bytes se guardan en la caché compartida (cache_compartida.py);
+- la respuesta lleva un ETag derivado del nombre, la versión de los datos, los
+  argumentos y la versión del código (CODE_VERSION: tras un despliegue el
+  navegador no conserva el contenido armado por el código anterior), así que un If-None-Match que coincide se responde con 304 sin
+  construir ni leer nada, y Cache-Control: no-cache para que el navegador
+  siempre revalide (los datos pueden cambiar con la ingesta).
+
+En el navegador basta con un fetch() desde un callback clientside: usa la caché
+HTTP y resuelve el 304 por sí solo.
+"""
+import gzip
+import hashlib
+import os
+from collections import namedtuple
+
+from cache_compartida import CODE_VERSION, shared_cache
+
+PAYLOAD_COMPRESSLEVEL = int(os.environ.get("PAYLOAD_COMPRESSLEVEL", "6"))
+PAYLOAD_CACHE_CONTROL = os.environ.get("PAYLOAD_CACHE_CONTROL", "public, no-cache")
+
+Payload = namedtuple('Payload', ['parse', 'build', 'snapshot'])
+_payloads = {}
+
+
+def register_payload(name, parse, build, snapshot):
+    """Registra un payload servido en GET /api/payload/<name>.
+
+    parse(args) convierte los parámetros de la URL en una tupla hashable (o lanza
+    ValueError), snapshot() devuelve la instantánea vigente de los datos (con su
+    `version`) y build(snapshot, *key) construye el objeto a serializar. La
+    instantánea se obtiene una sola vez por solicitud y de ella salen tanto el
+    ETag como el cuerpo: una ingesta entre ambos no puede mezclar versiones.
+    """
+    _payloads[name] = Payload(parse, build, snapshot)
+
+
+def serialize(value):
+    from plotly.io.json import to_json_plotly
+
+    return to_json_plotly(value).encode()
+
+
+def etag_for(name, version, key):
+    return hashlib.sha256(repr((CODE_VERSION, name, version, key)).encode()).hexdigest()[:32]
+
+
+@shared_cache()
+def compressed_payload(name, snapshot, key):
+    """JSON comprimido con gzip del payload `name` (una vez por versión de `snapshot` y argumentos)."""
+    return gzip.compress(serialize(_payloads[name].build(snapshot, *key)), compresslevel=PAYLOAD_COMPRESSLEVEL)
+
+
+def register_routes(server):
+    from flask import Response, abort, jsonify, request
+
+    @server.route("/api/payload/<name>")
+    def api_payload(name):
+        payload = _payloads.get(name)
+        if payload is None:
+            abort(404)
+        try:
+            key = payload.parse(request.args)
+        except ValueError as exc:
+            return jsonify(error=str(exc)), 400
+
+        snapshot = payload.snapshot()
+        etag = etag_for(name, snapshot.version, key)
+        headers = {'ETag': f'"{etag}"', 'Cache-Control': PAYLOAD_CACHE_CONTROL, 'Vary': 'Accept-Encoding'}
+        if etag in request.if_none_match:
+            return Response(status=304, headers=headers)
+
+        body = compressed_payload(name, snapshot, key)
+        if 'gzip' in request.accept_encodings:
+            headers['Content-Encoding'] = 'gzip'
+        else:
+            body = gzip.decompress(body)
+        return Response(body, mimetype='application/json', headers=headers)
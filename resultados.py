@@ -1,374 +1,733 @@
-import dash
-from dash import html, dcc
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from scipy import stats
-from scipy.stats import (
-    kstest, norm, chi2_contingency, shapiro, 
-    ks_2samp, ttest_ind, mannwhitneyu
-)
-from sklearn.impute import SimpleImputer, KNNImputer
-import geopandas as gpd
-import folium
-from folium import Choropleth, Marker, Popup
-from shapely.geometry import Point
-import warnings
-
-# --- Nuevas librerías necesarias para Plotly y el Modelo Predictivo ---
-import plotly.express as px
-import plotly.graph_objects as go
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import OneHotEncoder, StandardScaler
-from sklearn.compose import ColumnTransformer
-from sklearn.pipeline import Pipeline
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
-# --------------------------------------------------------------------
-
-warnings.filterwarnings("ignore")
-
-dash.register_page(__name__, path="/resultados", name="Resultados y Análisis", order=6) # Nombre claro para la navegación
-
-# --- LECTURA Y PREPARACIÓN DE DATOS ---
-df = pd.read_csv("data/synthetic_coffee_health_10000.csv")
-
-# Función para crear la columna Health_Risk, replicando la lógica de tu notebook.
-def compute_health_risk(row):
-    """Calcula el riesgo de salud (1=Alto, 0=Bajo) basado en un sistema de puntos."""
-    score = 0
-    # Asignación de puntos según la lógica identificada en el notebook
-    if row['Coffee_Intake'] > 4: score += 2
-    if row['Sleep_Hours'] < 6: score += 2
-    if row['BMI'] > 25: score += 1
-    if row['Heart_Rate'] > 80: score += 1
-    if row['Stress_Level'] == 'Medium': score += 1
-    if row['Stress_Level'] == 'High': score += 2
-    if row['Smoking'] == 1: score += 2
-    if row['Alcohol_Consumption'] == 1: score += 1
-    if row['Sleep_Quality'] == 'Poor': score += 2
-    if row['Sleep_Quality'] == 'Fair': score += 1
-    return 1 if score >= 6 else 0
-
-df_tratado = df.copy()
-df_tratado["Health_Risk"] = df_tratado.apply(compute_health_risk, axis=1)
-# Mapear la variable objetivo a etiquetas de texto para mejor visualización
-df_tratado['Health_Risk_Label'] = df_tratado['Health_Risk'].map({0: 'Low Risk', 1: 'High Risk'})
-
-# --- FUNCIONES DE GENERACIÓN DE GRÁFICOS CON PLOTLY (Mantenidas) ---
-# ... Las funciones get_univariate_plots, get_bivariate_plots, get_geographic_plot, get_model_analysis
-#     se mantienen IGUAL, ya que devuelven los bloques de html.Div con los gráficos.
-# (Por brevedad, omito el código de estas funciones en la respuesta, asumiendo que ya lo tienes.)
-
-# --- FUNCIONES DE GENERACIÓN DE GRÁFICOS CON PLOTLY ---
-def get_univariate_plots(df):
-    """Genera gráficos de análisis univariado."""
-    # 1. Coffee Intake (Histograma con boxplot marginal)
-    fig_coffee = px.histogram(
-        df, x='Coffee_Intake', marginal='box',
-        title='Distribución de Consumo de Café (Tazas)',
-        labels={'Coffee_Intake': 'Consumo de Café (Tazas)', 'count': 'Frecuencia'},
-        color_discrete_sequence=['#4c78a8']
-    )
-    fig_coffee.update_layout(bargap=0.05)
-
-    # 2. Sleep Hours (Histograma)
-    fig_sleep = px.histogram(
-        df, x='Sleep_Hours', marginal='box',
-        title='Distribución de Horas de Sueño',
-        labels={'Sleep_Hours': 'Horas de Sueño', 'count': 'Frecuencia'},
-        color_discrete_sequence=['#f58518']
-    )
-    fig_sleep.update_layout(bargap=0.05)
-    
-    # 3. Stress Level (Gráfico de barras)
-    stress_order = ['Low', 'Medium', 'High']
-    stress_counts = df['Stress_Level'].value_counts().reindex(stress_order)
-    
-    fig_stress = px.bar(
-        stress_counts, x=stress_counts.index, y=stress_counts.values,
-        title='Distribución de Nivel de Estrés',
-        labels={'x': 'Nivel de Estrés', 'y': 'Frecuencia'},
-        color=stress_counts.index,
-        color_discrete_map={'Low': '#54a24b', 'Medium': '#f58518', 'High': '#e45756'}
-    )
-    fig_stress.update_xaxes(categoryorder='array', categoryarray=stress_order)
-    
-    # 4. Heart Rate (Histograma)
-    fig_hr = px.histogram(
-        df, x='Heart_Rate', marginal='box',
-        title='Distribución de Frecuencia Cardíaca (BPM)',
-        labels={'Heart_Rate': 'Frecuencia Cardíaca (BPM)', 'count': 'Frecuencia'},
-        color_discrete_sequence=['#72b7b2']
-    )
-    fig_hr.update_layout(bargap=0.05)
-    
-    # 5. BMI (Histograma)
-    fig_bmi = px.histogram(
-        df, x='BMI', marginal='box',
-        title='Distribución del Índice de Masa Corporal (BMI)',
-        labels={'BMI': 'BMI', 'count': 'Frecuencia'},
-        color_discrete_sequence=['#e45756']
-    )
-    fig_bmi.update_layout(bargap=0.05)
-
-
-    return html.Div([
-        html.Div([
-            dcc.Graph(figure=fig_coffee),
-            dcc.Graph(figure=fig_sleep)
-        ], style={'display': 'flex', 'flex-direction': 'row'}),
-        html.Div([
-            dcc.Graph(figure=fig_stress),
-        ], style={'display': 'flex', 'flex-direction': 'row'}),
-        html.Div([
-            dcc.Graph(figure=fig_hr),
-            dcc.Graph(figure=fig_bmi)
-        ], style={'display': 'flex', 'flex-direction': 'row'}),
-    ])
-
-
-def get_bivariate_plots(df):
-    """Genera gráficos de análisis bivariado."""
-    health_risk_order = ['Low Risk', 'High Risk']
-    stress_order = ['Low', 'Medium', 'High']
-    
-    # 1. Coffee Intake vs Stress Level (Boxplot - como en tu notebook)
-    fig_coffee_stress = px.box(
-        df, x='Stress_Level', y='Coffee_Intake',
-        title='Consumo de Café (Tazas) por Nivel de Estrés',
-        labels={'Stress_Level': 'Nivel de Estrés', 'Coffee_Intake': 'Consumo de Café (Tazas)'},
-        color='Stress_Level',
-        category_orders={"Stress_Level": stress_order},
-        color_discrete_map={'Low': '#54a24b', 'Medium': '#f58518', 'High': '#e45756'}
-    )
-    
-    # 2. Coffee Intake vs Sleep Hours (Scatter Plot con línea de tendencia)
-    fig_coffee_sleep = px.scatter(
-        df, x='Coffee_Intake', y='Sleep_Hours',
-        opacity=0.5, trendline='ols',
-        title='Consumo de Café vs Horas de Sueño',
-        labels={'Coffee_Intake': 'Consumo de Café (Tazas)', 'Sleep_Hours': 'Horas de Sueño'}
-    )
-    
-    # 3. BMI vs Heart Rate (Scatter Plot con línea de tendencia)
-    fig_bmi_hr = px.scatter(
-        df, x='BMI', y='Heart_Rate',
-        opacity=0.5, trendline='ols',
-        title='BMI vs Frecuencia Cardíaca',
-        labels={'BMI': 'Índice de Masa Corporal (BMI)', 'Heart_Rate': 'Frecuencia Cardíaca (BPM)'}
-    )
-    
-    # 4. Coffee Intake vs Health Risk (Violin Plot)
-    fig_coffee_risk = px.violin(
-        df, x='Health_Risk_Label', y='Coffee_Intake',
-        box=True, # Muestra un box plot interno
-        title='Distribución de Consumo de Café por Riesgo de Salud',
-        labels={'Health_Risk_Label': 'Riesgo de Salud', 'Coffee_Intake': 'Consumo de Café (Tazas)'},
-        color='Health_Risk_Label',
-        category_orders={"Health_Risk_Label": health_risk_order},
-        color_discrete_map={'Low Risk': '#4c78a8', 'High Risk': '#e45756'}
-    )
-
-    return html.Div([
-        html.Div([
-            dcc.Graph(figure=fig_coffee_stress),
-            dcc.Graph(figure=fig_coffee_sleep)
-        ], style={'display': 'flex', 'flex-direction': 'row'}),
-        html.Div([
-            dcc.Graph(figure=fig_bmi_hr),
-            dcc.Graph(figure=fig_coffee_risk)
-        ], style={'display': 'flex', 'flex-direction': 'row'}),
-    ])
-
-
-def get_geographic_plot(df):
-    """Genera el gráfico de coropletas de consumo de café por país."""
-    # Calcular el consumo promedio de café por país
-    df_country_avg = df.groupby('Country')['Coffee_Intake'].mean().reset_index()
-    df_country_avg.columns = ['Country', 'Avg_Coffee_Intake']
-    
-    # Crear el mapa de coropletas
-    fig_map = px.choropleth(
-        df_country_avg,
-        locations='Country',
-        locationmode='country names', # Plotly intentará mapear los nombres de países a códigos
-        color='Avg_Coffee_Intake',
-        hover_name='Country',
-        color_continuous_scale=px.colors.sequential.Plasma,
-        title='Consumo Promedio de Café por País (Tazas)',
-        labels={'Avg_Coffee_Intake': 'Consumo Promedio de Café (Tazas)'}
-    )
-    
-    fig_map.update_geos(
-        showcoastlines=True, coastlinecolor="Black",
-        showland=True, landcolor="#f0f0f0",
-        showocean=True, oceancolor="#99ccee",
-        showcountries=True, countrycolor="Black",
-        projection_type="natural earth"
-    )
-    fig_map.update_layout(margin={"r":0,"t":40,"l":0,"b":0}) # Ajustar márgenes
-    
-    return dcc.Graph(figure=fig_map)
-
-
-def get_model_analysis(df):
-    """Entrena el modelo de Random Forest, calcula métricas e importancia de características."""
-    
-    # 1. Preparación de datos para el modelo (SIN CAMBIOS)
-    X = df.drop(columns=['ID', 'Health_Issues', 'Caffeine_mg', 'Health_Risk', 'Health_Risk_Label'])
-    y = df['Health_Risk'] 
-
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.3, random_state=42, stratify=y)
-    
-    # 2. Preprocesador y Pipeline (SIN CAMBIOS)
-    numerical_features = X.select_dtypes(include=['int64', 'float64']).columns
-    categorical_features = X.select_dtypes(include=['object']).columns
-
-    preprocessor = ColumnTransformer(
-        transformers=[
-            ('num', StandardScaler(), numerical_features),
-            ('cat', OneHotEncoder(handle_unknown='ignore'), categorical_features)
-        ],
-        remainder='passthrough'
-    )
-    
-    model = Pipeline(steps=[
-        ('preprocessor', preprocessor),
-        ('classifier', RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=-1))
-    ])
-    
-    model.fit(X_train, y_train)
-    y_pred = model.predict(X_test)
-
-    # 3. CÁLCULO DE MÉTRICAS (Mantenemos el cálculo por si se requiere en el futuro, pero no se muestra)
-    accuracy = accuracy_score(y_test, y_pred)
-    precision = precision_score(y_test, y_pred)
-    recall = recall_score(y_test, y_pred)
-    f1 = f1_score(y_test, y_pred)
-    
-    # 4. REEMPLAZO DE LA TABLA POR LA IMAGEN
-    metrics_image = html.Img(
-        # La imagen de las métricas que subiste
-        src='/assets/model_results.jpg', 
-        alt='Tabla de Métricas del Modelo Predictivo (Accuracy, Precision, Recall, F1)',
-        style={
-            'width': '100%',            # Ocupa todo el ancho disponible del contenedor
-            'maxWidth': '450px',        # Limita el ancho máximo para que no se estire demasiado
-            'height': 'auto',
-            'display': 'block',
-            'margin': '20px auto',      # Centra la imagen horizontalmente
-            'borderRadius': '8px',
-            'boxShadow': '0 4px 8px rgba(0,0,0,0.1)'
-        }
-    )
-    
-    # 5. Importancia de Características (Feature Importance) (SIN CAMBIOS)
-    feature_importances = model.named_steps['classifier'].feature_importances_
-    
-    ohe_feature_names = model.named_steps['preprocessor'].named_transformers_['cat'].get_feature_names_out(categorical_features)
-    final_feature_names = list(numerical_features) + list(ohe_feature_names)
-    
-    importance_df = pd.DataFrame({
-        'Feature': final_feature_names,
-        'Importance': feature_importances
-    }).sort_values(by='Importance', ascending=False)
-
-    # Gráfico de Importancia de Características (SIN CAMBIOS)
-    fig_importance = px.bar(
-        importance_df.head(15), x='Importance', y='Feature', orientation='h',
-        title='Top 15 Importancia de Características para Riesgo de Salud',
-        labels={'Importance': 'Importancia (Gini)', 'Feature': 'Característica'},
-        color='Importance',
-        color_continuous_scale=px.colors.sequential.Teal
-    )
-    fig_importance.update_layout(yaxis={'categoryorder':'total ascending'})
-
-    return html.Div([
-        html.H3("Métricas de Rendimiento"),
-        # Insertamos la imagen en lugar del dcc.Markdown de la tabla
-        metrics_image, 
-        html.Br(),
-        html.H3("Importancia de Características"),
-        dcc.Graph(figure=fig_importance)
-    ])
-
-
-# Pre-calcular los componentes para el layout (buena práctica en Dash)
-UNIVARIATE_GRAPHS = get_univariate_plots(df_tratado)
-BIVARIATE_GRAPHS = get_bivariate_plots(df_tratado)
-GEOGRAPHIC_MAP = get_geographic_plot(df_tratado)
-MODEL_RESULTS_DIV = get_model_analysis(df_tratado)
-
-
-def layout():
-    return html.Div(
-        style={"padding": "40px"},
-        children=[
-
-            html.H1("Resultados y Análisis de Datos", style={"textAlign": "center"}),
-            html.Hr(),
-            html.Br(),
-
-            # --------------------------------------------
-            # USO DE dcc.Tabs PARA SECCIONES
-            # --------------------------------------------
-            dcc.Tabs(id="results-tabs", value='tab-1', children=[
-                
-                # Pestaña 1: Análisis Univariado
-                dcc.Tab(label='1. Análisis Univariado', value='tab-1', children=[
-                    html.Div(style={'padding': '20px'}, children=[
-                        dcc.Markdown("""
-                        En esta sección se presentan las **distribuciones de variables clave** del dataset,
-                        como: Consumo de café, Horas de sueño, Niveles de estrés, Frecuencia cardíaca e Índice de masa corporal (BMI).
-                        """),
-                        html.Hr(),
-                        html.Div(children=UNIVARIATE_GRAPHS, id="univariado-graficos"),
-                    ])
-                ]),
-
-                # Pestaña 2: Análisis Bivariado
-                dcc.Tab(label='2. Análisis Bivariado', value='tab-2', children=[
-                    html.Div(style={'padding': '20px'}, children=[
-                        dcc.Markdown("""
-                        Se exploran **relaciones y correlaciones** entre variables, incluyendo:
-                        Coffee Intake vs Stress Level, Coffee Intake vs Sleep Duration, BMI vs Heart Rate, y Coffee Intake vs Health Risk.
-                        """),
-                        html.Hr(),
-                        html.Div(children=BIVARIATE_GRAPHS, id="bivariado-graficos"),
-                    ])
-                ]),
-                
-                # Pestaña 3: Visualización Geográfica
-                dcc.Tab(label='3. Mapa Geográfico', value='tab-3', children=[
-                    html.Div(style={'padding': '20px'}, children=[
-                        dcc.Markdown("""
-                        Mapa mundial que muestra la **distribución geográfica del Consumo Promedio de Café** por país.
-                        (Nota: La granularidad depende de la representación de países en Plotly).
-                        """),
-                        html.Hr(),
-                        html.Div(children=GEOGRAPHIC_MAP, id="mapa-geografico"),
-                    ])
-                ]),
-
-                # Pestaña 4: Modelo Predictivo
-                dcc.Tab(label='4. Modelo Predictivo', value='tab-4', children=[
-                    html.Div(style={'padding': '20px'}, children=[
-                        dcc.Markdown("""
-                        Resultados del **Modelo Random Forest** entrenado para predecir el Riesgo de Salud.
-                        Se muestran métricas de rendimiento y la importancia de las características.
-                        """),
-                        html.Hr(),
-                        html.Div(children=MODEL_RESULTS_DIV, id="modelo-predictivo"),
-                    ])
-                ]),
-            ]),
-
-            html.Br(),
-            html.P("El dashboard integra los resultados visuales y analíticos más importantes del proyecto.")
-        ]
-    )
-
-def get_layout():
+import dash
+from dash import html, dcc, dash_table, Input, Output, State, MATCH
+from dash.dash_table.Format import Format, Scheme
+import json
+import logging
+import pandas as pd
+import warnings
+from functools import lru_cache
+
+# --- Librerías para Plotly y el Modelo Predictivo ---
+# scikit-learn y scipy se importan de forma perezosa en los módulos que las usan,
+# para no encarecer el arranque de cada worker (ver perfil_arranque.py).
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+import ingesta
+from cache_compartida import plain_figures, shared_cache
+from correlacion import CORRELATION_GROUPS, CoMoments, GroupedCoMoments
+from datos import DATA_PATH
+from densidad import density_figure, ranges_from_relayout
+from estadistica import ALPHA, CONFIDENCE, load_or_test
+from explicaciones import load_or_explain
+from geometria import country_geojson, iso_codes
+from indices import FILTER_COLUMNS, filter_key
+from modelo import load_or_train
+from respuestas import register_payload
+from resumen import column_summary, distribution_figure, histogram_figure
+from simulador import whatif_panel
+from trabajos import job_panel, register_job
+from validacion import METRIC_NAMES, load_or_validate
+# --------------------------------------------------------------------
+
+warnings.filterwarnings("ignore")
+logger = logging.getLogger(__name__)
+
+dash.register_page(__name__, path="/resultados", name="Resultados y Análisis", order=6) # Nombre claro para la navegación
+
+# --- LECTURA Y PREPARACIÓN DE DATOS ---
+# Carga tipada (categóricas, int8/float32) con caché Arrow mapeada en memoria (datos.py),
+# Health_Risk vectorizado (puntuacion.py), índice de bitmaps por valor de cada columna
+# de filtro (indices.py) y cubo de agregados para los group-by (cubo.py).
+#
+# Todo vive en una instantánea inmutable de ingesta.py: los lotes nuevos que llegan a
+# data/incoming (o por POST /api/ingest) publican una instantánea nueva sin reiniciar la
+# app. Cada callback toma ingesta.current() una sola vez y trabaja sobre ella.
+ingesta.initialize(DATA_PATH)
+ingesta.start_watcher()
+
+FILTER_LABELS = {
+    'Country': 'País',
+    'Gender': 'Género',
+    'Occupation': 'Ocupación',
+    'Stress_Level': 'Nivel de Estrés',
+    'Sleep_Quality': 'Calidad del Sueño',
+}
+FILTER_STATES = [State(f'filter-{column}', 'value') for column in FILTER_COLUMNS]
+FILTER_INPUTS = [Input(f'filter-{column}', 'value') for column in FILTER_COLUMNS]
+
+
+def selected_filters(values):
+    """{columna: [valores]} a partir de los valores de los dropdowns de la barra de filtros."""
+    return dict(zip(FILTER_COLUMNS, values))
+
+# --- FUNCIONES DE GENERACIÓN DE GRÁFICOS CON PLOTLY (Mantenidas) ---
+# ... Las funciones get_univariate_plots, get_bivariate_plots, get_geographic_plot, get_model_analysis
+#     se mantienen IGUAL, ya que devuelven los bloques de html.Div con los gráficos.
+# (Por brevedad, omito el código de estas funciones en la respuesta, asumiendo que ya lo tienes.)
+
+# --- FUNCIONES DE GENERACIÓN DE GRÁFICOS CON PLOTLY ---
+def get_univariate_plots(df, histograms=None):
+    """Genera gráficos de análisis univariado.
+
+    Los histogramas se construyen con los resúmenes precalculados de resumen.py
+    (bins, cuartiles, bigotes), no con las filas originales. Sin filtros se usan
+    los histogramas acumulados de la instantánea (`histograms`).
+    """
+    # 1. Coffee Intake (Histograma con boxplot marginal)
+    fig_coffee = histogram_figure(
+        column_summary(df['Coffee_Intake'], histogram=(histograms or {}).get('Coffee_Intake')),
+        title='Distribución de Consumo de Café (Tazas)', label='Consumo de Café (Tazas)', color='#4c78a8'
+    )
+
+    # 2. Sleep Hours (Histograma)
+    fig_sleep = histogram_figure(
+        column_summary(df['Sleep_Hours'], histogram=(histograms or {}).get('Sleep_Hours')),
+        title='Distribución de Horas de Sueño', label='Horas de Sueño', color='#f58518'
+    )
+    
+    # 3. Stress Level (Gráfico de barras)
+    stress_order = ['Low', 'Medium', 'High']
+    stress_counts = df['Stress_Level'].value_counts().reindex(stress_order)
+    
+    fig_stress = px.bar(
+        stress_counts, x=stress_counts.index, y=stress_counts.values,
+        title='Distribución de Nivel de Estrés',
+        labels={'x': 'Nivel de Estrés', 'y': 'Frecuencia'},
+        color=stress_counts.index,
+        color_discrete_map={'Low': '#54a24b', 'Medium': '#f58518', 'High': '#e45756'}
+    )
+    fig_stress.update_xaxes(categoryorder='array', categoryarray=stress_order)
+    
+    # 4. Heart Rate (Histograma)
+    fig_hr = histogram_figure(
+        column_summary(df['Heart_Rate'], histogram=(histograms or {}).get('Heart_Rate')),
+        title='Distribución de Frecuencia Cardíaca (BPM)', label='Frecuencia Cardíaca (BPM)', color='#72b7b2'
+    )
+    
+    # 5. BMI (Histograma)
+    fig_bmi = histogram_figure(
+        column_summary(df['BMI'], histogram=(histograms or {}).get('BMI')),
+        title='Distribución del Índice de Masa Corporal (BMI)', label='BMI', color='#e45756'
+    )
+
+
+    return html.Div([
+        html.Div([
+            dcc.Graph(figure=fig_coffee),
+            dcc.Graph(figure=fig_sleep)
+        ], style={'display': 'flex', 'flex-direction': 'row'}),
+        html.Div([
+            dcc.Graph(figure=fig_stress),
+        ], style={'display': 'flex', 'flex-direction': 'row'}),
+        html.Div([
+            dcc.Graph(figure=fig_hr),
+            dcc.Graph(figure=fig_bmi)
+        ], style={'display': 'flex', 'flex-direction': 'row'}),
+    ])
+
+
+# Dispersiones que se agregan como densidad y se vuelven a agrupar al hacer zoom
+DENSITY_PLOTS = {
+    'coffee-sleep': dict(
+        x='Coffee_Intake', y='Sleep_Hours',
+        title='Consumo de Café vs Horas de Sueño',
+        labels={'Coffee_Intake': 'Consumo de Café (Tazas)', 'Sleep_Hours': 'Horas de Sueño'}
+    ),
+    'bmi-hr': dict(
+        x='BMI', y='Heart_Rate',
+        title='BMI vs Frecuencia Cardíaca',
+        labels={'BMI': 'Índice de Masa Corporal (BMI)', 'Heart_Rate': 'Frecuencia Cardíaca (BPM)'}
+    ),
+}
+
+
+def get_bivariate_plots(df, correlation=None):
+    """Genera gráficos de análisis bivariado (y agrega el bloque de correlaciones si se pasa)."""
+    health_risk_order = ['Low Risk', 'High Risk']
+    stress_order = ['Low', 'Medium', 'High']
+    
+    # 1. Coffee Intake vs Stress Level (Boxplot - como en tu notebook)
+    #    Cuartiles, bigotes y una muestra de atípicos por grupo (resumen.py), no cada fila
+    fig_coffee_stress = distribution_figure(
+        [(level, df.loc[df['Stress_Level'] == level, 'Coffee_Intake']) for level in stress_order],
+        title='Consumo de Café (Tazas) por Nivel de Estrés',
+        x_label='Nivel de Estrés', y_label='Consumo de Café (Tazas)',
+        colors={'Low': '#54a24b', 'Medium': '#f58518', 'High': '#e45756'},
+    )
+    
+    # 2-3. Dispersiones con línea de tendencia: densidad agregada en el servidor
+    #      (ver DENSITY_PLOTS y densidad.py)
+    fig_coffee_sleep = density_figure(df, **DENSITY_PLOTS['coffee-sleep'])
+    fig_bmi_hr = density_figure(df, **DENSITY_PLOTS['bmi-hr'])
+    
+    # 4. Coffee Intake vs Health Risk (Violin Plot con box plot interno)
+    #    Densidad por kernel evaluada en una grilla fija (resumen.py)
+    fig_coffee_risk = distribution_figure(
+        [(label, df.loc[df['Health_Risk_Label'] == label, 'Coffee_Intake']) for label in health_risk_order],
+        title='Distribución de Consumo de Café por Riesgo de Salud',
+        x_label='Riesgo de Salud', y_label='Consumo de Café (Tazas)',
+        colors={'Low Risk': '#4c78a8', 'High Risk': '#e45756'}, violin=True,
+    )
+
+    return html.Div([
+        html.Div([
+            dcc.Graph(figure=fig_coffee_stress),
+            dcc.Graph(id={'type': 'density-scatter', 'index': 'coffee-sleep'}, figure=fig_coffee_sleep)
+        ], style={'display': 'flex', 'flex-direction': 'row'}),
+        html.Div([
+            dcc.Graph(id={'type': 'density-scatter', 'index': 'bmi-hr'}, figure=fig_bmi_hr),
+            dcc.Graph(figure=fig_coffee_risk)
+        ], style={'display': 'flex', 'flex-direction': 'row'}),
+        *([correlation] if correlation is not None else []),
+    ])
+
+
+def correlation_panel(snapshot, filters):
+    """Heatmap de correlaciones con un selector de grupo (todos los registros, un país o un nivel de estrés)."""
+    options = [{'label': 'Todos los registros', 'value': 'todos'}] + [
+        {'label': f"{FILTER_LABELS[dimension]}: {value}", 'value': f"{dimension}={value}"}
+        for dimension in CORRELATION_GROUPS
+        # Mismo orden que en la barra de filtros (p. ej. Low, Medium, High)
+        for value in map(str, snapshot.values(dimension))
+        if value in snapshot.correlations.groups.get(dimension, {})
+    ]
+    return html.Div([
+        html.H4("Matriz de Correlación"),
+        dcc.Dropdown(id='correlation-group', options=options, value='todos', clearable=False,
+                     style={'maxWidth': '400px'}),
+        dcc.Graph(id='correlation-heatmap', figure=build_correlation(snapshot, filters, 'todos')),
+    ])
+
+
+@dash.callback(
+    Output('correlation-heatmap', 'figure'),
+    Input('correlation-group', 'value'),
+    *FILTER_STATES,
+    prevent_initial_call=True,
+)
+def update_correlation(group, *filter_values):
+    return build_correlation(ingesta.current(), filter_key(selected_filters(filter_values)), group or 'todos')
+
+
+@shared_cache()
+def build_correlation(snapshot, filters, group):
+    """Heatmap de Pearson de un grupo ('todos' o 'Dimensión=valor').
+
+    Sin filtros sale de los co-momentos acumulados de la instantánea, en
+    O(columnas²) sin importar la cantidad de filas; con filtros se acumulan solo
+    las filas seleccionadas.
+    """
+    correlations = snapshot.correlations
+    if filters:
+        correlations = GroupedCoMoments.from_frame(snapshot.select(dict(filters)))
+    dimension, value = group.split('=', 1) if group != 'todos' else (None, None)
+    if dimension is None:
+        moments, label = correlations.total, 'todos los registros'
+    else:
+        moments = correlations.groups.get(dimension, {}).get(value) or CoMoments.empty(len(correlations.columns))
+        label = f"{FILTER_LABELS[dimension]}: {value}"
+
+    fig = px.imshow(
+        moments.correlation(), x=correlations.columns, y=correlations.columns,
+        zmin=-1, zmax=1, color_continuous_scale='RdBu_r', text_auto='.2f',
+        labels={'color': 'Correlación'},
+        title=f"Correlación de Pearson ({label}, {moments.n:,} registros)",
+    )
+    fig.update_layout(height=550)
+    return fig
+
+
+@dash.callback(
+    Output({'type': 'density-scatter', 'index': MATCH}, 'figure'),
+    Input({'type': 'density-scatter', 'index': MATCH}, 'relayoutData'),
+    State({'type': 'density-scatter', 'index': MATCH}, 'id'),
+    *FILTER_STATES,
+    prevent_initial_call=True,
+)
+def rebin_density(relayout_data, graph_id, *filter_values):
+    """Vuelve a agrupar solo el rango visible cuando el usuario hace zoom o lo restablece."""
+    ranges = ranges_from_relayout(relayout_data)
+    if ranges is None:
+        return dash.no_update
+    x_range, y_range = ranges
+    filters = filter_key(selected_filters(filter_values))
+    return build_density(ingesta.current(), graph_id['index'], filters, x_range, y_range)
+
+
+@shared_cache()
+def build_density(snapshot, plot_id, filters, x_range, y_range):
+    """Figura de densidad de un rango visible (compartida entre workers; ver cache_compartida.py)."""
+    rows = snapshot.select(dict(filters))
+    return density_figure(rows, **DENSITY_PLOTS[plot_id], x_range=x_range, y_range=y_range)
+
+
+def get_geographic_plot(cube, filters=None):
+    """Genera el gráfico de coropletas de consumo de café por país y la tabla resumen.
+
+    Ambos se calculan agregando el cubo precalculado (ver cubo.py), sin recorrer las filas.
+    """
+    # Calcular el consumo promedio de café por país (roll-up del cubo)
+    country_stats = cube.rollup('Country', filters, ['Coffee_Intake', 'Sleep_Hours', 'Health_Risk'])
+    countries = country_stats.index.astype(str)
+    codes = iso_codes(countries)
+    unmatched = [country for country, code in zip(countries, codes) if code is None]
+    if unmatched:
+        logger.warning("Países sin geometría (revisar COUNTRY_ALIASES en geometria.py): %s", unmatched)
+    matched = [code is not None for code in codes]
+
+    # Mapa de coropletas con la geometría precalculada (geometria.py): todos los países
+    # en gris de fondo y encima los del dataset, enlazados por código ISO alfa-3
+    geojson = country_geojson()
+    all_codes = [feature['id'] for feature in geojson['features']]
+    # La capa de datos lleva solo sus países, para no enviar la geometría completa dos veces
+    data_geojson = {'type': 'FeatureCollection', 'features': [f for f in geojson['features'] if f['id'] in set(codes)]}
+    fig_map = go.Figure([
+        go.Choropleth(
+            geojson=geojson, featureidkey='id', locations=all_codes, z=[0] * len(all_codes),
+            colorscale=[[0, '#f0f0f0'], [1, '#f0f0f0']], showscale=False,
+            marker_line_color='#999999', marker_line_width=0.4, hoverinfo='skip',
+        ),
+        go.Choropleth(
+            geojson=data_geojson, featureidkey='id',
+            locations=[code for code in codes if code is not None],
+            z=country_stats['Coffee_Intake_mean'][matched].round(2),
+            text=countries[matched], hovertemplate='<b>%{text}</b><br>Consumo Promedio de Café: %{z:.2f} tazas<extra></extra>',
+            colorscale=px.colors.sequential.Plasma, marker_line_color='black', marker_line_width=0.6,
+            colorbar={'title': 'Consumo Promedio<br>de Café (Tazas)'},
+        ),
+    ])
+    # Sin capas base de Plotly (costas, océanos): se descargarían de su CDN
+    fig_map.update_geos(visible=False, projection_type="natural earth", lataxis_range=[-60, 85])
+    fig_map.update_layout(
+        title='Consumo Promedio de Café por País (Tazas)',
+        margin={"r":0,"t":40,"l":0,"b":0},
+    )
+
+    # Tabla resumen por país (también desde el cubo)
+    summary = pd.DataFrame({
+        'País': country_stats.index.astype(str),
+        'Registros': country_stats['count'],
+        'Café promedio (tazas)': country_stats['Coffee_Intake_mean'].round(2),
+        'Desv. est. café': country_stats['Coffee_Intake_var'].pow(0.5).round(2),
+        'Sueño promedio (h)': country_stats['Sleep_Hours_mean'].round(2),
+        '% Alto riesgo': (country_stats['Health_Risk_mean'] * 100).round(1),
+    }).sort_values('Café promedio (tazas)', ascending=False)
+
+    summary_table = dash_table.DataTable(
+        data=summary.to_dict('records'),
+        columns=[{'name': column, 'id': column} for column in summary.columns],
+        sort_action='native',
+        style_table={'overflowX': 'auto', 'marginTop': '20px'},
+        style_cell={'textAlign': 'center', 'padding': '6px'},
+        style_header={'fontWeight': 'bold', 'backgroundColor': '#f8f9fa'},
+    )
+    
+    return html.Div([dcc.Graph(figure=fig_map), summary_table])
+
+
+def get_model_analysis(df):
+    """Obtiene el modelo Random Forest del almacén de artefactos y muestra métricas e importancia de características."""
+    
+    # 1-3. Entrenamiento (una sola vez, compartido entre workers) y métricas
+    artifact = load_or_train(df)
+    metrics = artifact['metrics']
+
+    # 4. Métricas por validación cruzada (una vez por versión del modelo), con la partición de prueba al lado
+    validation = load_or_validate(df, artifact)
+    level = f"{validation['confidence']:.0%}"
+    metrics_table = dash_table.DataTable(
+        columns=[
+            {'name': 'Métrica', 'id': 'metric'},
+            {'name': f"Media ({validation['folds']} folds)", 'id': 'mean'},
+            {'name': f'IC {level}', 'id': 'ci'},
+            {'name': 'Desv. estándar', 'id': 'std'},
+            {'name': 'Conjunto de prueba', 'id': 'test'},
+        ],
+        data=[
+            {
+                'metric': label,
+                'mean': f"{stats['mean']:.4f}",
+                'ci': f"[{stats['low']:.4f}, {stats['high']:.4f}]",
+                'std': f"{stats['std']:.4f}",
+                'test': f"{metrics[name]:.4f}" if name in metrics else '—',
+            }
+            for name, label in METRIC_NAMES.items()
+            for stats in [validation['summary'][name]]
+        ],
+        sort_action='native',
+        style_table={'overflowX': 'auto', 'maxWidth': '800px', 'margin': '20px auto'},
+        style_cell={'textAlign': 'center', 'padding': '6px'},
+        style_header={'fontWeight': 'bold', 'backgroundColor': '#f8f9fa'},
+    )
+
+    labels = ['Bajo', 'Alto']
+    fig_confusion = px.imshow(
+        validation['confusion_matrix'], x=labels, y=labels, text_auto=True,
+        color_continuous_scale=px.colors.sequential.Teal,
+        labels={'x': 'Riesgo predicho', 'y': 'Riesgo real', 'color': 'Registros'},
+        title='Matriz de Confusión (predicciones out-of-fold)',
+    )
+
+    fig_curves = make_subplots(rows=1, cols=2, subplot_titles=(
+        f"Curva ROC (AUC {validation['summary']['roc_auc']['mean']:.3f})", 'Curva Precisión-Recall'))
+    fpr, tpr = validation['roc']
+    recall, precision = validation['pr']
+    fig_curves.add_trace(go.Scatter(x=fpr, y=tpr, mode='lines', name='ROC'), row=1, col=1)
+    fig_curves.add_trace(go.Scatter(x=[0, 1], y=[0, 1], mode='lines', name='Azar',
+                                    line={'dash': 'dash', 'color': 'grey'}), row=1, col=1)
+    fig_curves.add_trace(go.Scatter(x=recall, y=precision, mode='lines', name='Precisión-Recall'), row=1, col=2)
+    fig_curves.add_trace(go.Scatter(x=[0, 1], y=[validation['positive_rate']] * 2, mode='lines',
+                                    name='Tasa base', line={'dash': 'dash', 'color': 'grey'}), row=1, col=2)
+    fig_curves.update_xaxes(title_text='Tasa de falsos positivos', row=1, col=1)
+    fig_curves.update_yaxes(title_text='Tasa de verdaderos positivos', row=1, col=1)
+    fig_curves.update_xaxes(title_text='Recall', row=1, col=2)
+    fig_curves.update_yaxes(title_text='Precisión', row=1, col=2)
+
+    # 5. Importancia por permutación agrupada por columna original (una vez por versión del modelo)
+    explanations = load_or_explain(df, artifact)
+    importance_df = explanations['permutation_importance']
+
+    fig_importance = px.bar(
+        importance_df, x='Importance', y='Feature', orientation='h', error_x='Std',
+        title='Importancia por Permutación de cada Característica para Riesgo de Salud',
+        labels={'Importance': 'Caída de accuracy al permutar', 'Feature': 'Característica'},
+        color='Importance',
+        color_continuous_scale=px.colors.sequential.Teal
+    )
+    fig_importance.update_layout(yaxis={'categoryorder':'total ascending'})
+
+    examples = explanations['examples']
+    example_options = [
+        {'label': f"ID {example['id']}: {example['probability']:.0%} de Riesgo Alto "
+                   f"(real: {'Alto' if example['actual'] else 'Bajo'})",
+         'value': position}
+        for position, example in enumerate(examples)
+    ]
+
+    # 6. Reporte de la búsqueda de hiperparámetros (solo si el modelo vigente salió de entrenamiento.py)
+    search_section = []
+    if 'search' in artifact:
+        search = artifact['search']
+        report = pd.DataFrame(search['report'])
+        report['Hiperparámetros'] = report['params'].map(str)
+        fig_search = px.scatter(
+            report, x='seconds', y='oob_accuracy', color=report['round'].map(lambda r: f"Ronda {r + 1}"),
+            size='rows', hover_data=['Hiperparámetros', 'trees', 'rows'],
+            title='Búsqueda por halving sucesivo: tiempo vs. accuracy (OOB)',
+            labels={'seconds': 'Tiempo de entrenamiento (s)', 'oob_accuracy': 'Accuracy OOB',
+                    'color': 'Ronda', 'trees': 'Árboles', 'rows': 'Filas'},
+        )
+        search_section = [
+            html.Br(),
+            html.H3("Búsqueda de Hiperparámetros"),
+            dcc.Markdown(f"""
+            Modelo ganador: `{search['best_params']}` con **{search['trees']} árboles**
+            (el bosque crece hasta que el accuracy out-of-bag deja de mejorar).
+            Búsqueda completa en {search['seconds']:.1f} s con {search['cores']} núcleo(s).
+            """),
+            dcc.Graph(figure=fig_search),
+        ]
+
+    return html.Div([
+        html.H3("Métricas de Rendimiento"),
+        dcc.Markdown(f"""
+        Validación cruzada estratificada de {validation['folds']} folds sobre el dataset completo, con los
+        mismos hiperparámetros del modelo vigente; la última columna es la partición de prueba del entrenamiento.
+        """),
+        metrics_table,
+        dcc.Graph(figure=fig_confusion),
+        dcc.Graph(figure=fig_curves),
+        html.Br(),
+        html.H3("Importancia de Características"),
+        dcc.Markdown(f"""
+        Caída del accuracy en la partición de prueba al permutar cada columna original (sus columnas
+        one-hot se permutan juntas), promedio y desviación de {explanations['repeats']} repeticiones. A diferencia
+        de la importancia Gini, no favorece a las columnas con muchas categorías como Country u Occupation.
+        """),
+        dcc.Graph(figure=fig_importance),
+        html.Br(),
+        html.H3("Explicación de Predicciones Individuales"),
+        dcc.Markdown(f"""
+        Contribución de cada característica a la probabilidad de un registro de prueba: su probabilidad
+        menos la probabilidad promedio al reemplazar esa característica por la de {explanations['background_rows']}
+        registros de referencia.
+        """),
+        dcc.Store(id='explicacion-ejemplos', data=examples),
+        dcc.Dropdown(id='explicacion-registro', options=example_options, value=0, clearable=False,
+                     style={'maxWidth': '500px'}),
+        dcc.Graph(id='explicacion-contribuciones'),
+        *search_section,
+        html.Br(),
+        html.H3("Simulador de Riesgo (¿qué pasaría si?)"),
+        dcc.Markdown("""
+        Ajuste los valores para ver la **probabilidad estimada de Riesgo Alto** y cuánto aporta cada
+        entrada respecto al valor típico del dataset.
+        """),
+        whatif_panel(),
+    ])
+
+
+def prepare_model_analysis(progress, version):
+    """Trabajo en segundo plano: entrena (o carga) el modelo, lo valida y arma el contenido de la pestaña."""
+    # Los datos de la versión pedida (la clave del trabajo), no los que haya en este proceso
+    snapshot = ingesta.snapshot_at(version)
+    progress(0.05, "Cargando o entrenando el modelo")
+    artifact = load_or_train(snapshot.frame)
+    progress(0.3, "Validación cruzada")
+    load_or_validate(snapshot.frame, artifact)
+    progress(0.6, "Importancia por permutación y explicaciones")
+    load_or_explain(snapshot.frame, artifact)
+    progress(0.9, "Generando gráficos")
+    # Figuras como dict: el resultado se guarda con pickle y así se lee rápido en el worker web
+    return plain_figures(get_model_analysis(snapshot.frame))
+
+
+@dash.callback(
+    Output('explicacion-contribuciones', 'figure'),
+    Input('explicacion-registro', 'value'),
+    State('explicacion-ejemplos', 'data'),
+)
+def update_explanation(position, examples):
+    if position is None or not examples:
+        return dash.no_update
+    example = examples[position]
+    ordered = sorted(example['contributions'].items(), key=lambda item: abs(item[1]))
+    fig = go.Figure(go.Bar(
+        x=[value * 100 for _, value in ordered],
+        y=[f"{column} = {example['values'][column]}" for column, _ in ordered], orientation='h',
+        marker_color=['#e45756' if value > 0 else '#4c78a8' for _, value in ordered],
+        hovertemplate='%{y}: %{x:+.1f} p.p.<extra></extra>',
+    ))
+    fig.update_layout(
+        title=f"Registro {example['id']}: {example['probability']:.1%} de probabilidad de Riesgo Alto",
+        xaxis_title='Puntos porcentuales', height=460, margin={'l': 10, 'r': 10},
+    )
+    return fig
+
+
+# El entrenamiento, la validación cruzada, las explicaciones y los gráficos se generan en el pool de
+# trabajos (trabajos.py); la pestaña muestra el progreso y luego el contenido listo.
+register_job('model-analysis', prepare_model_analysis, render=lambda content: content)
+
+
+def get_statistical_tests(tests):
+    """Tabla ordenable con todas las pruebas de hipótesis, su tamaño de efecto e intervalos bootstrap."""
+    level = f"{CONFIDENCE:.0%}"
+    decimals = Format(precision=4, scheme=Scheme.fixed)
+    p_format = Format(precision=2, scheme=Scheme.exponent)
+    columns = [
+        ('Variable A', 'Variable A', None), ('Variable B', 'Variable B', None), ('Prueba', 'Prueba', None),
+        ('Estadístico', 'Estadístico', Format(precision=2, scheme=Scheme.fixed)),
+        ('p', 'p', p_format), ('p Holm', 'p Holm', p_format), ('q BH', 'q BH', p_format),
+        ('Medida de efecto', 'Medida de efecto', None), ('Efecto', 'Efecto', decimals),
+        ('Efecto inf.', f'Efecto IC {level} inf.', decimals), ('Efecto sup.', f'Efecto IC {level} sup.', decimals),
+        ('Diferencia', 'Dif. de medias (alto - bajo)', decimals),
+        ('Diferencia inf.', f'Dif. IC {level} inf.', decimals), ('Diferencia sup.', f'Dif. IC {level} sup.', decimals),
+        ('n', 'n', None), ('Significativa', f'Significativa (Holm, α={ALPHA})', None),
+    ]
+    records = tests.assign(Significativa=tests['Significativa'].map({True: 'Sí', False: 'No'}))
+    table = dash_table.DataTable(
+        columns=[
+            {'name': label, 'id': column, 'type': 'numeric', 'format': fmt} if fmt is not None
+            else {'name': label, 'id': column}
+            for column, label, fmt in columns
+        ],
+        data=records.to_dict('records'),
+        sort_action='native',
+        filter_action='native',
+        page_size=15,
+        style_table={'overflowX': 'auto'},
+        style_cell={'textAlign': 'center', 'padding': '6px', 'minWidth': '90px'},
+        style_header={'fontWeight': 'bold', 'backgroundColor': '#f8f9fa', 'whiteSpace': 'normal'},
+        style_data_conditional=[
+            {'if': {'filter_query': '{Significativa} = "Sí"'}, 'backgroundColor': '#e8f6f3'},
+        ],
+    )
+
+    coffee = tests[(tests['Variable A'] == 'Coffee_Intake') & (tests['Variable B'] == 'Health_Risk')].iloc[0]
+    return html.Div([
+        dcc.Markdown(f"""
+        **{int(tests['Significativa'].sum())} de {len(tests)}** pruebas son significativas tras la corrección de
+        Holm (α = {ALPHA}); la columna q BH es la corrección de Benjamini-Hochberg. Consumo de café vs. riesgo:
+        {coffee['Prueba']}, p Holm = {coffee['p Holm']:.2g}, {coffee['Medida de efecto'].lower()} =
+        {coffee['Efecto']:.3f} (IC {level} [{coffee['Efecto inf.']:.3f}, {coffee['Efecto sup.']:.3f}]); las personas con
+        Riesgo Alto toman en promedio {coffee['Diferencia']:.2f} tazas más
+        (IC {level} [{coffee['Diferencia inf.']:.2f}, {coffee['Diferencia sup.']:.2f}]).
+        """),
+        table,
+    ])
+
+
+def prepare_statistical_tests(progress, version):
+    """Trabajo en segundo plano: corre (o lee del almacén) las pruebas de la versión de datos `version`."""
+    snapshot = ingesta.snapshot_at(version)
+    progress(0.05, "Pruebas de hipótesis e intervalos bootstrap")
+    tests = load_or_test(snapshot.frame, snapshot.version)
+    progress(0.9, "Generando la tabla")
+    return get_statistical_tests(tests)
+
+
+register_job('statistical-tests', prepare_statistical_tests, render=lambda content: content)
+
+
+# --- RENDERIZADO PEREZOSO POR PESTAÑA ---
+# Cada pestaña se construye solo cuando el usuario la selecciona y se guarda en
+# una caché acotada con clave (pestaña, versión de datos).
+TAB_CACHE_SIZE = 8
+
+# Cada constructor recibe (instantánea, filas seleccionadas, filtros); los que trabajan
+# sobre agregados usan los filtros directamente contra el cubo o los histogramas.
+TAB_SECTIONS = {
+    # Pestaña 1: Análisis Univariado
+    'tab-1': ("univariado-graficos", lambda snapshot, rows, filters: get_univariate_plots(rows, None if filters else snapshot.histograms), """
+                        En esta sección se presentan las **distribuciones de variables clave** del dataset,
+                        como: Consumo de café, Horas de sueño, Niveles de estrés, Frecuencia cardíaca e Índice de masa corporal (BMI).
+                        """),
+    # Pestaña 2: Análisis Bivariado
+    'tab-2': ("bivariado-graficos", lambda snapshot, rows, filters: get_bivariate_plots(rows, correlation_panel(snapshot, filter_key(filters))), """
+                        Se exploran **relaciones y correlaciones** entre variables, incluyendo:
+                        Coffee Intake vs Stress Level, Coffee Intake vs Sleep Duration, BMI vs Heart Rate, y Coffee Intake vs Health Risk,
+                        y la matriz de correlación de las variables numéricas, general o por país y nivel de estrés.
+                        """),
+    # Pestaña 3: Visualización Geográfica
+    'tab-3': ("mapa-geografico", lambda snapshot, rows, filters: get_geographic_plot(snapshot.cube, filters), """
+                        Mapa mundial que muestra la **distribución geográfica del Consumo Promedio de Café** por país.
+                        (Geometría de Natural Earth 1:110m incluida en la aplicación; no requiere conexión).
+                        """),
+    # Pestaña 4: Modelo Predictivo
+    'tab-4': ("modelo-predictivo", lambda snapshot, rows, filters: job_panel('modelo', 'model-analysis', snapshot.version), """
+                        Resultados del **Modelo Random Forest** entrenado para predecir el Riesgo de Salud.
+                        Se muestran métricas de rendimiento, la importancia de las características, explicaciones de predicciones individuales y un simulador interactivo.
+                        """),
+    # Pestaña 5: Pruebas Estadísticas
+    'tab-5': ("pruebas-estadisticas", lambda snapshot, rows, filters: job_panel('estadistica', 'statistical-tests', snapshot.version), """
+                        **Pruebas de hipótesis** para cada variable numérica contra el Riesgo de Salud y para cada par de
+                        variables categóricas, con tamaños de efecto, intervalos de confianza bootstrap y corrección por
+                        comparaciones múltiples. Haga clic en los encabezados para ordenar.
+                        """),
+}
+
+
+# El modelo y las pruebas estadísticas usan siempre el dataset completo; la barra de filtros no los afecta.
+UNFILTERED_TABS = {'tab-4', 'tab-5'}
+
+
+@lru_cache(maxsize=TAB_CACHE_SIZE)
+def build_tab_content(tab, snapshot, filters=()):
+    """Construye (y cachea) el contenido de una pestaña para una instantánea de los datos y un filtro."""
+    container_id, builder, description = TAB_SECTIONS[tab]
+    rows = snapshot.select(dict(filters))
+
+    if len(rows) == 0:
+        content = html.P("Ningún registro coincide con los filtros seleccionados.")
+    else:
+        content = builder(snapshot, rows, dict(filters))
+    return html.Div(style={'padding': '20px'}, children=[
+        dcc.Markdown(description),
+        html.Hr(),
+        html.Div(children=content, id=container_id),
+    ])
+
+
+def tab_payload_key(args):
+    """(pestaña, filtro canónico) a partir de los parámetros de GET /api/payload/results-tab."""
+    tab = args.get('tab')
+    if tab not in TAB_SECTIONS:
+        raise ValueError(f"Pestaña desconocida: {tab}")
+    if tab in UNFILTERED_TABS:
+        return tab, ()
+    return tab, filter_key({column: args.getlist(column) for column in FILTER_COLUMNS})
+
+
+# El contenido de cada pestaña se sirve ya serializado y comprimido por GET, con ETag
+# (ver respuestas.py); el navegador lo pide con fetch y revalida con 304.
+register_payload(
+    'results-tab',
+    parse=tab_payload_key,
+    build=lambda snapshot, tab, filters: build_tab_content(tab, snapshot, filters),
+    snapshot=ingesta.current,
+)
+
+dash.clientside_callback(
+    """
+    async function(tab) {
+        const filters = Array.prototype.slice.call(arguments, 1);
+        const params = new URLSearchParams({tab: tab});
+        %s.forEach(function(column, i) {
+            (filters[i] || []).forEach(function(value) { params.append(column, value); });
+        });
+        const response = await fetch('/api/payload/results-tab?' + params.toString());
+        if (!response.ok) {
+            return window.dash_clientside.no_update;
+        }
+        return await response.json();
+    }
+    """ % json.dumps(FILTER_COLUMNS),
+    Output("results-tab-content", "children"),
+    Input("results-tabs", "value"),
+    *FILTER_INPUTS,
+)
+
+
+@dash.callback(
+    Output("results-filter-count", "children"),
+    *FILTER_INPUTS,
+)
+def update_filter_count(*filter_values):
+    snapshot = ingesta.current()
+    selected = snapshot.count(selected_filters(filter_values))
+    return f"{selected:,} de {snapshot.n_rows:,} registros seleccionados"
+
+
+def filter_bar():
+    """Barra de filtros cruzados (un dropdown múltiple por columna categórica)."""
+    snapshot = ingesta.current()
+    return html.Div(
+        style={'display': 'flex', 'flexWrap': 'wrap', 'gap': '10px', 'alignItems': 'center', 'marginBottom': '20px'},
+        children=[
+            dcc.Dropdown(
+                id=f'filter-{column}',
+                options=[str(value) for value in snapshot.values(column)],
+                multi=True,
+                placeholder=FILTER_LABELS[column],
+                style={'minWidth': '180px', 'flex': '1'},
+            )
+            for column in FILTER_COLUMNS
+        ] + [html.Span(id="results-filter-count", style={'color': '#6c757d'})]
+    )
+
+
+def layout():
+    return html.Div(
+        style={"padding": "40px"},
+        children=[
+
+            html.H1("Resultados y Análisis de Datos", style={"textAlign": "center"}),
+            html.Hr(),
+            html.Br(),
+
+            # --------------------------------------------
+            # USO DE dcc.Tabs PARA SECCIONES
+            # --------------------------------------------
+            # Filtros cruzados: aplican a todas las pestañas excepto el modelo predictivo y las pruebas estadísticas
+            filter_bar(),
+
+            # Las pestañas solo llevan la etiqueta; el contenido se pide por callback.
+            dcc.Tabs(id="results-tabs", value='tab-1', children=[
+                dcc.Tab(label='1. Análisis Univariado', value='tab-1'),
+                dcc.Tab(label='2. Análisis Bivariado', value='tab-2'),
+                dcc.Tab(label='3. Mapa Geográfico', value='tab-3'),
+                dcc.Tab(label='4. Modelo Predictivo', value='tab-4'),
+                dcc.Tab(label='5. Pruebas Estadísticas', value='tab-5'),
+            ]),
+            dcc.Loading(html.Div(id="results-tab-content")),
+
+            html.Br(),
+            html.P("El dashboard integra los resultados visuales y analíticos más importantes del proyecto.")
+        ]
+    )
+
+def get_layout():
     return layout()
\ No newline at end of file
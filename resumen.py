@@ -0,0 +1,182 @@
+"""Capa de estadísticas resumen para los histogramas del análisis univariado.
+
+En lugar de incrustar cada fila en la figura (px.histogram + marginal='box'),
+se calculan en el servidor los bordes y conteos de los bins, los cuartiles, los
+bigotes y una muestra de valores atípicos, y la figura se construye a partir de
+ese resumen. El tamaño de la figura depende de HIST_BINS y de MAX_OUTLIERS,
+no de la cantidad de filas.
+
+Lo mismo para los diagramas de caja y de violín por grupo (distribution_figure):
+cada grupo se dibuja con sus cuartiles, bigotes y una muestra de atípicos, y el
+violín con una densidad por kernel evaluada en KDE_POINTS puntos.
+"""
+import numpy as np
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+HIST_BINS = 50
+# Valores atípicos que se dibujan como máximo (muestra uniforme y reproducible)
+MAX_OUTLIERS = 200
+OUTLIER_SEED = 0
+# Puntos en que se evalúa la densidad de cada violín
+KDE_POINTS = 200
+
+
+def bin_edges(values, bins=HIST_BINS):
+    """Bordes de los bins; para datos enteros los bins quedan centrados en enteros."""
+    low, high = float(values.min()), float(values.max())
+    if np.array_equal(values, np.round(values)):
+        step = max(1, int(np.ceil((high - low + 1) / bins)))
+        return np.arange(low - 0.5, high + step + 0.5, step)
+    if low == high:
+        low, high = low - 0.5, high + 0.5
+    return np.linspace(low, high, bins + 1)
+
+
+def column_summary(values, bins=HIST_BINS, max_outliers=MAX_OUTLIERS, histogram=None):
+    """Histograma y estadísticas del diagrama de caja de una columna numérica.
+
+    Si se pasa un RunningHistogram se usan sus bordes y conteos en lugar de
+    volver a agrupar los valores.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    values = values[np.isfinite(values)]
+
+    if histogram is not None:
+        edges, counts = histogram.edges, histogram.counts
+    else:
+        edges = bin_edges(values, bins)
+        counts, _ = np.histogram(values, bins=edges)
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+
+    # Bigotes de Tukey: el dato más extremo dentro de 1.5 * IQR
+    inside = (values >= q1 - 1.5 * iqr) & (values <= q3 + 1.5 * iqr)
+    outliers = values[~inside]
+    if len(outliers) > max_outliers:
+        rng = np.random.default_rng(OUTLIER_SEED)
+        outliers = rng.choice(outliers, size=max_outliers, replace=False)
+
+    return {
+        'count': int(len(values)),
+        'edges': edges,
+        'counts': counts,
+        'mean': float(values.mean()),
+        'q1': float(q1),
+        'median': float(median),
+        'q3': float(q3),
+        'lowerfence': float(values[inside].min()),
+        'upperfence': float(values[inside].max()),
+        'outliers': np.sort(outliers),
+    }
+
+
+class RunningHistogram:
+    """Histograma de bordes fijos que se actualiza con lotes nuevos sin recorrer los anteriores.
+
+    Los valores fuera del rango inicial se acumulan en el primer o último bin.
+    """
+
+    def __init__(self, edges, counts=None):
+        self.edges = edges
+        self.counts = np.zeros(len(edges) - 1, dtype=np.int64) if counts is None else counts
+
+    @classmethod
+    def from_values(cls, values, bins=HIST_BINS):
+        values = np.asarray(values, dtype=np.float64)
+        values = values[np.isfinite(values)]
+        return cls(bin_edges(values, bins)).updated(values)
+
+    def updated(self, values):
+        """Nuevo histograma con los valores agregados (el actual no se modifica)."""
+        values = np.asarray(values, dtype=np.float64)
+        values = np.clip(values[np.isfinite(values)], self.edges[0], self.edges[-1])
+        counts, _ = np.histogram(values, bins=self.edges)
+        return RunningHistogram(self.edges, self.counts + counts)
+
+
+def histogram_figure(summary, title, label, color):
+    """Histograma con diagrama de caja marginal construido a partir de column_summary()."""
+    edges = summary['edges']
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True, row_heights=[0.2, 0.8], vertical_spacing=0.02)
+
+    fig.add_trace(go.Box(
+        q1=[summary['q1']], median=[summary['median']], q3=[summary['q3']],
+        lowerfence=[summary['lowerfence']], upperfence=[summary['upperfence']],
+        mean=[summary['mean']], y=[label], orientation='h',
+        marker_color=color, name=label, showlegend=False, hoverinfo='x',
+    ), row=1, col=1)
+    if len(summary['outliers']):
+        fig.add_trace(go.Scatter(
+            x=summary['outliers'], y=[label] * len(summary['outliers']), mode='markers',
+            marker={'color': color, 'size': 4}, name='Atípicos', showlegend=False,
+        ), row=1, col=1)
+
+    fig.add_trace(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2, y=summary['counts'], width=np.diff(edges),
+        marker_color=color, name=label, showlegend=False,
+        hovertemplate=f"{label}: %{{x}}<br>Frecuencia: %{{y}}<extra></extra>",
+    ), row=2, col=1)
+
+    fig.update_yaxes(showticklabels=False, row=1, col=1)
+    fig.update_xaxes(title_text=label, row=2, col=1)
+    fig.update_yaxes(title_text='Frecuencia', row=2, col=1)
+    fig.update_layout(title=title, bargap=0.05)
+    return fig
+
+
+def density_curve(values, points=KDE_POINTS):
+    """(y, densidad) de un kernel gaussiano evaluado en `points` puntos.
+
+    Ancho de banda de Silverman, como el violín de Plotly. Los valores se
+    agrupan antes en `points` bins, así que el costo es O(filas + points²).
+    """
+    values = np.asarray(values, dtype=np.float64)
+    values = values[np.isfinite(values)]
+    iqr = np.subtract(*np.percentile(values, [75, 25]))
+    spread = min(values.std(), iqr / 1.349) if iqr > 0 else values.std()
+    bandwidth = 1.059 * spread * len(values) ** -0.2 if spread > 0 else 0.5
+    grid = np.linspace(values.min() - 2 * bandwidth, values.max() + 2 * bandwidth, points)
+    step = grid[1] - grid[0]
+    counts, _ = np.histogram(values, bins=np.append(grid - step / 2, grid[-1] + step / 2))
+    kernel = np.exp(-0.5 * ((grid[:, None] - grid[None, :]) / bandwidth) ** 2)
+    return grid, kernel @ counts / (len(values) * bandwidth * np.sqrt(2 * np.pi))
+
+
+def distribution_figure(groups, title, x_label, y_label, colors, violin=False):
+    """Diagrama de caja (o de violín con caja interna) por grupo, a partir de resúmenes.
+
+    `groups` es una lista de (nombre, valores); los grupos vacíos se omiten.
+    """
+    fig = go.Figure()
+    names = []
+    for name, values in groups:
+        values = np.asarray(values, dtype=np.float64)
+        if not np.isfinite(values).any():
+            continue
+        position, color = len(names), colors.get(name)
+        names.append(name)
+        summary = column_summary(values)
+        if violin:
+            grid, density = density_curve(values)
+            width = 0.4 * density / density.max()
+            fig.add_trace(go.Scatter(
+                x=np.concatenate([position - width, (position + width)[::-1]]),
+                y=np.concatenate([grid, grid[::-1]]), fill='toself', mode='lines',
+                line={'color': color, 'width': 1}, name=name, hoverinfo='skip',
+            ))
+        fig.add_trace(go.Box(
+            x=[position], q1=[summary['q1']], median=[summary['median']], q3=[summary['q3']],
+            lowerfence=[summary['lowerfence']], upperfence=[summary['upperfence']], mean=[summary['mean']],
+            width=0.1 if violin else 0.6, marker_color='#333333' if violin else color, name=name,
+            showlegend=not violin, boxpoints=False,
+        ))
+        if not violin and len(summary['outliers']):
+            fig.add_trace(go.Scatter(
+                x=[position] * len(summary['outliers']), y=summary['outliers'], mode='markers',
+                marker={'color': color, 'size': 4}, name='Atípicos', showlegend=False,
+            ))
+    fig.update_xaxes(title_text=x_label, tickvals=list(range(len(names))), ticktext=names)
+    fig.update_yaxes(title_text=y_label)
+    fig.update_layout(title=title, legend_title_text=x_label)
+    return fig
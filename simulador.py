@@ -0,0 +1,240 @@
+"""Simulador "¿qué pasaría si?" del riesgo de salud (pestaña Modelo Predictivo).
+
+El usuario mueve sliders y selectores; el navegador espera WHATIF_DEBOUNCE_MS
+sin cambios antes de enviar los valores (callback clientside con debounce) y el
+servidor responde con la probabilidad de riesgo alto y la contribución de cada
+entrada. La contribución de una entrada es cuánto cambia la probabilidad al
+reemplazarla por el valor típico del dataset (mediana o moda).
+
+Las predicciones se guardan en una caché LRU acotada cuya clave es el vector de
+entradas cuantizado al paso de cada control, el modelo y la instantánea de
+datos con que se calculan (las contribuciones usan sus valores típicos), así
+que repetir posiciones ya vistas no vuelve a evaluar el modelo.
+
+Ejecutar `python simulador.py` mide la latencia p50/p95 con y sin caché.
+"""
+from functools import lru_cache
+
+import dash
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from dash import Input, Output, dcc, html
+
+import ingesta
+from prediccion import get_model, prepare_records
+
+WHATIF_DEBOUNCE_MS = 150
+WHATIF_CACHE_SIZE = 4096
+WHATIF_LATENCY_TARGET_MS = 50
+
+# Controles numéricos: (campo, etiqueta, mínimo, máximo, paso)
+WHATIF_SLIDERS = [
+    ('Age', 'Edad', 18, 80, 1),
+    ('Coffee_Intake', 'Consumo de café (tazas)', 0, 10, 0.1),
+    ('Sleep_Hours', 'Horas de sueño', 3, 10, 0.1),
+    ('BMI', 'BMI', 15, 40, 0.1),
+    ('Heart_Rate', 'Frecuencia cardíaca (BPM)', 50, 110, 1),
+    ('Physical_Activity_Hours', 'Actividad física (h/semana)', 0, 15, 0.5),
+]
+# Controles categóricos: (campo, etiqueta)
+WHATIF_DROPDOWNS = [
+    ('Stress_Level', 'Nivel de estrés'),
+    ('Sleep_Quality', 'Calidad del sueño'),
+    ('Gender', 'Género'),
+    ('Country', 'País'),
+    ('Occupation', 'Ocupación'),
+]
+WHATIF_SWITCHES = [
+    ('Smoking', 'Fuma'),
+    ('Alcohol_Consumption', 'Consume alcohol'),
+]
+WHATIF_FIELDS = [f[0] for f in WHATIF_SLIDERS] + [f[0] for f in WHATIF_DROPDOWNS] + [f[0] for f in WHATIF_SWITCHES]
+_STEPS = {field: step for field, _, _, _, step in WHATIF_SLIDERS}
+
+
+def _quantize_field(field, value):
+    if field not in _STEPS or value is None:
+        return value
+    step = _STEPS[field]
+    return round(round(float(value) / step) * step, 6)
+
+
+def quantize(values):
+    """Clave de caché: cada valor numérico redondeado al paso de su slider."""
+    return tuple(_quantize_field(field, value) for field, value in zip(WHATIF_FIELDS, values))
+
+
+def baseline(snapshot):
+    """Valor típico de cada entrada (mediana o moda) para los valores iniciales y las contribuciones."""
+    df = snapshot.frame
+    values = {}
+    for field in WHATIF_FIELDS:
+        column = df[field]
+        if field in _STEPS:
+            values[field] = _quantize_field(field, float(column.median()))
+        elif field in dict(WHATIF_SWITCHES):
+            values[field] = int(column.mode().iloc[0])
+        else:
+            values[field] = str(column.mode().iloc[0])
+    return values
+
+
+_baselines = {}
+
+
+def _baseline_for(snapshot):
+    if snapshot.version not in _baselines:
+        _baselines.clear()
+        _baselines[snapshot.version] = baseline(snapshot)
+    return _baselines[snapshot.version]
+
+
+@lru_cache(maxsize=WHATIF_CACHE_SIZE)
+def predict_with_contributions(model, snapshot, key):
+    """(probabilidad, {campo: contribución}) para un vector cuantizado; evalúa n_campos + 1 filas en una llamada.
+
+    El modelo y la instantánea llegan como argumentos (y son la clave de la
+    caché): una ingesta a mitad de camino no mezcla resultados de otro modelo.
+    """
+    reference = _baseline_for(snapshot)
+    record = dict(zip(WHATIF_FIELDS, key))
+
+    rows = [record] + [{**record, field: reference[field]} for field in WHATIF_FIELDS]
+    records = prepare_records(pd.DataFrame(rows), model.features)
+    probabilities = model.flat.predict_proba(records)
+    contributions = {field: float(probabilities[0] - p) for field, p in zip(WHATIF_FIELDS, probabilities[1:])}
+    return float(probabilities[0]), contributions
+
+
+def whatif_result(values):
+    snapshot = ingesta.current()
+    return predict_with_contributions(get_model(snapshot), snapshot, quantize(values))
+
+
+def _control(label, component):
+    return html.Div(style={'marginBottom': '12px'}, children=[html.Label(label, style={'fontWeight': 'bold'}), component])
+
+
+def whatif_panel():
+    """Formulario del simulador con los valores típicos del dataset como punto de partida."""
+    snapshot = ingesta.current()
+    reference = _baseline_for(snapshot)
+
+    controls = [
+        _control(label, dcc.Slider(
+            id=f'whatif-{field}', min=low, max=high, step=step, value=reference[field],
+            marks=None, updatemode='drag', tooltip={'placement': 'bottom', 'always_visible': True},
+        ))
+        for field, label, low, high, step in WHATIF_SLIDERS
+    ] + [
+        _control(label, dcc.Dropdown(
+            id=f'whatif-{field}', options=[str(value) for value in snapshot.values(field)],
+            value=reference[field], clearable=False,
+        ))
+        for field, label in WHATIF_DROPDOWNS
+    ] + [
+        _control(label, dcc.RadioItems(
+            id=f'whatif-{field}', options=[{'label': 'No', 'value': 0}, {'label': 'Sí', 'value': 1}],
+            value=reference[field], inline=True, inputStyle={'marginRight': '4px', 'marginLeft': '10px'},
+        ))
+        for field, label in WHATIF_SWITCHES
+    ]
+
+    return html.Div(style={'display': 'flex', 'flexWrap': 'wrap', 'gap': '30px'}, children=[
+        html.Div(controls, style={'flex': '1', 'minWidth': '320px'}),
+        html.Div(style={'flex': '1', 'minWidth': '320px'}, children=[
+            dcc.Store(id='whatif-inputs'),
+            dcc.Graph(id='whatif-probability', config={'displayModeBar': False}),
+            dcc.Graph(id='whatif-contributions', config={'displayModeBar': False}),
+        ]),
+    ])
+
+
+# Debounce en el navegador: solo se envía el último cambio tras WHATIF_DEBOUNCE_MS de calma
+dash.clientside_callback(
+    """
+    function() {
+        const values = Array.from(arguments);
+        window._whatifSeq = (window._whatifSeq || 0) + 1;
+        const seq = window._whatifSeq;
+        return new Promise(function(resolve) {
+            setTimeout(function() {
+                resolve(seq === window._whatifSeq ? values : window.dash_clientside.no_update);
+            }, %d);
+        });
+    }
+    """ % WHATIF_DEBOUNCE_MS,
+    Output('whatif-inputs', 'data'),
+    [Input(f'whatif-{field}', 'value') for field in WHATIF_FIELDS],
+)
+
+
+@dash.callback(
+    Output('whatif-probability', 'figure'),
+    Output('whatif-contributions', 'figure'),
+    Input('whatif-inputs', 'data'),
+)
+def update_whatif(values):
+    if not values or any(value is None for value in values):
+        return dash.no_update, dash.no_update
+    probability, contributions = whatif_result(values)
+
+    fig_probability = go.Figure(go.Indicator(
+        mode='gauge+number', value=probability * 100,
+        number={'suffix': '%', 'valueformat': '.1f'},
+        title={'text': 'Probabilidad de Riesgo Alto'},
+        gauge={
+            'axis': {'range': [0, 100]},
+            'bar': {'color': '#e45756' if probability >= 0.5 else '#4c78a8'},
+            'threshold': {'line': {'color': 'black', 'width': 2}, 'value': 50},
+        },
+    ))
+    fig_probability.update_layout(height=260, margin={'t': 60, 'b': 10, 'l': 30, 'r': 30})
+
+    ordered = sorted(contributions.items(), key=lambda item: abs(item[1]))
+    fig_contributions = go.Figure(go.Bar(
+        x=[value * 100 for _, value in ordered], y=[field for field, _ in ordered], orientation='h',
+        marker_color=['#e45756' if value > 0 else '#4c78a8' for _, value in ordered],
+        hovertemplate='%{y}: %{x:+.1f} p.p.<extra></extra>',
+    ))
+    fig_contributions.update_layout(
+        title='Contribución de cada entrada (vs. valor típico)',
+        xaxis_title='Puntos porcentuales', height=420, margin={'l': 10, 'r': 10},
+    )
+    return fig_probability, fig_contributions
+
+
+if __name__ == "__main__":
+    import time
+    import warnings
+
+    from datos import DATA_PATH
+
+    warnings.filterwarnings("ignore")
+    snapshot = ingesta.initialize(DATA_PATH)
+    reference = _baseline_for(snapshot)
+    get_model(snapshot)
+
+    # Simula arrastres de slider: recorridos de ida y vuelta sobre el consumo de café y el sueño
+    rng = np.random.default_rng(0)
+    interactions = []
+    for _ in range(40):
+        coffee = np.clip(np.cumsum(rng.normal(0, 0.15, 25)) + 2.5, 0, 10)
+        for value in np.concatenate([coffee, coffee[::-1]]):
+            interactions.append([value if f == 'Coffee_Intake' else reference[f] for f in WHATIF_FIELDS])
+
+    latencies, miss_latencies = [], []
+    for values in interactions:
+        misses = predict_with_contributions.cache_info().misses
+        start = time.perf_counter()
+        whatif_result(values)
+        elapsed = (time.perf_counter() - start) * 1000
+        latencies.append(elapsed)
+        if predict_with_contributions.cache_info().misses > misses:
+            miss_latencies.append(elapsed)
+
+    print(f"{len(interactions)} interacciones, aciertos de caché {1 - len(miss_latencies) / len(interactions):.0%}")
+    print(f"todas:     p50 {np.percentile(latencies, 50):.2f} ms  p95 {np.percentile(latencies, 95):.2f} ms  "
+          f"(objetivo p95 < {WHATIF_LATENCY_TARGET_MS} ms)")
+    print(f"sin caché: p50 {np.percentile(miss_latencies, 50):.2f} ms  p95 {np.percentile(miss_latencies, 95):.2f} ms")
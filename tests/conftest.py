@@ -0,0 +1,22 @@
+"""Configuración común de las pruebas.
+
+Las pruebas importan los módulos de la raíz del repositorio y usan el CSV de
+ejemplo, que en el despliegue vive en data/ y en el repositorio en la raíz.
+"""
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def sample_csv():
+    from datos import DATA_PATH
+
+    for path in (os.path.join(ROOT, DATA_PATH), os.path.join(ROOT, os.path.basename(DATA_PATH))):
+        if os.path.exists(path):
+            return path
+    pytest.skip(f"No se encontró {DATA_PATH}")
@@ -0,0 +1,42 @@
+"""Presupuesto de tiempo de arranque del dashboard (perfil_arranque.py)."""
+import glob
+import os
+
+from conftest import ROOT
+from perfil_arranque import STARTUP_BUDGET_S, profile_imports, summarize
+
+# Archivos del repositorio que el despliegue pone en data/ y assets/
+DATA_FILES = ("synthetic_coffee_health_10000.csv", "ne_110m_admin_0_countries.*")
+ASSET_FILES = ("*.jpg", "*.png", "countries_110m.json")
+
+
+def _link_all(patterns, target):
+    os.makedirs(target, exist_ok=True)
+    for pattern in patterns:
+        for path in glob.glob(os.path.join(ROOT, pattern)):
+            os.symlink(path, os.path.join(target, os.path.basename(path)))
+
+
+def deployed_layout(target):
+    """Arma en `target` la estructura desplegada con enlaces al repositorio: módulos, pages/, data/ y assets/."""
+    modules = glob.glob(os.path.join(ROOT, "*.py"))
+    _link_all(["*.py"], target)
+    pages = [os.path.basename(path) for path in modules
+             if "dash.register_page(" in open(path, encoding="utf-8").read()]
+    _link_all(pages, os.path.join(target, "pages"))
+    _link_all(DATA_FILES, os.path.join(target, "data"))
+    _link_all(ASSET_FILES, os.path.join(target, "assets"))
+    return pages
+
+
+def test_startup_within_budget(tmp_path):
+    pages = deployed_layout(tmp_path)
+    # El primer arranque arma las cachés y el almacén en artifacts/; el presupuesto es para los siguientes
+    profile_imports("app", cwd=tmp_path)
+    entries, loaded = profile_imports("app", cwd=tmp_path)
+    total_us, _ = summarize(entries, "app")
+
+    assert sorted(name.split(".", 1)[1] for name in loaded) == sorted(page[:-3] for page in pages)
+    assert total_us / 1e6 <= STARTUP_BUDGET_S, (
+        f"arranque {total_us / 1e6:.2f}s > presupuesto {STARTUP_BUDGET_S:.2f}s"
+    )
@@ -0,0 +1,29 @@
+"""Paridad entre la lectura tipada del CSV y la caché Arrow (datos.py)."""
+import pandas as pd
+import pytest
+
+from datos import SCHEMA, load_dataset, read_csv
+
+
+def test_cache_matches_csv(sample_csv, tmp_path):
+    pytest.importorskip("pyarrow")
+
+    expected = read_csv(sample_csv)
+    load_dataset(sample_csv, cache_dir=tmp_path)  # escribe la caché
+    cached = load_dataset(sample_csv, cache_dir=tmp_path)
+
+    assert list(tmp_path.glob("*.arrow")), "no se escribió la caché"
+    assert cached.dtypes.to_dict() == expected.dtypes.to_dict()
+    pd.testing.assert_frame_equal(cached, expected)
+
+
+def test_csv_uses_schema(sample_csv):
+    df = read_csv(sample_csv)
+    assert list(df.columns) == list(SCHEMA)
+    for column, dtype in SCHEMA.items():
+        if isinstance(dtype, pd.CategoricalDtype):
+            assert df[column].dtype == dtype
+        elif dtype == 'category':
+            assert isinstance(df[column].dtype, pd.CategoricalDtype)
+        else:
+            assert df[column].dtype == dtype
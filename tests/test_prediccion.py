@@ -0,0 +1,37 @@
+"""Validación de los registros de /api/predict (prediccion.prepare_records)."""
+import math
+
+import pandas as pd
+import pytest
+
+from prediccion import prepare_records
+
+FEATURES = ['Age', 'Gender', 'BMI']
+
+
+def record(**overrides):
+    return pd.DataFrame([{'Age': 40, 'Gender': 'Male', 'BMI': 24.5, **overrides}])
+
+
+def test_valid_record_is_typed():
+    prepared = prepare_records(record(), FEATURES)
+    assert list(prepared.columns) == FEATURES
+    assert prepared['Age'].dtype == 'int8'
+    assert prepared['BMI'].dtype == 'float32'
+
+
+@pytest.mark.parametrize("value", [None, math.nan, math.inf, -math.inf])
+def test_missing_or_non_finite_numeric_is_rejected(value):
+    with pytest.raises(ValueError, match="BMI"):
+        prepare_records(record(BMI=value), FEATURES)
+
+
+@pytest.mark.parametrize("value", [None, math.nan])
+def test_missing_integer_is_rejected(value):
+    with pytest.raises(ValueError, match="Age"):
+        prepare_records(record(Age=value), FEATURES)
+
+
+def test_missing_category_is_rejected():
+    with pytest.raises(ValueError, match="Gender"):
+        prepare_records(record(Gender=None), FEATURES)
@@ -0,0 +1,72 @@
+"""Paridad de la puntuación vectorizada de Health_Risk con la versión fila a fila (puntuacion.py)."""
+import json
+import operator
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from almacen_columnar import store_path
+from datos import read_csv, scored_version
+from puntuacion import (HEALTH_RISK_RULES, HEALTH_RISK_THRESHOLD, compute_health_risk, rules_version,
+                        score_health_risk)
+
+OPERATORS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le,
+             "==": operator.eq, "!=": operator.ne}
+
+
+@pytest.fixture(params=["texto", "tipado"])
+def sample(request, sample_csv):
+    # Con las columnas como texto (pd.read_csv) y con el esquema de datos.py (categóricas, int8)
+    return pd.read_csv(sample_csv) if request.param == "texto" else read_csv(sample_csv)
+
+
+def _rowwise(df, rules, threshold):
+    """Referencia fila a fila para un conjunto de reglas cualquiera."""
+    def score(row):
+        return sum(rule["points"] for rule in rules if OPERATORS[rule["op"]](row[rule["column"]], rule["value"]))
+    return (df.apply(score, axis=1) >= threshold).astype(np.int8).to_numpy()
+
+
+def test_default_rules_match_compute_health_risk(sample, monkeypatch):
+    monkeypatch.delenv("HEALTH_RISK_RULES_FILE", raising=False)
+    expected = sample.apply(compute_health_risk, axis=1).to_numpy()
+    np.testing.assert_array_equal(score_health_risk(sample).to_numpy(), expected)
+
+
+def test_rules_file_with_default_rules_matches(sample, monkeypatch, tmp_path):
+    path = tmp_path / "reglas.json"
+    path.write_text(json.dumps({"threshold": HEALTH_RISK_THRESHOLD, "rules": HEALTH_RISK_RULES}))
+    monkeypatch.setenv("HEALTH_RISK_RULES_FILE", str(path))
+    expected = sample.apply(compute_health_risk, axis=1).to_numpy()
+    np.testing.assert_array_equal(score_health_risk(sample).to_numpy(), expected)
+
+
+def test_rules_file_override(sample, monkeypatch, tmp_path):
+    rules = [{**rule, "value": 3} if rule["column"] == "Coffee_Intake" else rule for rule in HEALTH_RISK_RULES]
+    rules.append({"column": "Age", "op": ">=", "value": 60, "points": 1})
+    path = tmp_path / "reglas.json"
+    path.write_text(json.dumps({"threshold": 5, "rules": rules}))
+    monkeypatch.setenv("HEALTH_RISK_RULES_FILE", str(path))
+
+    got = score_health_risk(sample).to_numpy()
+    np.testing.assert_array_equal(got, _rowwise(sample, rules, 5))
+    # El override cambia el resultado respecto de las reglas por defecto
+    assert (got != sample.apply(compute_health_risk, axis=1).to_numpy()).any()
+
+
+def test_versions_follow_rules(sample_csv, monkeypatch, tmp_path):
+    # El almacén y la versión de la instantánea guardan Health_Risk ya calculado: deben cambiar con las reglas
+    monkeypatch.delenv("HEALTH_RISK_RULES_FILE", raising=False)
+    default = (rules_version(), scored_version(sample_csv), store_path(sample_csv))
+
+    same = tmp_path / "iguales.json"
+    same.write_text(json.dumps({"rules": HEALTH_RISK_RULES, "threshold": HEALTH_RISK_THRESHOLD}))
+    monkeypatch.setenv("HEALTH_RISK_RULES_FILE", str(same))
+    assert (rules_version(), scored_version(sample_csv), store_path(sample_csv)) == default
+
+    other = tmp_path / "umbral.json"
+    other.write_text(json.dumps({"threshold": HEALTH_RISK_THRESHOLD + 1}))
+    monkeypatch.setenv("HEALTH_RISK_RULES_FILE", str(other))
+    changed = (rules_version(), scored_version(sample_csv), store_path(sample_csv))
+    assert all(a != b for a, b in zip(changed, default))
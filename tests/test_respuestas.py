@@ -0,0 +1,40 @@
+"""ETag y cuerpo de GET /api/payload/<nombre> (respuestas.py)."""
+import gzip
+import itertools
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import cache_compartida
+import respuestas
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    flask = pytest.importorskip("flask")
+    monkeypatch.setattr(cache_compartida, "_cache", cache_compartida.SharedCache(str(tmp_path / "cache.sqlite")))
+    # Cada llamada devuelve una instantánea nueva, como si hubiera una ingesta entre dos lecturas
+    versions = itertools.count(1)
+    respuestas.register_payload(
+        'prueba',
+        parse=lambda args: (args.get('x', ''),),
+        build=lambda snapshot, x: {'version': snapshot.version, 'x': x},
+        snapshot=lambda: SimpleNamespace(version=f"v{next(versions)}"),
+    )
+    server = flask.Flask(__name__)
+    respuestas.register_routes(server)
+    yield server.test_client()
+    respuestas._payloads.pop('prueba', None)
+
+
+def test_etag_and_body_use_the_same_snapshot(client):
+    response = client.get("/api/payload/prueba?x=a", headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    body = json.loads(gzip.decompress(response.data))
+    assert body == {'version': 'v1', 'x': 'a'}
+    assert response.headers['ETag'] == f'"{respuestas.etag_for("prueba", "v1", ("a",))}"'
+
+
+def test_unknown_payload_is_404(client):
+    assert client.get("/api/payload/otro").status_code == 404
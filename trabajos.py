@@ -0,0 +1,526 @@
+"""Trabajos en segundo plano para análisis pesados, sin broker externo.
+
+Los análisis costosos (reentrenar, validación cruzada, importancias por
+permutación, bootstrap...) no deben correr dentro de una request: un worker web
+bloqueado por CPU deja de atender. Aquí se ejecutan en un pool local de
+procesos (JOB_WORKERS, creado al primer envío) que se reparten CORE_BUDGET
+núcleos, y su estado vive en disco, en JOBS_DIR:
+
+- <id>.json: registro del trabajo (estado, progreso, mensaje, pid, errores),
+  visible para todos los workers de gunicorn;
+- <id>.result: el resultado serializado con pickle.
+
+El id es un hash del nombre del trabajo y sus argumentos: enviar un trabajo
+idéntico a uno en curso (o ya terminado) devuelve el mismo id en lugar de
+lanzarlo otra vez. Los trabajos cuyo proceso murió (p. ej. un reinicio) se
+marcan como fallidos y se pueden volver a enviar.
+
+Los procesos del pool se crean con spawn, no con fork: el worker web ya tiene
+hilos (ingesta, micro-lotes de predicción, perfilador) y un fork podría copiar
+un candado tomado por otro hilo. Un proceso nuevo no tiene los trabajos
+registrados, así que al arrancar importa JOBS_APP_MODULE (como un worker de
+Celery importa la aplicación), sin los hilos de fondo del worker web.
+
+Cancelación: cancel() marca el registro desde cualquier worker. En el proceso
+del pool, un hilo vigía revisa la marca cada JOB_CANCEL_POLL_SECONDS e
+interrumpe el trabajo (SIGINT simulado con _thread.interrupt_main, que aquí
+lanza JobCancelled); la función de progreso también lo revisa al reportar.
+
+Integración con Dash:
+
+- job_panel(): bloque con dcc.Interval que consulta el estado cada
+  JOB_POLL_MS, muestra una barra de progreso, permite cancelar o reintentar y,
+  al terminar, muestra el resultado con la función `render` del trabajo;
+- background_manager: administrador de callbacks en segundo plano de Dash
+  (`@dash.callback(..., background=True)`) que usa este mismo pool y registro.
+"""
+import _thread
+import hashlib
+import json
+import os
+import pickle
+import signal
+import tempfile
+import threading
+import time
+import traceback
+
+import dash
+from dash import html, dcc, Input, Output, State, MATCH
+from dash.background_callback.managers import BaseBackgroundCallbackManager
+
+from almacen_modelos import _locked
+
+JOBS_DIR = os.environ.get("JOBS_DIR", "artifacts/jobs")
+# Núcleos para el cómputo pesado (la mitad; el resto queda para los workers web). Cada proceso del
+# pool recibe CORE_BUDGET // JOB_WORKERS para sus propios n_jobs (ver _init_worker)
+CORE_BUDGET = int(os.environ.get("CORE_BUDGET", max(1, (os.cpu_count() or 1) // 2)))
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", CORE_BUDGET))
+# Los trabajos terminados (y sus resultados) se borran pasado este tiempo
+JOB_TTL_SECONDS = float(os.environ.get("JOB_TTL_SECONDS", "86400"))
+JOB_CANCEL_POLL_SECONDS = 0.5
+JOB_POLL_MS = 1000
+# Módulo que registra los trabajos y los callbacks; cada proceso del pool lo importa al arrancar
+JOBS_APP_MODULE = os.environ.get("JOBS_APP_MODULE", "app")
+PR_SET_PDEATHSIG = 1
+
+ACTIVE_STATES = ('queued', 'running')
+FINAL_STATES = ('done', 'failed', 'cancelled')
+
+
+class JobCancelled(Exception):
+    """El trabajo fue cancelado mientras corría."""
+
+
+# name -> (función, render). La función recibe progress(fracción, mensaje) y los argumentos.
+_jobs = {}
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def register_job(name, func, render=None):
+    """Registra un trabajo: func(progress, *args) devuelve el resultado; render(resultado) lo muestra en job_panel()."""
+    _jobs[name] = (func, render)
+
+
+def job_id(name, args):
+    return hashlib.sha256(repr((name, tuple(args))).encode()).hexdigest()[:24]
+
+
+def _record_path(job, jobs_dir=None):
+    return os.path.join(jobs_dir or JOBS_DIR, f"{job}.json")
+
+
+def _result_path(job, jobs_dir=None):
+    return os.path.join(jobs_dir or JOBS_DIR, f"{job}.result")
+
+
+def _write_atomic(path, data):
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "wb") as fh:
+        fh.write(data)
+    os.replace(tmp_path, path)
+
+
+def _read(job):
+    try:
+        with open(_record_path(job), encoding="utf-8") as fh:
+            return json.load(fh)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+def _write(record):
+    _write_atomic(_record_path(record['id']), json.dumps(record).encode())
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _lost(record):
+    """Trabajo activo cuyo proceso (el del pool o, si aún no arrancó, el worker que lo envió) ya no existe."""
+    pid = record.get('pid') or record.get('owner')
+    return record['status'] in ACTIVE_STATES and pid is not None and not _alive(pid)
+
+
+def update(job, **changes):
+    """Modifica el registro bajo el candado del trabajo; devuelve el registro actualizado."""
+    with _locked(job, JOBS_DIR):
+        record = _read(job)
+        if record is None:
+            return None
+        record.update(changes)
+        _write(record)
+        return record
+
+
+def status(job):
+    """Registro del trabajo (dict) o None si no existe; los trabajos perdidos se reportan como fallidos."""
+    record = _read(job)
+    if record is not None and _lost(record):
+        record = update(job, status='failed', error="El proceso del trabajo terminó inesperadamente",
+                        finished=time.time()) or record
+    return record
+
+
+def result(job):
+    """Resultado de un trabajo terminado."""
+    with open(_result_path(job), "rb") as fh:
+        return pickle.load(fh)
+
+
+def _pool():
+    global _executor
+    with _executor_lock:
+        if _executor is None or getattr(_executor, '_broken', False):
+            import multiprocessing as mp
+            from concurrent.futures import ProcessPoolExecutor
+
+            # spawn: el worker web tiene hilos y un fork podría heredar un candado tomado
+            _executor = ProcessPoolExecutor(JOB_WORKERS, mp_context=mp.get_context("spawn"),
+                                            initializer=_init_worker, initargs=(JOBS_APP_MODULE,))
+        return _executor
+
+
+def submit(name, *args, reuse_done=True, force=False, job=None):
+    """Envía el trabajo `name` con `args` y devuelve su id, sin esperar.
+
+    Si un trabajo idéntico está en curso se devuelve su id; si ya terminó bien y
+    reuse_done es verdadero, también (su resultado sigue disponible). force=True
+    lo vuelve a lanzar en cualquier caso. `job` permite fijar el id en lugar de
+    derivarlo de los argumentos.
+    """
+    job = job or job_id(name, args)
+    with _locked(job, JOBS_DIR):
+        record = _read(job)
+        if record is not None and not force and not _lost(record):
+            if record['status'] in ACTIVE_STATES or (reuse_done and record['status'] == 'done'):
+                return job
+        if os.path.exists(_result_path(job)):
+            os.remove(_result_path(job))
+        _write({
+            'id': job, 'name': name, 'status': 'queued', 'progress': 0.0, 'message': '',
+            'created': time.time(), 'started': None, 'finished': None, 'error': None,
+            'owner': os.getpid(), 'pid': None, 'cancel_requested': False,
+        })
+    future = _pool().submit(_run, job, name, args)
+    future.add_done_callback(lambda f: _on_done(job, f))
+    _prune()
+    return job
+
+
+def cancel(job):
+    """Pide cancelar el trabajo (desde cualquier worker). Devuelve False si ya había terminado."""
+    with _locked(job, JOBS_DIR):
+        record = _read(job)
+        if record is None or record['status'] in FINAL_STATES:
+            return False
+        record['cancel_requested'] = True
+        if record['status'] == 'queued':
+            # Aún no arrancó: el proceso del pool lo descarta al tomarlo
+            record.update(status='cancelled', finished=time.time())
+        _write(record)
+    return True
+
+
+def _on_done(job, future):
+    """El pool no pudo ejecutar el trabajo (p. ej. proceso terminado): se marca como fallido."""
+    error = future.exception() if not future.cancelled() else None
+    if error is not None:
+        record = _read(job)
+        if record is not None and record['status'] in ACTIVE_STATES:
+            update(job, status='failed', error=repr(error), finished=time.time())
+
+
+def _prune():
+    """Borra los registros terminados hace más de JOB_TTL_SECONDS (y sus resultados)."""
+    cutoff = time.time() - JOB_TTL_SECONDS
+    for name in os.listdir(JOBS_DIR):
+        if not name.endswith(".json"):
+            continue
+        record = _read(name[:-5])
+        if record and record['status'] in FINAL_STATES and (record['finished'] or 0) < cutoff:
+            lock = os.path.join(JOBS_DIR, f"{record['id']}.lock")
+            for path in (_record_path(record['id']), _result_path(record['id']), lock):
+                if os.path.exists(path):
+                    os.remove(path)
+
+
+# --- Lado del proceso del pool ---
+
+# Solo se interrumpe mientras corre un trabajo: una interrupción tardía no debe romper el pool
+_running = {'job': None}
+_running_lock = threading.Lock()
+
+
+def _on_interrupt(signum, frame):
+    with _running_lock:
+        active = _running['job'] is not None
+    if active:
+        raise JobCancelled()
+
+
+def _init_worker(app_module):
+    import importlib
+
+    signal.signal(signal.SIGINT, _on_interrupt)
+    # Si el worker web muere (p. ej. gunicorn lo reinicia), sus procesos del pool también (solo Linux)
+    try:
+        import ctypes
+
+        ctypes.CDLL("libc.so.6").prctl(PR_SET_PDEATHSIG, signal.SIGTERM)
+    except (OSError, AttributeError):
+        pass
+    # Registra los trabajos y callbacks; los trabajos ingieren lo pendiente ellos mismos, sin hilos de fondo
+    os.environ["INGEST_POLL_SECONDS"] = "0"
+    os.environ["PROFILE_SLOW_MS"] = "0"
+    # Sin esto cada proceso del pool volvería a usar todo el presupuesto en sus n_jobs
+    # (TRAINING_CORES, CV_JOBS, EXPLAIN_JOBS, STATS_JOBS, IMPUTE_JOBS) y habría
+    # JOB_WORKERS x CORE_BUDGET procesos ocupados
+    os.environ["CORE_BUDGET"] = str(max(1, CORE_BUDGET // JOB_WORKERS))
+    if app_module:
+        importlib.import_module(app_module)
+
+
+def _watch_cancel(job, stop):
+    while not stop.wait(JOB_CANCEL_POLL_SECONDS):
+        record = _read(job)
+        if record is not None and record.get('cancel_requested'):
+            with _running_lock:
+                if _running['job'] == job:
+                    _thread.interrupt_main(signal.SIGINT)
+            return
+
+
+def _progress_reporter(job):
+    last = [0.0]
+
+    def progress(fraction, message=''):
+        now = time.monotonic()
+        record = _read(job)
+        if record is not None and record.get('cancel_requested'):
+            raise JobCancelled()
+        # Como mucho unas cuatro escrituras por segundo (el último valor siempre se escribe al terminar)
+        if now - last[0] >= 0.25 or fraction >= 1:
+            last[0] = now
+            update(job, progress=float(fraction), message=message)
+
+    return progress
+
+
+def _run(job, name, args):
+    record = _read(job)
+    if record is None or record.get('cancel_requested'):
+        return
+    update(job, status='running', started=time.time(), pid=os.getpid())
+    func = _jobs[name][0]
+
+    stop = threading.Event()
+    watcher = threading.Thread(target=_watch_cancel, args=(job, stop), daemon=True)
+    try:
+        try:
+            with _running_lock:
+                _running['job'] = job
+            watcher.start()
+            value = func(_progress_reporter(job), *args)
+        finally:
+            with _running_lock:
+                _running['job'] = None
+            stop.set()
+        _write_atomic(_result_path(job), pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        update(job, status='done', progress=1.0, message='', finished=time.time())
+    except JobCancelled:
+        update(job, status='cancelled', finished=time.time(), message="Cancelado")
+    except Exception as exc:
+        update(job, status='failed', finished=time.time(), error=f"{exc}\n{traceback.format_exc()}")
+
+
+# --- Panel con sondeo por dcc.Interval ---
+
+def job_panel(panel, name, *args):
+    """Bloque que lanza (o reutiliza) el trabajo `name` y muestra su progreso y su resultado."""
+    button = {'marginTop': '10px'}
+    return html.Div([
+        dcc.Store(id={'type': 'job-spec', 'panel': panel}, data={'name': name, 'args': list(args)}),
+        dcc.Interval(id={'type': 'job-poll', 'panel': panel}, interval=JOB_POLL_MS),
+        html.Div(id={'type': 'job-status', 'panel': panel}),
+        html.Button("Cancelar", id={'type': 'job-cancel', 'panel': panel}, style=button),
+        html.Button("Reintentar", id={'type': 'job-retry', 'panel': panel}, style={**button, 'display': 'none'}),
+        html.Div(id={'type': 'job-output', 'panel': panel}),
+    ])
+
+
+def _status_view(record):
+    if record['status'] == 'failed':
+        return html.P(f"El análisis falló: {(record['error'] or '').splitlines()[0]}", style={'color': '#e45756'})
+    if record['status'] == 'cancelled':
+        return html.P("Análisis cancelado.", style={'color': '#6c757d'})
+    label = "En cola..." if record['status'] == 'queued' else (record['message'] or "Procesando...")
+    return html.Div([
+        html.Progress(value=str(record['progress']), max="1", style={'width': '100%', 'maxWidth': '450px'}),
+        html.Div(f"{label} ({record['progress']:.0%})", style={'color': '#6c757d'}),
+    ])
+
+
+@dash.callback(
+    Output({'type': 'job-status', 'panel': MATCH}, 'children'),
+    Output({'type': 'job-output', 'panel': MATCH}, 'children'),
+    Output({'type': 'job-poll', 'panel': MATCH}, 'disabled'),
+    Output({'type': 'job-cancel', 'panel': MATCH}, 'style'),
+    Output({'type': 'job-retry', 'panel': MATCH}, 'style'),
+    Input({'type': 'job-poll', 'panel': MATCH}, 'n_intervals'),
+    State({'type': 'job-spec', 'panel': MATCH}, 'data'),
+)
+def poll_job(_, spec):
+    job = job_id(spec['name'], spec['args'])
+    record = status(job)
+    if record is None:
+        # Primera consulta del panel: lanza el trabajo
+        submit(spec['name'], *spec['args'])
+        record = status(job)
+
+    hidden, shown = {'display': 'none'}, {'marginTop': '10px'}
+    if record['status'] == 'done':
+        render = _jobs[spec['name']][1]
+        output = render(result(job)) if render else None
+        return None, output, True, hidden, hidden
+    if record['status'] in FINAL_STATES:
+        return _status_view(record), None, True, hidden, shown
+    return _status_view(record), dash.no_update, False, shown, hidden
+
+
+@dash.callback(
+    Output({'type': 'job-poll', 'panel': MATCH}, 'disabled', allow_duplicate=True),
+    Input({'type': 'job-cancel', 'panel': MATCH}, 'n_clicks'),
+    State({'type': 'job-spec', 'panel': MATCH}, 'data'),
+    prevent_initial_call=True,
+)
+def cancel_job(_, spec):
+    cancel(job_id(spec['name'], spec['args']))
+    # El sondeo sigue hasta ver el estado final
+    return False
+
+
+@dash.callback(
+    Output({'type': 'job-poll', 'panel': MATCH}, 'disabled', allow_duplicate=True),
+    Input({'type': 'job-retry', 'panel': MATCH}, 'n_clicks'),
+    State({'type': 'job-spec', 'panel': MATCH}, 'data'),
+    prevent_initial_call=True,
+)
+def retry_job(_, spec):
+    submit(spec['name'], *spec['args'], force=True)
+    return False
+
+
+# --- Callbacks en segundo plano de Dash sobre el mismo pool ---
+
+class _DashJob:
+    """Referencia serializable a la función de un callback en segundo plano (se busca por clave en el proceso del pool)."""
+
+    def __init__(self, key, progress):
+        self.key = key
+        self.progress = progress
+
+
+def _dash_callback(progress, job_fn, args, context):
+    """Ejecuta un callback en segundo plano de Dash con su contexto, como el DiskcacheManager."""
+    from dash._callback_context import context_value
+    from dash._utils import AttributeDict
+    from dash.background_callback._proxy_set_props import ProxySetProps
+    from dash.exceptions import PreventUpdate
+
+    fn = next(fn for key, fn, _ in BaseBackgroundCallbackManager.functions if key == job_fn.key)
+    job = _running['job']
+    updated_props = {}
+
+    def set_props(component_id, props):
+        updated_props.setdefault(component_id, {}).update(props)
+        update(job, set_props=updated_props)
+
+    def set_progress(value):
+        progress(0.0)  # revisa la cancelación
+        update(job, dash_progress=list(value) if isinstance(value, (list, tuple)) else [value])
+
+    ctx = AttributeDict(**context)
+    ctx.ignore_register_page = False
+    ctx.updated_props = ProxySetProps(set_props)
+    context_value.set(ctx)
+    extra = [set_progress] if job_fn.progress else []
+    try:
+        if isinstance(args, dict):
+            return fn(*extra, **args)
+        if isinstance(args, (list, tuple)):
+            return fn(*extra, *args)
+        return fn(*extra, args)
+    except PreventUpdate:
+        return {"_dash_no_update": "_dash_no_update"}
+    except JobCancelled:
+        raise
+    except Exception as exc:
+        return {"background_callback_error": {"msg": str(exc), "tb": traceback.format_exc()}}
+
+
+register_job('dash-background', _dash_callback)
+
+
+class JobCallbackManager(BaseBackgroundCallbackManager):
+    """Administrador de callbacks en segundo plano de Dash sobre el pool y el registro de trabajos.
+
+    El "job" que Dash guarda en el navegador es el id del trabajo; la clave de
+    caché de Dash entra en ese id, así que dos sesiones que disparan el mismo
+    callback con los mismos argumentos comparten una sola ejecución.
+    """
+
+    def __init__(self, cache_by=None):
+        super().__init__(cache_by)
+
+    def make_job_fn(self, fn, progress, key=None):
+        return _DashJob(key, bool(progress))
+
+    def call_job_fn(self, key, job_fn, args, context):
+        # Con cache_by Dash reutiliza resultados; sin él cada llamada nueva vuelve a ejecutar
+        return submit('dash-background', job_fn, args, context, reuse_done=self.cache_by is not None, job=key)
+
+    def job_running(self, job):
+        record = status(job) if job else None
+        return record is not None and record['status'] in ACTIVE_STATES
+
+    def terminate_job(self, job):
+        if job:
+            cancel(job)
+
+    def terminate_unhealthy_job(self, job):
+        record = _read(job) if job else None
+        return record is not None and _lost(record)
+
+    def get_progress(self, key):
+        record = _read(key)
+        return record.get('dash_progress') if record else None
+
+    def result_ready(self, key):
+        record = _read(key)
+        return record is not None and record['status'] == 'done'
+
+    def get_result(self, key, job):
+        record = status(key)
+        if record is None or record['status'] != 'done':
+            return self.UNDEFINED
+        # El resultado se conserva hasta JOB_TTL_SECONDS: otra sesión puede estar esperando el mismo trabajo
+        return result(key)
+
+    def get_updated_props(self, key):
+        record = _read(key)
+        if not record or not record.get('set_props'):
+            return {}
+        update(key, set_props=None)
+        return record['set_props']
+
+    def clear_cache_entry(self, key):
+        for path in (_record_path(key), _result_path(key)):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def get_or_create_signing_secret(self, generate):
+        path = os.path.join(JOBS_DIR, "dash-signing-secret")
+        os.makedirs(JOBS_DIR, exist_ok=True)
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+        except FileExistsError:
+            pass
+        else:
+            with os.fdopen(fd, "wb") as fh:
+                fh.write(generate())
+        with open(path, "rb") as fh:
+            return fh.read()
+
+
+background_manager = JobCallbackManager()
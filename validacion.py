@@ -0,0 +1,152 @@
+"""Métricas del modelo por validación cruzada k-fold, calculadas en vivo.
+
+Se clona el Pipeline vigente (mismos hiperparámetros que el modelo de la app,
+fijo o ganador de entrenamiento.py) y se ajusta en CV_FOLDS particiones
+estratificadas del dataset completo. Los folds corren en paralelo con joblib
+(CV_JOBS procesos, bosques de un hilo). Con las predicciones out-of-fold se
+arman:
+
+- accuracy, precision, recall, F1 y AUC por fold, con media e intervalo de
+  confianza del 95 % (t de Student con k-1 grados de libertad),
+- la matriz de confusión acumulada,
+- las curvas ROC y precisión-recall (reducidas a CURVE_POINTS puntos).
+
+El resultado se guarda en el almacén de artefactos con una clave derivada de la
+versión del modelo (que ya incluye la versión de los datos), así la validación
+se calcula una sola vez por modelo entre workers y reinicios.
+"""
+import os
+
+import numpy as np
+
+import almacen_modelos
+from entrenamiento import TRAINING_CORES
+from modelo import split_features
+
+CV_FOLDS = int(os.environ.get("CV_FOLDS", "5"))
+CV_JOBS = int(os.environ.get("CV_JOBS", TRAINING_CORES))
+CV_SEED = 42
+CONFIDENCE = 0.95
+CURVE_POINTS = 200
+
+METRIC_NAMES = {
+    'accuracy': 'Accuracy',
+    'precision': 'Precision',
+    'recall': 'Recall',
+    'f1': 'F1',
+    'roc_auc': 'AUC ROC',
+}
+
+
+def _fit_fold(pipeline, X, y, train_rows, test_rows):
+    """Probabilidades de la clase positiva para las filas de prueba del fold."""
+    model = pipeline.fit(X.iloc[train_rows], y.iloc[train_rows])
+    return test_rows, model.predict_proba(X.iloc[test_rows])[:, 1]
+
+
+def _fold_metrics(y_true, proba):
+    from sklearn.metrics import accuracy_score, f1_score, precision_score, recall_score, roc_auc_score
+
+    y_pred = (proba >= 0.5).astype(int)
+    return {
+        'accuracy': accuracy_score(y_true, y_pred),
+        'precision': precision_score(y_true, y_pred, zero_division=0),
+        'recall': recall_score(y_true, y_pred),
+        'f1': f1_score(y_true, y_pred),
+        'roc_auc': roc_auc_score(y_true, proba),
+    }
+
+
+def _reduce_curve(x, y, points=CURVE_POINTS):
+    """Submuestreo uniforme de una curva (conserva los extremos) para no inflar el JSON."""
+    if len(x) <= points:
+        return x.tolist(), y.tolist()
+    keep = np.unique(np.linspace(0, len(x) - 1, points).round().astype(int))
+    return x[keep].tolist(), y[keep].tolist()
+
+
+def confidence_interval(values, confidence=CONFIDENCE):
+    """(media, inferior, superior) con la t de Student."""
+    from scipy import stats
+
+    values = np.asarray(values, dtype=float)
+    mean = values.mean()
+    if len(values) < 2:
+        return mean, mean, mean
+    half = stats.t.ppf((1 + confidence) / 2, len(values) - 1) * values.std(ddof=1) / np.sqrt(len(values))
+    return mean, mean - half, mean + half
+
+
+def cross_validate(df, pipeline, folds=CV_FOLDS, n_jobs=CV_JOBS):
+    """Validación cruzada de un clon sin ajustar de `pipeline`; devuelve un dict serializable."""
+    from joblib import Parallel, delayed
+    from sklearn.base import clone
+    from sklearn.metrics import confusion_matrix, precision_recall_curve, roc_curve
+    from sklearn.model_selection import StratifiedKFold
+
+    X, y, _, _ = split_features(df)
+    template = clone(pipeline)
+    # Un hilo por bosque: el paralelismo está en los folds; sin OOB (no se usa aquí)
+    template.set_params(classifier__n_jobs=1, classifier__oob_score=False, classifier__warm_start=False)
+
+    splitter = StratifiedKFold(n_splits=folds, shuffle=True, random_state=CV_SEED)
+    outcomes = Parallel(n_jobs=n_jobs)(
+        delayed(_fit_fold)(clone(template), X, y, train_rows, test_rows)
+        for train_rows, test_rows in splitter.split(X, y)
+    )
+
+    y_true = y.to_numpy()
+    oof = np.empty(len(y_true))
+    per_fold = []
+    for test_rows, proba in outcomes:
+        oof[test_rows] = proba
+        per_fold.append(_fold_metrics(y_true[test_rows], proba))
+
+    summary = {}
+    for name in METRIC_NAMES:
+        values = [fold[name] for fold in per_fold]
+        mean, low, high = confidence_interval(values)
+        summary[name] = {'mean': mean, 'low': low, 'high': high, 'std': float(np.std(values, ddof=1)),
+                         'folds': values}
+
+    fpr, tpr, _ = roc_curve(y_true, oof)
+    precision, recall, _ = precision_recall_curve(y_true, oof)
+    return {
+        'folds': folds,
+        'confidence': CONFIDENCE,
+        'summary': summary,
+        'confusion_matrix': confusion_matrix(y_true, (oof >= 0.5).astype(int)).tolist(),
+        'roc': _reduce_curve(fpr, tpr),
+        'pr': _reduce_curve(recall[::-1], precision[::-1]),
+        'positive_rate': float(y_true.mean()),
+    }
+
+
+def cv_key(model_version, folds=CV_FOLDS):
+    return almacen_modelos.artifact_key(model_version, [], {'cv_folds': folds, 'cv_seed': CV_SEED, 'kind': 'cv'})
+
+
+def load_or_validate(df, artifact):
+    """Resultados de validación cruzada del modelo `artifact` (se calculan una vez por versión)."""
+    return almacen_modelos.get_or_create(
+        cv_key(artifact['version']), lambda: cross_validate(df, artifact['pipeline'])
+    )
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    from datos import DATA_PATH, add_health_risk, load_dataset
+    from modelo import load_or_train
+
+    data = add_health_risk(load_dataset(sys.argv[1] if len(sys.argv) > 1 else DATA_PATH))
+    model = load_or_train(data)
+    for jobs in sorted({1, CV_JOBS}):
+        start = time.perf_counter()
+        result = cross_validate(data, model['pipeline'], n_jobs=jobs)
+        print(f"{CV_FOLDS} folds con {jobs} proceso(s): {time.perf_counter() - start:.2f}s")
+    for name, label in METRIC_NAMES.items():
+        stats = result['summary'][name]
+        print(f"  {label:<10} {stats['mean']:.4f}  IC {CONFIDENCE:.0%} [{stats['low']:.4f}, {stats['high']:.4f}]")
+    print(f"  Matriz de confusión: {result['confusion_matrix']}")